@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Benchmark the tools/ pipeline against synthetic registries.
+
+Each registry is generated from templates/ into a scratch marketplace
+(a copy of tools/, a marketplace.json and N plugins with a varying number
+of skills, agents and commands), on local disk or on tmpfs. The tools are
+then run end to end as subprocesses, exactly as CI runs them, and their
+wall time, CPU time and peak RSS are recorded. Results are written as
+JSON tagged with the current commit, so runs can be compared across
+commits with the compare command.
+
+Usage:
+    python benchmarks/bench.py run
+    python benchmarks/bench.py run --sizes 100,1000,10000 --locations disk,tmpfs
+    python benchmarks/bench.py run --sizes 50000 --only validate,generate-catalog --repeat 1
+    python benchmarks/bench.py compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+TOOLS_DIR = REPO_ROOT / "tools"
+RESULTS_DIR = Path(__file__).parent / "results"
+WORK_DIR = Path(__file__).parent / ".work"
+TMPFS_DIR = Path("/dev/shm")
+
+sys.path.insert(0, str(TOOLS_DIR))
+from scaffold import TEMPLATES_DIR, replace_placeholders  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000]
+CATEGORIES = ["devops", "development", "security", "testing", "documentation", "utilities"]
+# Component names are drawn from a shared vocabulary, so large registries
+# have some naming conflicts, as real ones do.
+WORDS = [
+    "deploy", "build", "test", "lint", "format", "review", "audit", "scan", "docs", "release",
+    "migrate", "debug", "profile", "trace", "index", "search", "sync", "backup", "restore", "check",
+    "plan", "spec", "api", "schema", "query", "cache", "queue", "stream", "model", "prompt",
+    "git", "docker", "k8s", "cloud", "infra", "secret", "token", "log", "metric", "alert",
+]
+IMPORT_BATCH = 500
+
+BENCHMARKS = ["validate", "validate-conflicts", "generate-catalog", "export-all", "import"]
+
+
+def component_name(rng: random.Random) -> str:
+    return f"{rng.choice(WORDS)}-{rng.choice(WORDS)}"
+
+
+def render_template(relative: str, replacements: dict) -> str:
+    with open(TEMPLATES_DIR / relative, "r") as f:
+        return replace_placeholders(f.read(), replacements)
+
+
+def generate_plugin(plugin_dir: Path, index: int, rng: random.Random, max_skills: int,
+                    max_agents: int, max_commands: int, names: list[str]):
+    """Write one synthetic plugin from the templates."""
+    name = plugin_dir.name
+    shutil.copytree(TEMPLATES_DIR / "plugin", plugin_dir)
+
+    plugin_json = json.loads(render_template("plugin/.claude-plugin/plugin.json", {
+        "PLUGIN_NAME": name,
+        "PLUGIN_DESCRIPTION": f"Synthetic benchmark plugin {index}",
+        "AUTHOR_NAME": "Benchmark",
+        "AUTHOR_EMAIL": "bench@example.com",
+        "HOMEPAGE_URL": f"https://example.com/{name}",
+        "REPOSITORY_URL": "https://example.com/bench",
+    }))
+    plugin_json["category"] = CATEGORIES[index % len(CATEGORIES)]
+    plugin_json["keywords"] = rng.sample(WORDS, 3)
+    # About one plugin in ten depends on an earlier one
+    if names and rng.random() < 0.1:
+        plugin_json["dependencies"] = {rng.choice(names): "^1.0.0"}
+    with open(plugin_dir / ".claude-plugin" / "plugin.json", "w") as f:
+        json.dump(plugin_json, f, indent=2)
+
+    for _ in range(rng.randint(0, max_skills)):
+        skill = component_name(rng)
+        skill_dir = plugin_dir / "skills" / skill
+        if skill_dir.exists():
+            continue
+        skill_dir.mkdir(parents=True)
+        replacements = {
+            "SKILL_NAME": skill,
+            "SKILL_TITLE": skill.replace("-", " ").title(),
+            "SKILL_DESCRIPTION": f"Helps with {skill.replace('-', ' ')}",
+            "TRIGGER_CONDITIONS": "working with relevant tasks",
+            "EXAMPLE_PROMPT": f"Help me with {skill.replace('-', ' ')}",
+        }
+        (skill_dir / "SKILL.md").write_text(render_template("skill/SKILL.md", replacements))
+        (skill_dir / "reference.md").write_text(render_template("skill/reference.md", replacements))
+
+    for _ in range(rng.randint(0, max_agents)):
+        agent = component_name(rng)
+        (plugin_dir / "agents" / f"{agent}.md").write_text(render_template("agent/agent.md", {
+            "AGENT_NAME": agent,
+            "AGENT_TITLE": agent.replace("-", " ").title(),
+            "AGENT_DESCRIPTION": f"Specialized agent for {agent.replace('-', ' ')}",
+            "USE_CASES": f"{agent.replace('-', ' ')} tasks",
+            "PURPOSE": agent.replace("-", " "),
+            "DO_THIS": "follow best practices",
+            "DONT_DO_THIS": "skip verification steps",
+            "PREFERRED_APPROACH": "thorough analysis before action",
+            "EXAMPLE_REQUEST": f"Help me with {agent.replace('-', ' ')}",
+        }))
+
+    for _ in range(rng.randint(0, max_commands)):
+        command = component_name(rng)
+        (plugin_dir / "commands" / f"{command}.md").write_text(render_template("command/command.md", {
+            "COMMAND_NAME": command,
+            "COMMAND_DESCRIPTION": f"Execute {command.replace('-', ' ')}",
+            "DETAILED_PURPOSE": f"This command helps you {command.replace('-', ' ')}.",
+            "ARG1_DESCRIPTION": "First argument description",
+            "ARG2_DESCRIPTION": "Second argument description",
+            "STEP_1": "Parse and validate arguments",
+            "STEP_2": "Execute the main logic",
+            "STEP_3": "Report results to user",
+            "NOTE_1": "Important note 1",
+            "NOTE_2": "Important note 2",
+        }))
+
+
+def generate_registry(root: Path, size: int, seed: int, max_skills: int,
+                      max_agents: int, max_commands: int):
+    """Create a scratch marketplace with ``size`` synthetic plugins under root."""
+    shutil.copytree(TOOLS_DIR, root / "tools", ignore=shutil.ignore_patterns("__pycache__"))
+    (root / ".claude-plugin").mkdir(parents=True)
+    with open(REPO_ROOT / ".claude-plugin" / "marketplace.json", "r") as f:
+        marketplace = json.load(f)
+    marketplace["plugins"] = []
+    with open(root / ".claude-plugin" / "marketplace.json", "w") as f:
+        json.dump(marketplace, f, indent=2)
+
+    rng = random.Random(seed)
+    plugins_dir = root / "plugins"
+    plugins_dir.mkdir()
+    width = len(str(size))
+    names = []
+    for index in range(size):
+        name = f"bench-{index:0{width}d}"
+        generate_plugin(plugins_dir / name, index, rng, max_skills, max_agents, max_commands, names)
+        names.append(name)
+
+
+def run_tool(root: Path, args: list[str]) -> dict:
+    """Run one tool invocation in the scratch marketplace and measure it."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, *args], cwd=root,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    stderr = proc.stderr.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.stderr.close()
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return {
+        "wall_s": wall,
+        "cpu_s": usage.ru_utime + usage.ru_stime,
+        "max_rss_kb": usage.ru_maxrss,
+        "exit_code": proc.returncode,
+        "stderr": stderr.decode(errors="replace")[-2000:] if proc.returncode else "",
+    }
+
+
+def combine(runs: list[dict]) -> dict:
+    """Merge several invocations that make up one benchmark run."""
+    return {
+        "wall_s": sum(run["wall_s"] for run in runs),
+        "cpu_s": sum(run["cpu_s"] for run in runs),
+        "max_rss_kb": max(run["max_rss_kb"] for run in runs),
+        "exit_code": next((run["exit_code"] for run in runs if run["exit_code"]), 0),
+        "stderr": next((run["stderr"] for run in runs if run["stderr"]), ""),
+    }
+
+
+def bench_once(name: str, root: Path) -> dict:
+    exported = root / "exported"
+    if name == "validate":
+        return run_tool(root, ["tools/validate.py", "--all"])
+    if name == "validate-conflicts":
+        return run_tool(root, ["tools/validate.py", "--all", "--check-conflicts"])
+    if name == "generate-catalog":
+        return run_tool(root, ["tools/generate_catalog.py"])
+    if name == "export-all":
+        # Start from an empty output dir so every run builds every archive
+        shutil.rmtree(exported, ignore_errors=True)
+        return run_tool(root, ["tools/export.py", "all", "--output", "exported"])
+    if name == "import":
+        if not exported.exists():
+            run_tool(root, ["tools/export.py", "all", "--output", "exported"])
+        archives = sorted(str(path.relative_to(root)) for path in exported.glob("*.zip"))
+        # Batched so the argument list stays within ARG_MAX on large registries
+        return combine([
+            run_tool(root, ["tools/import.py", "plugin", *archives[i:i + IMPORT_BATCH], "--force"])
+            for i in range(0, len(archives), IMPORT_BATCH)
+        ])
+    raise ValueError(f"Unknown benchmark: {name}")
+
+
+def location_base(location: str) -> Path:
+    if location == "tmpfs":
+        if not TMPFS_DIR.is_dir():
+            raise FileNotFoundError(f"{TMPFS_DIR} is not available for tmpfs benchmarks")
+        return TMPFS_DIR
+    WORK_DIR.mkdir(parents=True, exist_ok=True)
+    return WORK_DIR
+
+
+def git_commit() -> dict:
+    def git(*args: str) -> str:
+        try:
+            return subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--", "tools"))}
+
+
+def run_benchmarks(args) -> Path:
+    sizes = [int(size) for size in args.sizes.split(",")]
+    locations = args.locations.split(",")
+    benchmarks = args.only.split(",") if args.only else BENCHMARKS
+    for name in benchmarks:
+        if name not in BENCHMARKS:
+            raise SystemExit(f"Error: unknown benchmark '{name}' (choose from {', '.join(BENCHMARKS)})")
+
+    report = {
+        **git_commit(),
+        "started_at": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "sizes": sizes,
+            "locations": locations,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "max_skills": args.max_skills,
+            "max_agents": args.max_agents,
+            "max_commands": args.max_commands,
+        },
+        "results": [],
+    }
+
+    for location in locations:
+        for size in sizes:
+            root = Path(tempfile.mkdtemp(prefix=f"bench-{size}-", dir=location_base(location)))
+            try:
+                start = time.perf_counter()
+                generate_registry(root, size, args.seed, args.max_skills, args.max_agents, args.max_commands)
+                generated = time.perf_counter() - start
+                files = sum(len(filenames) for _, _, filenames in os.walk(root / "plugins"))
+                print(f"\n{location}, {size} plugins ({files} files, generated in {generated:.1f}s)")
+
+                for name in benchmarks:
+                    runs = [bench_once(name, root) for _ in range(args.repeat)]
+                    walls = [run["wall_s"] for run in runs]
+                    result = {
+                        "benchmark": name,
+                        "location": location,
+                        "plugins": size,
+                        "files": files,
+                        "median_wall_s": statistics.median(walls),
+                        "min_wall_s": min(walls),
+                        "median_cpu_s": statistics.median(run["cpu_s"] for run in runs),
+                        "max_rss_kb": max(run["max_rss_kb"] for run in runs),
+                        "runs": runs,
+                    }
+                    report["results"].append(result)
+                    failed = next((run for run in runs if run["exit_code"]), None)
+                    note = f"  (exit {failed['exit_code']})" if failed else ""
+                    print(f"  {name:<20} {result['median_wall_s']:8.3f}s wall  "
+                          f"{result['median_cpu_s']:8.3f}s cpu  {result['max_rss_kb'] / 1024:7.1f} MB{note}")
+            finally:
+                if not args.keep:
+                    shutil.rmtree(root, ignore_errors=True)
+                else:
+                    print(f"  Kept registry: {root}")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}-{(report['commit'] or 'unknown')[:10]}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults: {output}")
+    return output
+
+
+def compare_results(old_path: Path, new_path: Path, threshold: float) -> bool:
+    """Print median wall time changes between two result files; False on regressions."""
+    with open(old_path, "r") as f:
+        old = json.load(f)
+    with open(new_path, "r") as f:
+        new = json.load(f)
+
+    def key(result: dict) -> tuple:
+        return result["location"], result["plugins"], result["benchmark"]
+
+    baseline = {key(result): result for result in old["results"]}
+    print(f"{(old.get('commit') or '?')[:10]} -> {(new.get('commit') or '?')[:10]}")
+
+    regressions = 0
+    for result in new["results"]:
+        before = baseline.get(key(result))
+        if before is None:
+            continue
+        change = (result["median_wall_s"] - before["median_wall_s"]) / before["median_wall_s"] * 100
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        location, plugins, name = key(result)
+        print(f"  {location:<6} {plugins:>6} {name:<20} {before['median_wall_s']:8.3f}s -> "
+              f"{result['median_wall_s']:8.3f}s  {change:+6.1f}%{flag}")
+
+    print(f"\n{regressions} regressions over {threshold:g}%")
+    return regressions == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the plugin tools on synthetic registries")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Generate registries and time the tools")
+    run.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                     help="Comma-separated registry sizes (default: 100,1000)")
+    run.add_argument("--locations", default="disk",
+                     help="Comma-separated: disk (benchmarks/.work) and/or tmpfs (/dev/shm)")
+    run.add_argument("--only", help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    run.add_argument("--repeat", type=int, default=3, help="Runs per benchmark (default: 3)")
+    run.add_argument("--seed", type=int, default=0, help="Seed for the synthetic registry")
+    run.add_argument("--max-skills", type=int, default=3, help="Max skills per plugin (default: 3)")
+    run.add_argument("--max-agents", type=int, default=2, help="Max agents per plugin (default: 2)")
+    run.add_argument("--max-commands", type=int, default=4, help="Max commands per plugin (default: 4)")
+    run.add_argument("--output", "-o", help="Results file (default: benchmarks/results/<time>-<commit>.json)")
+    run.add_argument("--keep", action="store_true", help="Keep the generated registries")
+
+    compare = subparsers.add_parser("compare", help="Compare two results files")
+    compare.add_argument("old", help="Baseline results JSON")
+    compare.add_argument("new", help="New results JSON")
+    compare.add_argument("--threshold", type=float, default=10.0,
+                         help="Percent slowdown reported as a regression (default: 10)")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run_benchmarks(args)
+    else:
+        sys.exit(0 if compare_results(Path(args.old), Path(args.new), args.threshold) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Read plugins straight out of export archives, without extracting them.
+
+scan_archive() builds the same PluginInfo that scanner.scan_plugin() builds
+for a directory, from the zip's central directory alone. Its paths are
+zipfile.Path objects rooted in the archive, so validate.py's checks read
+plugin.json, hooks.json and frontmatter headers from the compressed
+members in memory. Nothing is written to disk, and only the bytes a check
+actually needs are decompressed.
+
+Usage (as a library):
+    from archive_reader import open_archive, scan_archive
+
+    with open_archive(Path("my-plugin-1.0.0.zip")) as zipf:
+        plugin = scan_archive(zipf)
+        print(plugin.name, plugin.components())
+"""
+
+import json
+import stat
+import zipfile
+import zlib
+from pathlib import Path
+
+from blobstore import safe_relative_path
+from scanner import PluginInfo, SkillInfo
+from timings import count, phase
+
+PLUGIN_JSON_MEMBER = ".claude-plugin/plugin.json"
+
+# Limits on archive contents, enforced by import.py while extracting
+MAX_MEMBER_BYTES = 100 * 1024 * 1024
+MAX_ARCHIVE_BYTES = 500 * 1024 * 1024
+MAX_ARCHIVE_MEMBERS = 10_000
+
+# plugin.json, hooks.json and .mcp.json are read whole; cap what is inflated
+MAX_JSON_BYTES = 1024 * 1024
+
+# What opening or reading a damaged, encrypted or unsupported archive can raise
+ARCHIVE_ERRORS = (OSError, EOFError, RuntimeError, NotImplementedError, zipfile.BadZipFile, zlib.error)
+
+
+def open_archive(path: Path) -> zipfile.ZipFile:
+    """Open an archive for reading. Raises OSError or zipfile.BadZipFile."""
+    with phase("read"):
+        return zipfile.ZipFile(path, "r")
+
+
+def find_plugin_root(zipf: zipfile.ZipFile) -> str | None:
+    """Return the member prefix of the plugin root, checking the archive root then one level down."""
+    names = set(zipf.namelist())
+    if PLUGIN_JSON_MEMBER in names:
+        return ""
+    for name in sorted(names):
+        parts = name.split("/")
+        if len(parts) == 3 and "/".join(parts[1:]) == PLUGIN_JSON_MEMBER:
+            return parts[0] + "/"
+    return None
+
+
+def plugin_members(zipf: zipfile.ZipFile, prefix: str) -> dict[str, zipfile.ZipInfo]:
+    """Map each file under the plugin root to its zip entry, rejecting unsafe entries."""
+    members = {}
+    for info in zipf.infolist():
+        if info.is_dir() or not info.filename.startswith(prefix):
+            continue
+        if stat.S_ISLNK(info.external_attr >> 16):
+            raise ValueError(f"Symlinks are not allowed in plugin archives: {info.filename}")
+        rel = safe_relative_path(info.filename[len(prefix):])
+        members[rel.as_posix()] = info
+
+    if len(members) > MAX_ARCHIVE_MEMBERS:
+        raise ValueError(f"Archive has {len(members)} files (max {MAX_ARCHIVE_MEMBERS})")
+    return members
+
+
+def read_json_member(zipf: zipfile.ZipFile, info: zipfile.ZipInfo) -> tuple[dict | None, str | None]:
+    """Load a JSON member, returning (data, None) or (None, error message)."""
+    with phase("read"), zipf.open(info) as f:
+        data = f.read(MAX_JSON_BYTES + 1)
+    count("files_read")
+    count("bytes_read", len(data))
+    if len(data) > MAX_JSON_BYTES:
+        return None, f"File is larger than {MAX_JSON_BYTES} bytes"
+    try:
+        with phase("json"):
+            return json.loads(data), None
+    except ValueError as e:
+        return None, str(e)
+
+
+def read_plugin_json(zipf: zipfile.ZipFile, prefix: str) -> dict:
+    """
+    Read the plugin.json under ``prefix``, inflating at most MAX_JSON_BYTES.
+
+    Raises ValueError if it is oversized, not valid JSON or not an object.
+    """
+    data, error = read_json_member(zipf, zipf.getinfo(prefix + PLUGIN_JSON_MEMBER))
+    if error:
+        raise ValueError(f"Invalid plugin.json in archive: {error}")
+    if not isinstance(data, dict):
+        raise ValueError("Invalid plugin.json in archive: must be a JSON object")
+    return data
+
+
+def scan_archive(zipf: zipfile.ZipFile) -> PluginInfo:
+    """
+    Scan the plugin inside an open archive.
+
+    The plugin is named after the ``name`` in its plugin.json, falling back
+    to the archive's root directory or file name. Raises ValueError if the
+    archive has no plugin root, contains unsafe entries or declares more
+    than the import limits. Its paths stay readable while ``zipf`` is open.
+    """
+    prefix = find_plugin_root(zipf)
+    if prefix is None:
+        raise ValueError(f"No {PLUGIN_JSON_MEMBER} at the archive root or one level down")
+
+    with phase("walk"):
+        members = plugin_members(zipf, prefix)
+    for rel, info in members.items():
+        if info.file_size > MAX_MEMBER_BYTES:
+            raise ValueError(f"{rel} is larger than {MAX_MEMBER_BYTES} bytes")
+    if sum(info.file_size for info in members.values()) > MAX_ARCHIVE_BYTES:
+        raise ValueError(f"Archive expands to more than {MAX_ARCHIVE_BYTES} bytes")
+
+    root = zipfile.Path(zipf, prefix)
+    fallback = prefix.rstrip("/") or Path(zipf.filename or "plugin").stem
+    plugin = PluginInfo(name=fallback, path=root)
+    plugin.files = sorted(members)
+
+    plugin.plugin_json, plugin.plugin_json_error = read_json_member(zipf, members[PLUGIN_JSON_MEMBER])
+    if isinstance(plugin.plugin_json, dict) and isinstance(plugin.plugin_json.get("name"), str):
+        plugin.name = plugin.plugin_json["name"]
+
+    skill_dirs = set()
+    for rel in plugin.files:
+        parts = rel.split("/")
+        if len(parts) == 2 and parts[1].endswith(".md"):
+            if parts[0] == "commands":
+                plugin.commands.append(root / rel)
+            elif parts[0] == "agents":
+                plugin.agents.append(root / rel)
+        elif len(parts) >= 3 and parts[0] == "skills":
+            skill_dirs.add(parts[1])
+
+    for name in sorted(skill_dirs):
+        skill_md = f"skills/{name}/SKILL.md"
+        plugin.skills.append(SkillInfo(
+            name=name,
+            path=root / "skills" / name,
+            skill_md=root / skill_md if skill_md in members else None
+        ))
+
+    if "hooks/hooks.json" in members:
+        plugin.hooks_path = root / "hooks" / "hooks.json"
+        plugin.hooks, plugin.hooks_error = read_json_member(zipf, members["hooks/hooks.json"])
+
+    if ".mcp.json" in members:
+        plugin.mcp_path = root / ".mcp.json"
+        plugin.mcp, plugin.mcp_error = read_json_member(zipf, members[".mcp.json"])
+
+    return plugin
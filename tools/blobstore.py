@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Content-addressed storage for exported plugins.
+
+A store directory holds each distinct file once, named by its sha256, plus
+one manifest per plugin version listing the paths, modes and hashes that
+make up the plugin:
+
+    store/
+        blobs/ab/cdef0123...      # file content, keyed by sha256
+        manifests/my-plugin-1.0.0.json
+
+Plugins that share files (template READMEs, empty hooks.json, common
+scripts) share blobs, and two versions of a plugin can be diffed by
+comparing their manifests.
+
+Usage (as a library):
+    from blobstore import BlobStore
+
+    store = BlobStore(Path("./mirror"))
+    manifest = store.read_manifest("my-plugin-1.0.0")
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path, PurePosixPath
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+MODE_PATTERN = re.compile(r"^[0-7]{1,4}$")
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex sha256 of a file's content."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def content_hash(files: list[dict]) -> str:
+    """
+    Hash a plugin's file list, as produced for a manifest.
+
+    Each entry needs "path", "mode" (octal string) and "sha256"; entries must
+    already be in sorted path order.
+    """
+    digest = hashlib.sha256()
+    for entry in files:
+        digest.update(f"{entry['path']}\0{entry['mode']}\0".encode())
+        digest.update(bytes.fromhex(entry["sha256"]))
+    return digest.hexdigest()
+
+
+def safe_relative_path(path: str) -> PurePosixPath:
+    """Reject absolute paths and '..' components in archive or manifest paths."""
+    rel = PurePosixPath(path)
+    if rel.is_absolute() or ".." in rel.parts or not rel.parts or "\\" in path:
+        raise ValueError(f"Unsafe path in archive: {path}")
+    return rel
+
+
+def manifest_files(manifest: dict) -> list[dict]:
+    """
+    Return a manifest's file entries after checking their shape.
+
+    Every entry needs a safe relative ``path``, a lowercase hex ``sha256``
+    and, if present, an octal ``mode`` string. Raises ValueError naming the
+    first invalid entry.
+    """
+    files = manifest.get("files", []) if isinstance(manifest, dict) else None
+    if not isinstance(files, list):
+        raise ValueError("Invalid manifest: 'files' must be a list")
+
+    for number, entry in enumerate(files):
+        if not isinstance(entry, dict) or not isinstance(entry.get("path"), str):
+            raise ValueError(f"Invalid manifest: file entry {number} has no path")
+        safe_relative_path(entry["path"])
+        if not isinstance(entry.get("sha256"), str) or not SHA256_PATTERN.match(entry["sha256"]):
+            raise ValueError(f"Invalid manifest: {entry['path']} has no valid sha256")
+        mode = entry.get("mode", "644")
+        if not isinstance(mode, str) or not MODE_PATTERN.match(mode):
+            raise ValueError(f"Invalid manifest: {entry['path']} has invalid mode {mode!r}")
+    return files
+
+
+class BlobStore:
+    """A directory of sha256-addressed blobs and per-plugin manifests."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.blobs_dir = root / "blobs"
+        self.manifests_dir = root / "manifests"
+        self.tmp_dir = root / "tmp"
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blobs_dir / digest[:2] / digest[2:]
+
+    def manifest_path(self, name: str, version: str) -> Path:
+        return self.manifests_dir / f"{name}-{version}.json"
+
+    def put_file(self, path: Path, digest: str) -> bool:
+        """Copy a file in under its known digest. Returns False if already stored."""
+        blob_path = self.blob_path(digest)
+        if blob_path.exists():
+            return False
+
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with open(path, "rb") as src, os.fdopen(fd, "wb") as dst:
+                shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+            os.replace(tmp_name, blob_path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        return True
+
+    def copy_blob(self, digest: str, target: Path):
+        """Write a blob to target, verifying its hash on the way."""
+        hasher = hashlib.sha256()
+        with open(self.blob_path(digest), "rb") as src, open(target, "wb") as dst:
+            while chunk := src.read(COPY_CHUNK_SIZE):
+                hasher.update(chunk)
+                dst.write(chunk)
+        if hasher.hexdigest() != digest:
+            raise ValueError(f"Blob {digest} is corrupt (content hash {hasher.hexdigest()})")
+
+    def write_manifest(self, manifest: dict) -> Path:
+        """Write a plugin manifest atomically and return its path."""
+        path = self.manifest_path(manifest["name"], manifest["version"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+    def read_manifest(self, ref: str) -> dict:
+        """Load a manifest by path, or by "name-version" within the store."""
+        path = Path(ref)
+        if not path.exists():
+            path = self.manifests_dir / f"{ref}.json"
+        if not path.exists():
+            raise FileNotFoundError(f"Manifest '{ref}' not found in {self.manifests_dir}")
+        with open(path, "r") as f:
+            return json.load(f)
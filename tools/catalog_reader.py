@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Read plugin entries from a JSON-lines catalog without parsing all of it.
+
+catalog.jsonl holds one plugin entry per line, in the same shape as the
+entries of catalog.json, followed by one summary record:
+
+    {"name":"my-plugin","version":"1.0.0",...}
+    ...
+    {"type":"summary","generated_at":"...","total_plugins":12,...}
+
+Next to it, catalog.jsonl.idx is a binary offset index: a table of
+(offset, length) pairs for each entry, an open-addressing hash table from
+plugin name to entry, and the entries of each category. Both files are
+memory-mapped, so a lookup by name hashes the name, probes the table and
+parses only the matching line. Opening a catalog costs the same at 10
+plugins as at 100k.
+
+Usage:
+    python catalog_reader.py convert catalog.json catalog.jsonl
+    python catalog_reader.py get catalog.jsonl my-plugin
+    python catalog_reader.py list catalog.jsonl --category testing
+    python catalog_reader.py index catalog.jsonl
+
+Usage (as a library):
+    from catalog_reader import CatalogReader
+
+    with CatalogReader(Path("catalog.jsonl")) as catalog:
+        entry = catalog.get("my-plugin")
+        for entry in catalog.iter_category("testing"):
+            ...
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from pathlib import Path
+from typing import Iterator
+
+INDEX_MAGIC = b"CIDX"
+INDEX_VERSION = 1
+
+# magic, version, entry_count, slot_count, catalog_size, catalog_crc, categories_offset
+HEADER = struct.Struct("<4sIIIQIQ")
+# offset, length of one catalog line (without the newline)
+ENTRY = struct.Struct("<QI")
+# name hash, entry number + 1 (0 marks an empty slot)
+SLOT = struct.Struct("<QI")
+
+# How much of the end of the catalog is hashed to detect a stale index
+FINGERPRINT_BYTES = 4096
+
+
+def index_path_for(catalog_path: Path) -> Path:
+    """Default location of a catalog's offset index."""
+    return catalog_path.with_name(catalog_path.name + ".idx")
+
+
+def name_hash(name: str) -> int:
+    """Stable 64-bit hash of a plugin name (never 0)."""
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "little") | 1
+
+
+def catalog_fingerprint(data: bytes | mmap.mmap) -> int:
+    """CRC-32 of the catalog's tail; it covers the summary record, which changes on every write."""
+    return zlib.crc32(data[-FINGERPRINT_BYTES:])
+
+
+def write_index(index_path: Path, entries: list[tuple[str, str, int, int]],
+                catalog_size: int, fingerprint: int):
+    """
+    Write an offset index for a catalog.
+
+    ``entries`` lists (name, category, offset, length) for each plugin line
+    in catalog order.
+    """
+    slot_count = 1
+    while slot_count < 2 * len(entries):
+        slot_count *= 2
+    slots = [(0, 0)] * slot_count
+    mask = slot_count - 1
+
+    categories = {}
+    for number, (name, category, _, _) in enumerate(entries):
+        h = name_hash(name)
+        slot = h & mask
+        while slots[slot][0]:
+            slot = (slot + 1) & mask
+        slots[slot] = (h, number + 1)
+        categories.setdefault(category, []).append(number)
+
+    categories_offset = HEADER.size + ENTRY.size * len(entries) + SLOT.size * slot_count
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(entries), slot_count,
+                            catalog_size, fingerprint, categories_offset))
+        for _, _, offset, length in entries:
+            f.write(ENTRY.pack(offset, length))
+        for h, number in slots:
+            f.write(SLOT.pack(h, number))
+        f.write(json.dumps(dict(sorted(categories.items())), separators=(",", ":")).encode())
+    os.replace(tmp_path, index_path)
+
+
+def scan_lines(data: bytes | mmap.mmap) -> Iterator[tuple[int, int]]:
+    """Yield (offset, length) of each non-empty line."""
+    offset = 0
+    size = len(data)
+    while offset < size:
+        end = data.find(b"\n", offset)
+        if end == -1:
+            end = size
+        if end > offset:
+            yield offset, end - offset
+        offset = end + 1
+
+
+def build_index(catalog_path: Path, index_path: Path | None = None) -> int:
+    """Build the offset index for an existing catalog.jsonl; returns the entry count."""
+    index_path = index_path or index_path_for(catalog_path)
+    data = catalog_path.read_bytes()
+
+    entries = []
+    for offset, length in scan_lines(data):
+        record = json.loads(data[offset:offset + length])
+        if record.get("type") == "summary":
+            continue
+        entries.append((record["name"], record.get("category", "utilities"), offset, length))
+
+    write_index(index_path, entries, len(data), catalog_fingerprint(data))
+    return len(entries)
+
+
+class JsonlCatalogWriter:
+    """
+    Stream plugin entries to catalog.jsonl, then write the summary and index.
+
+    Entries are written as they are added and are not kept; only a small
+    (name, category, offset, length) tuple per plugin is, for the index.
+    Memory still grows linearly with the number of plugins, as does the
+    index's slot table (about two slots per plugin), but far more slowly
+    than holding the entries would. close() writes the summary record and
+    the index. By default lines go to a temporary file that close() moves into
+    place. With ``stream``, they go straight to ``path`` so it can be read
+    while it is being written, and the summary record marks it complete.
+    """
+
+    def __init__(self, path: Path, index_path: Path | None = None, stream: bool = False):
+        self.path = path
+        self.index_path = index_path or index_path_for(path)
+        self.tmp_path = path if stream else path.with_name(path.name + ".tmp")
+        self.entries = []
+        self.offset = 0
+        self._file = open(self.tmp_path, "wb")
+
+    def add(self, entry: dict):
+        line = json.dumps(entry, separators=(",", ":")).encode()
+        self._file.write(line + b"\n")
+        self.entries.append((entry["name"], entry.get("category", "utilities"), self.offset, len(line)))
+        self.offset += len(line) + 1
+
+    def flush(self):
+        """Make the entries written so far visible to other readers."""
+        self._file.flush()
+
+    def close(self, summary: dict):
+        self._file.write(json.dumps({"type": "summary", **summary}, separators=(",", ":")).encode() + b"\n")
+        self._file.close()
+
+        size = self.tmp_path.stat().st_size
+        with open(self.tmp_path, "rb") as f:
+            f.seek(max(0, size - FINGERPRINT_BYTES))
+            fingerprint = catalog_fingerprint(f.read())
+
+        if self.tmp_path != self.path:
+            os.replace(self.tmp_path, self.path)
+        write_index(self.index_path, self.entries, size, fingerprint)
+
+    def abort(self):
+        self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+def write_jsonl_catalog(catalog: dict, path: Path) -> int:
+    """Write a catalog.json-style dict as catalog.jsonl plus its index."""
+    writer = JsonlCatalogWriter(path)
+    try:
+        for entry in catalog.get("plugins", []):
+            writer.add(entry)
+    except BaseException:
+        writer.abort()
+        raise
+
+    summary = {key: value for key, value in catalog.items() if key != "plugins"}
+    categories = {}
+    for entry in catalog.get("plugins", []):
+        category = entry.get("category", "utilities")
+        categories[category] = categories.get(category, 0) + 1
+    summary["categories"] = dict(sorted(categories.items()))
+    writer.close(summary)
+    return len(writer.entries)
+
+
+class CatalogReader:
+    """Random access to a catalog.jsonl through its memory-mapped offset index."""
+
+    def __init__(self, path: Path, index_path: Path | None = None):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._index = None
+        self._index_file = None
+        self._categories = None
+
+        index_path = index_path or index_path_for(path)
+        if not self._open_index(index_path, size):
+            # Missing or stale index: build one in memory from a single pass
+            print(f"Catalog index {index_path} is missing or stale, scanning {path}", file=sys.stderr)
+            self._build_in_memory()
+
+    def _open_index(self, index_path: Path, catalog_size: int) -> bool:
+        try:
+            index_file = open(index_path, "rb")
+        except FileNotFoundError:
+            return False
+
+        if os.fstat(index_file.fileno()).st_size < HEADER.size:
+            index_file.close()
+            return False
+        index = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, entry_count, slot_count, size, fingerprint, categories_offset = \
+            HEADER.unpack_from(index, 0)
+        if (magic != INDEX_MAGIC or version != INDEX_VERSION or size != catalog_size
+                or fingerprint != catalog_fingerprint(self._data)):
+            index.close()
+            index_file.close()
+            return False
+
+        self._index_file = index_file
+        self._index = index
+        self._entry_count = entry_count
+        self._slot_count = slot_count
+        self._slots_offset = HEADER.size + ENTRY.size * entry_count
+        self._categories_offset = categories_offset
+        return True
+
+    def _build_in_memory(self):
+        entries = []
+        categories = {}
+        for offset, length in scan_lines(self._data):
+            record = json.loads(self._data[offset:offset + length])
+            if record.get("type") == "summary":
+                continue
+            categories.setdefault(record.get("category", "utilities"), []).append(len(entries))
+            entries.append((record["name"], offset, length))
+
+        self._memory_entries = [(offset, length) for _, offset, length in entries]
+        self._memory_names = {name: number for number, (name, _, _) in enumerate(entries)}
+        self._categories = categories
+        self._entry_count = len(entries)
+
+    def _entry_span(self, number: int) -> tuple[int, int]:
+        if self._index is None:
+            return self._memory_entries[number]
+        return ENTRY.unpack_from(self._index, HEADER.size + ENTRY.size * number)
+
+    def _read_entry(self, number: int) -> dict:
+        offset, length = self._entry_span(number)
+        return json.loads(self._data[offset:offset + length])
+
+    def get(self, name: str) -> dict | None:
+        """Return the entry for a plugin, or None if the catalog has no such plugin."""
+        if self._index is None:
+            number = self._memory_names.get(name)
+            return None if number is None else self._read_entry(number)
+
+        if not self._slot_count:
+            return None
+        h = name_hash(name)
+        mask = self._slot_count - 1
+        slot = h & mask
+        while True:
+            slot_hash, number = SLOT.unpack_from(self._index, self._slots_offset + SLOT.size * slot)
+            if not number:
+                return None
+            if slot_hash == h:
+                entry = self._read_entry(number - 1)
+                if entry.get("name") == name:
+                    return entry
+            slot = (slot + 1) & mask
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def __len__(self) -> int:
+        return self._entry_count
+
+    def __iter__(self) -> Iterator[dict]:
+        for number in range(self._entry_count):
+            yield self._read_entry(number)
+
+    def categories(self) -> dict[str, list[int]]:
+        """Map each category to the numbers of its entries."""
+        if self._categories is None:
+            self._categories = json.loads(self._index[self._categories_offset:])
+        return self._categories
+
+    def iter_category(self, category: str) -> Iterator[dict]:
+        """Yield the entries of one category, parsing only those lines."""
+        for number in self.categories().get(category, []):
+            yield self._read_entry(number)
+
+    def summary(self) -> dict | None:
+        """The trailing summary record, if the catalog has one."""
+        data = self._data
+        end = len(data)
+        while end and data[end - 1:end] == b"\n":
+            end -= 1
+        start = data.rfind(b"\n", 0, end) + 1
+        if start >= end:
+            return None
+        record = json.loads(data[start:end])
+        return record if record.get("type") == "summary" else None
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+        if self._index is not None:
+            self._index.close()
+            self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read a JSON-lines plugin catalog")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert = subparsers.add_parser("convert", help="Convert catalog.json to catalog.jsonl")
+    convert.add_argument("source", help="catalog.json to read")
+    convert.add_argument("output", help="catalog.jsonl to write")
+
+    get = subparsers.add_parser("get", help="Print one plugin entry")
+    get.add_argument("catalog")
+    get.add_argument("name")
+
+    list_parser = subparsers.add_parser("list", help="List plugins, optionally by category")
+    list_parser.add_argument("catalog")
+    list_parser.add_argument("--category", "-c", help="Only plugins in this category")
+
+    index = subparsers.add_parser("index", help="Rebuild the offset index of a catalog.jsonl")
+    index.add_argument("catalog")
+
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        with open(args.source, "r") as f:
+            catalog = json.load(f)
+        count = write_jsonl_catalog(catalog, Path(args.output))
+        print(f"Wrote {count} plugins: {args.output}")
+        return
+
+    if args.command == "index":
+        count = build_index(Path(args.catalog))
+        print(f"Indexed {count} plugins: {index_path_for(Path(args.catalog))}")
+        return
+
+    with CatalogReader(Path(args.catalog)) as catalog:
+        if args.command == "get":
+            entry = catalog.get(args.name)
+            if entry is None:
+                print(f"Error: Plugin '{args.name}' not found in {args.catalog}")
+                sys.exit(1)
+            print(json.dumps(entry, indent=2))
+        else:
+            entries = catalog.iter_category(args.category) if args.category else iter(catalog)
+            for entry in entries:
+                print(f"{entry['name']} {entry.get('version', '')} [{entry.get('category', 'utilities')}]")
+
+
+if __name__ == "__main__":
+    main()
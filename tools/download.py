@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Download plugin archives over HTTP(S) with caching, resume and pooling.
+
+Each URL is cached under .download-cache/ together with the ETag and
+Last-Modified the server sent for it. Later fetches of the same URL send
+a conditional request and reuse the cached file on 304 Not Modified. An
+interrupted download is kept as a .part file and resumed with a Range
+request, guarded by If-Range so a changed file is fetched from scratch.
+
+Connections are kept alive and reused across requests to the same host,
+so a batch of downloads from one release page or mirror shares a few
+sockets instead of opening one per file.
+
+Usage (as a library):
+    from download import Downloader
+
+    downloader = Downloader()
+    path = downloader.fetch("https://example.com/my-plugin-1.0.0.zip")
+    results = downloader.fetch_all(urls, jobs=8)
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+from blobstore import COPY_CHUNK_SIZE
+from timings import phase
+
+DOWNLOAD_CACHE_DIR = Path(__file__).parent.parent / ".download-cache"
+META_FILE = "meta.json"
+MAX_REDIRECTS = 5
+REQUEST_TIMEOUT = 60
+USER_AGENT = "claude-code-plugin-marketplace-tools"
+
+
+class DownloadError(Exception):
+    """Raised when a URL cannot be fetched."""
+
+
+class ConnectionPool:
+    """Idle keep-alive connections, shared between threads and keyed by host."""
+
+    def __init__(self, timeout: float = REQUEST_TIMEOUT):
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop()
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def release(self, scheme: str, netloc: str, conn: http.client.HTTPConnection):
+        with self._lock:
+            self._idle.setdefault((scheme, netloc), []).append(conn)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+class Downloader:
+    """Fetches URLs into an on-disk cache through a shared connection pool."""
+
+    def __init__(self, cache_dir: Path = DOWNLOAD_CACHE_DIR, pool: ConnectionPool | None = None):
+        self.cache_dir = cache_dir
+        self.pool = pool or ConnectionPool()
+
+    def entry_dir(self, url: str) -> Path:
+        return self.cache_dir / hashlib.sha256(url.encode()).hexdigest()[:32]
+
+    def fetch(self, url: str) -> Path:
+        """Return a local path holding the current content of url."""
+        with phase("download"):
+            return self._fetch(url)
+
+    def _fetch(self, url: str) -> Path:
+        entry_dir = self.entry_dir(url)
+        filename = os.path.basename(urlsplit(url).path)
+        if filename in ("", ".", "..", META_FILE, META_FILE + ".tmp"):
+            # Not usable as a file name inside the cache entry
+            filename = "download"
+        path = entry_dir / filename
+        part_path = entry_dir / (filename + ".part")
+        meta = self._read_meta(entry_dir)
+
+        headers = {}
+        offset = 0
+        if path.exists():
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        elif part_path.exists() and (meta.get("etag") or meta.get("last_modified")):
+            offset = part_path.stat().st_size
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = meta.get("etag") or meta["last_modified"]
+
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        scheme, netloc, response, conn = self._open(url, headers)
+        reusable = False
+        try:
+            if response.status == 304 and path.exists():
+                response.read()
+                reusable = not response.will_close
+                return path
+
+            if response.status == 206 and offset and _range_start(response) == offset:
+                mode = "ab"
+            elif response.status == 200:
+                mode = "wb"
+                offset = 0
+            else:
+                raise DownloadError(f"{url}: HTTP {response.status} {response.reason}")
+
+            self._write_meta(entry_dir, {
+                "url": url,
+                "etag": response.getheader("ETag"),
+                "last_modified": response.getheader("Last-Modified"),
+            })
+
+            with open(part_path, mode) as f:
+                while chunk := response.read(COPY_CHUNK_SIZE):
+                    f.write(chunk)
+            reusable = not response.will_close
+        except (OSError, http.client.HTTPException) as e:
+            raise DownloadError(f"{url}: {e}") from e
+        finally:
+            if reusable:
+                self.pool.release(scheme, netloc, conn)
+            else:
+                conn.close()
+
+        expected = response.getheader("Content-Length")
+        try:
+            if expected is not None and part_path.stat().st_size != offset + int(expected):
+                raise DownloadError(f"{url}: download incomplete, will resume on the next attempt")
+            os.replace(part_path, path)
+        except (OSError, ValueError) as e:
+            raise DownloadError(f"{url}: {e}") from e
+        return path
+
+    def fetch_all(self, urls: list[str], jobs: int = 4) -> list[tuple[str, Path | None, str | None]]:
+        """
+        Fetch several URLs, up to ``jobs`` at a time.
+
+        Returns (url, path, error) for each URL in input order; path is None
+        when the download failed.
+        """
+        def fetch_one(url):
+            try:
+                return url, self.fetch(url), None
+            except DownloadError as e:
+                return url, None, str(e)
+
+        unique = list(dict.fromkeys(urls))
+        if jobs > 1 and len(unique) > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                results = dict((r[0], r) for r in executor.map(fetch_one, unique))
+        else:
+            results = dict((r[0], r) for r in map(fetch_one, unique))
+        return [results[url] for url in urls]
+
+    def close(self):
+        self.pool.close()
+
+    def _open(self, url: str, headers: dict):
+        """Send a GET, following redirects; returns the final response and its connection."""
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https"):
+                raise DownloadError(f"Unsupported URL scheme: {url}")
+            target = parts.path or "/"
+            if parts.query:
+                target += "?" + parts.query
+
+            request_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity", **headers}
+            response, conn = self._send(parts.scheme, parts.netloc, target, request_headers)
+
+            if response.status in (301, 302, 303, 307, 308):
+                location = response.getheader("Location")
+                response.read()
+                if response.will_close:
+                    conn.close()
+                else:
+                    self.pool.release(parts.scheme, parts.netloc, conn)
+                if not location:
+                    raise DownloadError(f"{url}: redirect without a Location header")
+                url = urljoin(url, location)
+                continue
+
+            return parts.scheme, parts.netloc, response, conn
+
+        raise DownloadError(f"{url}: too many redirects")
+
+    def _send(self, scheme: str, netloc: str, target: str, headers: dict):
+        # A pooled connection may have been closed by the server while idle;
+        # retry once on a fresh one before giving up.
+        for attempt in range(2):
+            conn = self.pool.acquire(scheme, netloc)
+            try:
+                conn.request("GET", target, headers=headers)
+                return conn.getresponse(), conn
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                if attempt:
+                    raise DownloadError(f"{scheme}://{netloc}{target}: {e}") from e
+
+    def _read_meta(self, entry_dir: Path) -> dict:
+        try:
+            with open(entry_dir / META_FILE, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_meta(self, entry_dir: Path, meta: dict):
+        tmp_path = entry_dir / (META_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, entry_dir / META_FILE)
+
+
+def _range_start(response: http.client.HTTPResponse) -> int | None:
+    """First byte offset of a 206 response's Content-Range."""
+    content_range = response.getheader("Content-Range", "")
+    unit, _, spec = content_range.partition(" ")
+    if unit != "bytes" or "-" not in spec:
+        return None
+    try:
+        return int(spec.split("-", 1)[0])
+    except ValueError:
+        return None
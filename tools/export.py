@@ -9,100 +9,201 @@ Usage:
     python export.py command my-cmd --plugin my-plugin --output ./exported/
     python export.py hook --plugin my-plugin --output ./exported/
     python export.py all --output ./exported/
+    python export.py all --output ./exported/ --jobs 8
+    python export.py all --output ./mirror/ --store
 """
 
 import argparse
 import json
 import os
 import shutil
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
-PLUGINS_DIR = Path(__file__).parent.parent / "plugins"
+from blobstore import BlobStore, content_hash, file_sha256
+from scanner import PLUGINS_DIR, PluginInfo, scan_plugin, scan_plugins
+from timings import add_timing_arguments, count, phase, start_timings
 
 
-def count_components(plugin_dir: Path) -> dict:
-    """Count components in a plugin."""
-    components = {
-        "commands": 0,
-        "agents": 0,
-        "skills": 0,
-        "hooks": False,
-        "mcp_servers": 0
-    }
+# Fixed metadata so identical plugin content always produces identical zips
+ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+ZIP_CREATE_SYSTEM = 3  # Unix, so external_attr carries the file mode
+COPY_CHUNK_SIZE = 1024 * 1024
 
-    commands_dir = plugin_dir / "commands"
-    if commands_dir.exists():
-        components["commands"] = len(list(commands_dir.glob("*.md")))
+# Keeps report lines whole when plugins are exported from several threads
+_output_lock = threading.Lock()
 
-    agents_dir = plugin_dir / "agents"
-    if agents_dir.exists():
-        components["agents"] = len(list(agents_dir.glob("*.md")))
 
-    skills_dir = plugin_dir / "skills"
-    if skills_dir.exists():
-        components["skills"] = len([d for d in skills_dir.iterdir() if d.is_dir() and (d / "SKILL.md").exists()])
+def _report(*lines: str):
+    with _output_lock:
+        for line in lines:
+            print(line)
 
-    hooks_file = plugin_dir / "hooks" / "hooks.json"
-    if hooks_file.exists():
-        with open(hooks_file, "r") as f:
-            hooks_data = json.load(f)
-            components["hooks"] = bool(hooks_data.get("hooks"))
 
-    mcp_file = plugin_dir / ".mcp.json"
-    if mcp_file.exists():
-        with open(mcp_file, "r") as f:
-            mcp_data = json.load(f)
-            components["mcp_servers"] = len(mcp_data.get("mcpServers", {}))
+def _zip_mode(path: Path) -> int:
+    """Normalize a file's permissions to 0644, or 0755 if it is executable."""
+    return 0o755 if os.stat(path).st_mode & 0o111 else 0o644
 
-    return components
 
+def plugin_file_entries(plugin: PluginInfo) -> list[dict]:
+    """Describe every file in the plugin by path, mode, size and sha256."""
+    entries = []
+    for arcname in plugin.files:
+        file_path = plugin.path / arcname
+        entries.append({
+            "path": arcname,
+            "mode": f"{_zip_mode(file_path):o}",
+            "size": os.path.getsize(file_path),
+            "sha256": file_sha256(file_path)
+        })
+    return entries
 
-def export_plugin(name: str, output_dir: Path) -> Path:
-    """Export a plugin to a zip file."""
-    plugin_dir = PLUGINS_DIR / name
 
-    if not plugin_dir.exists():
-        raise FileNotFoundError(f"Plugin '{name}' not found")
+def plugin_content_hash(plugin: PluginInfo) -> str:
+    """Hash every file path, mode and content in the plugin, in sorted order."""
+    with phase("hash"):
+        return content_hash(plugin_file_entries(plugin))
 
-    # Read plugin.json for version
-    plugin_json_path = plugin_dir / ".claude-plugin" / "plugin.json"
-    with open(plugin_json_path, "r") as f:
-        plugin_data = json.load(f)
 
-    version = plugin_data.get("version", "1.0.0")
+def write_reproducible_zip(plugin: PluginInfo, zip_path: Path):
+    """
+    Stream the plugin's files into a zip with sorted entries and fixed
+    timestamps and modes. The archive is written to a temporary file and
+    renamed into place, so a partial zip is never left at zip_path.
+    """
+    tmp_path = zip_path.with_name(zip_path.name + ".tmp")
+
+    with phase("compress"), zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for arcname in plugin.files:
+            file_path = plugin.path / arcname
+            info = zipfile.ZipInfo(arcname, date_time=ZIP_TIMESTAMP)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.create_system = ZIP_CREATE_SYSTEM
+            info.external_attr = (0o100000 | _zip_mode(file_path)) << 16
+            size = os.path.getsize(file_path)
+            with open(file_path, "rb") as src, zipf.open(info, "w", force_zip64=size >= zipfile.ZIP64_LIMIT) as dst:
+                shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+            count("files_read")
+            count("bytes_read", size)
+
+    os.replace(tmp_path, zip_path)
+    count("files_written")
+    count("bytes_written", zip_path.stat().st_size)
+
+
+def export_plugin(name: str, output_dir: Path, plugin: PluginInfo | None = None) -> Path:
+    """
+    Export a plugin to a zip file.
+
+    Archives are reproducible: identical plugin content produces a
+    byte-identical zip. If the existing manifest records the same content
+    hash and its zip is present, the export is skipped.
+    """
+    plugin = _load_plugin(name, plugin)
+
+    # Read plugin.json for version
+    version = plugin.plugin_json.get("version", "1.0.0")
 
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Create zip file
     zip_name = f"{name}-{version}.zip"
     zip_path = output_dir / zip_name
+    manifest_path = output_dir / f"{name}-{version}.manifest.json"
 
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for file_path in plugin_dir.rglob("*"):
-            if file_path.is_file():
-                arcname = file_path.relative_to(plugin_dir)
-                zipf.write(file_path, arcname)
+    # Skip if the archive already holds exactly this content
+    plugin_hash = plugin_content_hash(plugin)
+    try:
+        with open(manifest_path, "r") as f:
+            previous = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        previous = {}
+    if previous.get("content_sha256") == plugin_hash and zip_path.exists():
+        _report(f"Up to date: {zip_path}")
+        return zip_path
+
+    # Create zip file
+    write_reproducible_zip(plugin, zip_path)
+
+    archive_hash = file_sha256(zip_path)
 
     # Also create manifest
     manifest = {
         "name": name,
         "version": version,
         "exported_at": datetime.utcnow().isoformat() + "Z",
-        "components": count_components(plugin_dir)
+        "components": plugin.components(),
+        "content_sha256": plugin_hash,
+        "archive_sha256": archive_hash
     }
 
-    manifest_path = output_dir / f"{name}-{version}.manifest.json"
-    with open(manifest_path, "w") as f:
+    with phase("write"), open(manifest_path, "w") as f:
         json.dump(manifest, f, indent=2)
 
-    print(f"Exported: {zip_path}")
-    print(f"Manifest: {manifest_path}")
+    _report(f"Exported: {zip_path}", f"Manifest: {manifest_path}")
     return zip_path
 
 
+def _load_plugin(name: str, plugin: PluginInfo | None) -> PluginInfo:
+    if plugin is None:
+        plugin = scan_plugin(PLUGINS_DIR / name)
+
+    if plugin is None:
+        raise FileNotFoundError(f"Plugin '{name}' not found")
+    if plugin.plugin_json_error:
+        raise ValueError(f"Invalid JSON in {plugin.plugin_json_path}: {plugin.plugin_json_error}")
+    if plugin.plugin_json is None:
+        raise FileNotFoundError(f"plugin.json not found for '{name}'")
+    return plugin
+
+
+def export_plugin_to_store(name: str, store_dir: Path, plugin: PluginInfo | None = None) -> Path:
+    """
+    Export a plugin into a content-addressed blob store.
+
+    Each file is stored once under its sha256, shared with every other
+    plugin that contains the same bytes, and a manifest listing the
+    plugin's paths and hashes is written to the store's manifests/.
+    """
+    plugin = _load_plugin(name, plugin)
+    version = plugin.plugin_json.get("version", "1.0.0")
+    store = BlobStore(store_dir)
+    manifest_path = store.manifest_path(name, version)
+
+    files = plugin_file_entries(plugin)
+    plugin_hash = content_hash(files)
+
+    try:
+        with open(manifest_path, "r") as f:
+            previous = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        previous = {}
+    if previous.get("content_sha256") == plugin_hash:
+        _report(f"Up to date: {manifest_path}")
+        return manifest_path
+
+    new_blobs = 0
+    for entry in files:
+        if store.put_file(plugin.path / entry["path"], entry["sha256"]):
+            new_blobs += 1
+
+    manifest = {
+        "name": name,
+        "version": version,
+        "exported_at": datetime.utcnow().isoformat() + "Z",
+        "components": plugin.components(),
+        "content_sha256": plugin_hash,
+        "files": files
+    }
+    store.write_manifest(manifest)
+
+    _report(f"Stored: {manifest_path} ({len(files)} files, {new_blobs} new blobs)")
+    return manifest_path
+
+
 def export_skill(skill_name: str, plugin_name: str, output_dir: Path) -> Path:
     """Export a single skill to a directory."""
     skill_dir = PLUGINS_DIR / plugin_name / "skills" / skill_name
@@ -201,14 +302,29 @@ def export_hooks(plugin_name: str, output_dir: Path) -> Path:
     return export_path
 
 
-def export_all(output_dir: Path):
-    """Export all plugins."""
-    for plugin_dir in PLUGINS_DIR.iterdir():
-        if plugin_dir.is_dir() and (plugin_dir / ".claude-plugin" / "plugin.json").exists():
-            try:
-                export_plugin(plugin_dir.name, output_dir)
-            except Exception as e:
-                print(f"Error exporting {plugin_dir.name}: {e}")
+def export_all(output_dir: Path, jobs: int = 1, store: bool = False):
+    """
+    Export all plugins, building up to ``jobs`` archives concurrently.
+
+    With ``store``, output_dir is a blob store and plugins are exported
+    with export_plugin_to_store instead of as zip files.
+    """
+    plugins = [p for p in scan_plugins(PLUGINS_DIR) if p.has_plugin_json]
+    exporter = export_plugin_to_store if store else export_plugin
+
+    def export(plugin: PluginInfo):
+        try:
+            exporter(plugin.name, output_dir, plugin)
+        except Exception as e:
+            _report(f"Error exporting {plugin.name}: {e}")
+
+    if jobs > 1:
+        # zlib and file I/O release the GIL, so threads compress in parallel
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            list(executor.map(export, plugins))
+    else:
+        for plugin in plugins:
+            export(plugin)
 
 
 def main():
@@ -217,15 +333,24 @@ def main():
     parser.add_argument("name", nargs="?", help="Name of the component")
     parser.add_argument("--plugin", "-p", help="Plugin name (for skill/agent/command/hook)")
     parser.add_argument("--output", "-o", default="./exported", help="Output directory")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Build this many archives concurrently with 'all' (0 = one per CPU)")
+    parser.add_argument("--store", action="store_true",
+                        help="Write plugins into a content-addressed blob store at --output")
 
+    add_timing_arguments(parser)
     args = parser.parse_args()
+    start_timings(args, "export")
     output_dir = Path(args.output)
 
     if args.type == "plugin":
         if not args.name:
             print("Error: name required for plugin export")
             return
-        export_plugin(args.name, output_dir)
+        if args.store:
+            export_plugin_to_store(args.name, output_dir)
+        else:
+            export_plugin(args.name, output_dir)
     elif args.type == "skill":
         if not args.name or not args.plugin:
             print("Error: name and --plugin required for skill export")
@@ -247,7 +372,7 @@ def main():
             return
         export_hooks(args.plugin, output_dir)
     elif args.type == "all":
-        export_all(output_dir)
+        export_all(output_dir, args.jobs if args.jobs > 0 else (os.cpu_count() or 1), args.store)
 
 
 if __name__ == "__main__":
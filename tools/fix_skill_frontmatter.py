@@ -6,10 +6,12 @@ Adds 'name' field derived from directory name if missing.
 Can be run standalone or imported by other tools.
 """
 
-import re
 import sys
 from pathlib import Path
 
+from frontmatter import FrontmatterError, read_frontmatter
+from scanner import PluginInfo, scan_plugin, scan_plugins
+
 
 def fix_skill_frontmatter(skill_md_path: Path, dry_run: bool = False) -> bool:
     """
@@ -17,25 +19,22 @@ def fix_skill_frontmatter(skill_md_path: Path, dry_run: bool = False) -> bool:
 
     Returns True if changes were made, False otherwise.
     """
-    content = skill_md_path.read_text()
-
-    if not content.startswith("---"):
+    try:
+        frontmatter = read_frontmatter(skill_md_path)
+    except FrontmatterError:
         return False
 
-    parts = content.split("---", 2)
-    if len(parts) < 3:
+    if frontmatter is None:
         return False
 
-    frontmatter = parts[1]
-    body = parts[2]
-    skill_name = skill_md_path.parent.name
-
     # Check if name is missing
-    if "name:" not in frontmatter:
-        # Add name as first field in frontmatter
-        frontmatter = f"\nname: {skill_name}" + frontmatter
+    if "name" not in frontmatter:
+        skill_name = skill_md_path.parent.name
 
-        new_content = f"---{frontmatter}---{body}"
+        # Add name as first field in frontmatter
+        content = skill_md_path.read_text()
+        header_start = content.index("\n") + 1
+        new_content = content[:header_start] + f"name: {skill_name}\n" + content[header_start:]
 
         if not dry_run:
             skill_md_path.write_text(new_content)
@@ -45,33 +44,27 @@ def fix_skill_frontmatter(skill_md_path: Path, dry_run: bool = False) -> bool:
     return False
 
 
-def fix_all_skills(plugins_dir: Path, dry_run: bool = False) -> dict:
-    """Fix all SKILL.md files in all plugins."""
-    results = {"fixed": [], "skipped": [], "errors": []}
-
-    for plugin_dir in plugins_dir.iterdir():
-        if not plugin_dir.is_dir():
+def fix_plugin_skills(plugin: PluginInfo, results: dict, dry_run: bool = False):
+    """Fix all SKILL.md files in one scanned plugin, recording into results."""
+    for skill in plugin.skills:
+        if skill.skill_md is None:
             continue
 
-        skills_dir = plugin_dir / "skills"
-        if not skills_dir.exists():
-            continue
+        try:
+            if fix_skill_frontmatter(skill.skill_md, dry_run):
+                results["fixed"].append(str(skill.skill_md))
+            else:
+                results["skipped"].append(str(skill.skill_md))
+        except Exception as e:
+            results["errors"].append(f"{skill.skill_md}: {e}")
 
-        for skill_dir in skills_dir.iterdir():
-            if not skill_dir.is_dir():
-                continue
 
-            skill_md = skill_dir / "SKILL.md"
-            if not skill_md.exists():
-                continue
+def fix_all_skills(plugins_dir: Path, dry_run: bool = False) -> dict:
+    """Fix all SKILL.md files in all plugins."""
+    results = {"fixed": [], "skipped": [], "errors": []}
 
-            try:
-                if fix_skill_frontmatter(skill_md, dry_run):
-                    results["fixed"].append(str(skill_md))
-                else:
-                    results["skipped"].append(str(skill_md))
-            except Exception as e:
-                results["errors"].append(f"{skill_md}: {e}")
+    for plugin in scan_plugins(plugins_dir):
+        fix_plugin_skills(plugin, results, dry_run)
 
     return results
 
@@ -89,25 +82,12 @@ def main():
     plugins_dir = Path(__file__).parent.parent / "plugins"
 
     if args.plugin:
-        plugin_dir = plugins_dir / args.plugin
-        if not plugin_dir.exists():
+        plugin = scan_plugin(plugins_dir / args.plugin)
+        if plugin is None:
             print(f"Error: Plugin '{args.plugin}' not found")
             sys.exit(1)
-        # Create a temp dir structure for single plugin
         results = {"fixed": [], "skipped": [], "errors": []}
-        skills_dir = plugin_dir / "skills"
-        if skills_dir.exists():
-            for skill_dir in skills_dir.iterdir():
-                if skill_dir.is_dir():
-                    skill_md = skill_dir / "SKILL.md"
-                    if skill_md.exists():
-                        try:
-                            if fix_skill_frontmatter(skill_md, args.dry_run):
-                                results["fixed"].append(str(skill_md))
-                            else:
-                                results["skipped"].append(str(skill_md))
-                        except Exception as e:
-                            results["errors"].append(f"{skill_md}: {e}")
+        fix_plugin_skills(plugin, results, args.dry_run)
     else:
         results = fix_all_skills(plugins_dir, args.dry_run)
 
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Read and parse the YAML frontmatter of skill, agent and command files.
+
+Only the header is read from disk: lines are consumed up to the closing
+``---`` and the body is never loaded. The header is parsed with a small
+built-in YAML subset that covers what plugin frontmatter uses (scalars,
+quoted strings, block lists, flow lists and block scalars). Anything
+outside that subset is handed to PyYAML when it is installed.
+
+Usage (as a library):
+    from frontmatter import FrontmatterError, read_frontmatter
+
+    fields = read_frontmatter(Path("skills/my-skill/SKILL.md"))
+    if fields is None:
+        print("no frontmatter")
+"""
+
+import json
+import re
+from pathlib import Path
+
+from timings import count, phase
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+DELIMITER = "---"
+MAX_HEADER_BYTES = 64 * 1024
+
+KEY_PATTERN = re.compile(r"^[A-Za-z0-9_][A-Za-z0-9_.-]*$")
+INT_PATTERN = re.compile(r"^[-+]?[0-9]+$")
+
+
+class FrontmatterError(Exception):
+    """Raised when a file has a frontmatter header that cannot be parsed."""
+
+
+class _Unsupported(Exception):
+    """The header uses YAML outside the built-in subset."""
+
+
+def read_header(path: Path) -> str | None:
+    """
+    Return the raw text between the opening and closing ``---`` lines.
+
+    Returns None if the file does not start with a ``---`` line. Raises
+    FrontmatterError if the header is never closed. ``path`` may also be a
+    zipfile.Path, so headers can be read from an archive member.
+    """
+    with path.open("rb") as f:
+        first = f.readline(MAX_HEADER_BYTES)
+        if first.rstrip(b"\r\n").rstrip() != DELIMITER.encode():
+            return None
+
+        lines = []
+        size = len(first)
+        while True:
+            line = f.readline(MAX_HEADER_BYTES)
+            if not line:
+                raise FrontmatterError("Invalid frontmatter format")
+            size += len(line)
+            if size > MAX_HEADER_BYTES:
+                raise FrontmatterError(
+                    f"Frontmatter exceeds {MAX_HEADER_BYTES} bytes without a closing '{DELIMITER}'"
+                )
+            if line.rstrip(b"\r\n").rstrip() == DELIMITER.encode():
+                break
+            lines.append(line)
+
+    try:
+        return b"".join(lines).decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise FrontmatterError(f"Frontmatter is not valid UTF-8: {e}")
+
+
+def read_frontmatter(path: Path) -> dict | None:
+    """
+    Parse the frontmatter of a Markdown file into a dict.
+
+    Returns None if the file has no frontmatter. Raises FrontmatterError if
+    the header is malformed and FileNotFoundError if the file is missing.
+    """
+    with phase("read"):
+        header = read_header(path)
+    count("files_read")
+    if header is None:
+        return None
+    count("bytes_read", len(header))
+    with phase("frontmatter"):
+        return parse_frontmatter(header)
+
+
+def parse_frontmatter(text: str) -> dict:
+    """Parse frontmatter text, falling back to PyYAML outside the subset."""
+    try:
+        return _parse_subset(text)
+    except _Unsupported as e:
+        if yaml is None:
+            raise FrontmatterError(f"Unsupported YAML in frontmatter ({e}); install PyYAML to parse it")
+
+    try:
+        data = yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        raise FrontmatterError(f"Invalid YAML in frontmatter: {e}")
+
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise FrontmatterError("Frontmatter must be a mapping of fields")
+    return data
+
+
+def _scalar(value: str):
+    """Convert a plain scalar the way YAML's core schema would."""
+    lowered = value.lower()
+    if lowered in ("", "~", "null"):
+        return None
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+    if INT_PATTERN.match(value):
+        return int(value)
+    return value
+
+
+def _strip_comment(value: str) -> str:
+    index = value.find(" #")
+    return value[:index].rstrip() if index != -1 else value
+
+
+def _inline_value(value: str):
+    """Parse a value that fits on the key's own line."""
+    if value.startswith('"'):
+        if len(value) < 2 or not value.endswith('"'):
+            raise _Unsupported("multi-line double-quoted string")
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            raise _Unsupported("double-quoted escape sequence")
+
+    if value.startswith("'"):
+        if len(value) < 2 or not value.endswith("'"):
+            raise _Unsupported("multi-line single-quoted string")
+        return value[1:-1].replace("''", "'")
+
+    if value[0] in "&*!%@`{":
+        raise _Unsupported(f"value starting with '{value[0]}'")
+
+    value = _strip_comment(value)
+
+    # A flow list like [a, b]; "[arg1] [arg2]" stays a plain string
+    if value.startswith("[") and value.endswith("]") and "[" not in value[1:-1] and "]" not in value[1:-1]:
+        inner = value[1:-1].strip()
+        if not inner:
+            return []
+        if any(c in inner for c in "\"'{}"):
+            raise _Unsupported("quoted flow list items")
+        return [_scalar(item.strip()) for item in inner.split(",")]
+
+    return _scalar(value)
+
+
+def _block_scalar(indicator: str, lines: list[str]) -> str:
+    """Join the lines of a | or > block scalar."""
+    if indicator not in ("|", "|-", ">", ">-"):
+        raise _Unsupported(f"block scalar indicator '{indicator}'")
+
+    indents = [len(line) - len(line.lstrip()) for line in lines if line.strip()]
+    indent = min(indents) if indents else 0
+    body = [line[indent:] for line in lines]
+
+    if indicator.startswith("|"):
+        text = "\n".join(body)
+    else:
+        paragraphs, current = [], []
+        for line in body:
+            if line.strip():
+                current.append(line.strip())
+            else:
+                paragraphs.append(" ".join(current))
+                current = []
+        paragraphs.append(" ".join(current))
+        text = "\n".join(paragraphs)
+
+    text = text.rstrip("\n")
+    return text if indicator.endswith("-") else text + "\n"
+
+
+def _parse_subset(text: str) -> dict:
+    """Parse a flat mapping of scalars and lists, raising _Unsupported otherwise."""
+    result = {}
+    lines = text.splitlines()
+    i = 0
+
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        i += 1
+
+        if not stripped or stripped.startswith("#"):
+            continue
+        if line[0] in " \t":
+            raise _Unsupported("unexpected indentation")
+
+        key, sep, rest = line.partition(":")
+        if not sep or not KEY_PATTERN.match(key) or (rest and rest[0] not in " \t"):
+            raise _Unsupported(f"line is not a 'key: value' pair: {line!r}")
+
+        value = rest.strip()
+
+        # Collect the indented lines that belong to this key
+        nested = []
+        while i < len(lines) and (not lines[i].strip() or lines[i][0] in " \t"):
+            nested.append(lines[i])
+            i += 1
+        while nested and not nested[-1].strip():
+            nested.pop()
+
+        if value[:1] in ("|", ">"):
+            result[key] = _block_scalar(value, nested)
+        elif not nested:
+            result[key] = _inline_value(value) if value else None
+        elif not value:
+            items = []
+            for item in nested:
+                item = item.strip()
+                if not item or item.startswith("#"):
+                    continue
+                if item != "-" and not item.startswith("- "):
+                    raise _Unsupported(f"nested mapping under '{key}'")
+                item_value = item[1:].strip()
+                if re.match(r"^[^\"'\[{]+:(\s|$)", item_value):
+                    raise _Unsupported(f"mapping inside list '{key}'")
+                items.append(_inline_value(item_value) if item_value else None)
+            result[key] = items
+        elif value[0] in "\"'[":
+            raise _Unsupported(f"multi-line value for '{key}'")
+        else:
+            # Multi-line plain scalar: continuation lines fold into spaces
+            parts = [_strip_comment(value)] + [_strip_comment(n.strip()) for n in nested if n.strip()]
+            result[key] = _scalar(" ".join(parts))
+
+    return result
@@ -5,15 +5,27 @@ Generate catalog.json from all plugins in the plugins/ directory.
 Usage:
     python generate_catalog.py
     python generate_catalog.py --output ./custom-catalog.json
+    python generate_catalog.py --incremental
+    python generate_catalog.py --format jsonl
+    python generate_catalog.py --shards ./catalog-shards --shard-by letter
+    python generate_catalog.py --search-index
 """
 
 import argparse
+import hashlib
 import json
+import re
 from datetime import datetime
 from pathlib import Path
 
-PLUGINS_DIR = Path(__file__).parent.parent / "plugins"
+from catalog_reader import CatalogReader, JsonlCatalogWriter
+from hook_profiler import hook_overhead, load_hook_profiles
+from scanner import PLUGINS_DIR, PluginInfo, frontmatter_signature, list_plugin_dirs, scan_plugin, stat_signature
+from search import SEARCH_INDEX_PATH, index_documents, search_document, write_search_index
+from timings import add_timing_arguments, phase, start_timings
+
 CATALOG_PATH = Path(__file__).parent.parent / "catalog.json"
+CATALOG_JSONL_PATH = Path(__file__).parent.parent / "catalog.jsonl"
 VERIFIED_FILE = Path(__file__).parent.parent / ".verified.json"
 MARKETPLACE_FILE = Path(__file__).parent.parent / ".claude-plugin" / "marketplace.json"
 
@@ -34,113 +46,192 @@ def load_marketplace_data() -> dict:
     return {}
 
 
-def count_components(plugin_dir: Path) -> dict:
-    """Count components in a plugin."""
-    components = {
-        "commands": 0,
-        "agents": 0,
-        "skills": 0,
-        "hooks": False,
-        "mcp_servers": 0
+def load_json_file(path: Path) -> dict | None:
+    """Load a JSON file, returning None if it is missing or unreadable."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def state_path_for(output_path: Path) -> Path:
+    """Path of the local state file used by --incremental for a catalog."""
+    stem = output_path.stem if output_path.suffix == ".json" else output_path.name
+    return output_path.with_name(f".{stem}-state.json")
+
+
+def apply_verification(plugin_entry: dict, verified_data: dict):
+    """Set the verification fields of a catalog entry from .verified.json data."""
+    verified_info = verified_data.get("plugins", {}).get(plugin_entry["name"])
+    if verified_info:
+        plugin_entry["verified"] = verified_info.get("verified", False)
+        plugin_entry["verified_at"] = verified_info.get("verified_at")
+        plugin_entry["verified_by"] = verified_info.get("verified_by")
+    else:
+        plugin_entry["verified"] = False
+        plugin_entry.pop("verified_at", None)
+        plugin_entry.pop("verified_by", None)
+
+
+def apply_hook_profile(plugin_entry: dict, hook_profiles: dict | None):
+    """Set the hook_profile field of a catalog entry from .hook-profile.json data."""
+    profile = (hook_profiles or {}).get("plugins", {}).get(plugin_entry["name"])
+    if profile:
+        plugin_entry["hook_profile"] = {
+            key: profile.get(key)
+            for key in ("profiled_at", "runs", "wall_ms", "cpu_ms", "budget_ms", "over_budget")
+        }
+    else:
+        plugin_entry.pop("hook_profile", None)
+
+
+def build_plugin_entry(plugin: PluginInfo, marketplace_name: str, verified_data: dict,
+                       hook_profiles: dict | None = None) -> dict:
+    """Build the catalog entry for a scanned plugin with valid plugin.json."""
+    data = plugin.plugin_json
+    plugin_name = data.get("name", plugin.name)
+
+    # Get author info
+    author_data = data.get("author", {})
+    if isinstance(author_data, dict):
+        author_name = author_data.get("name", "Unknown")
+    else:
+        author_name = str(author_data)
+
+    plugin_entry = {
+        "name": plugin_name,
+        "version": data.get("version", "1.0.0"),
+        "description": data.get("description", ""),
+        "author": author_name,
+        "category": data.get("category", "utilities"),
+        "keywords": data.get("keywords", []),
+        "components": plugin.components(),
+        "install_command": f"/plugin install {plugin_name}@{marketplace_name}",
+        "source_url": f"./plugins/{plugin_name}",
+        "dependencies": data.get("dependencies", {}),
     }
 
-    commands_dir = plugin_dir / "commands"
-    if commands_dir.exists():
-        components["commands"] = len([f for f in commands_dir.glob("*.md") if f.is_file()])
-
-    agents_dir = plugin_dir / "agents"
-    if agents_dir.exists():
-        components["agents"] = len([f for f in agents_dir.glob("*.md") if f.is_file()])
-
-    skills_dir = plugin_dir / "skills"
-    if skills_dir.exists():
-        components["skills"] = len([d for d in skills_dir.iterdir() if d.is_dir() and (d / "SKILL.md").exists()])
-
-    hooks_file = plugin_dir / "hooks" / "hooks.json"
-    if hooks_file.exists():
-        try:
-            with open(hooks_file, "r") as f:
-                hooks_data = json.load(f)
-                components["hooks"] = bool(hooks_data.get("hooks"))
-        except json.JSONDecodeError:
-            components["hooks"] = False
-
-    mcp_file = plugin_dir / ".mcp.json"
-    if mcp_file.exists():
-        try:
-            with open(mcp_file, "r") as f:
-                mcp_data = json.load(f)
-                components["mcp_servers"] = len(mcp_data.get("mcpServers", {}))
-        except json.JSONDecodeError:
-            components["mcp_servers"] = 0
-
-    return components
-
-
-def generate_catalog(output_path: Path = None):
-    """Generate catalog.json from plugins directory."""
+    overhead = hook_overhead(plugin.hooks)
+    if overhead:
+        plugin_entry["hook_overhead"] = overhead
+
+    # Add verification info and measured hook cost if present
+    apply_verification(plugin_entry, verified_data)
+    apply_hook_profile(plugin_entry, hook_profiles)
+
+    return plugin_entry
+
+
+def iter_plugin_entries(plugin_dirs: list[Path], marketplace_name: str, verified_data: dict,
+                        previous_entry=None, state: dict | None = None, new_state: dict | None = None,
+                        hook_profiles: dict | None = None, search_documents: list | None = None):
+    """
+    Yield (entry, rescanned) for each plugin directory with a valid plugin.json.
+
+    With ``state`` from a previous incremental run, a directory whose stat
+    signature is unchanged reuses ``previous_entry(name)`` instead of being
+    re-read. ``new_state`` is filled with the signatures for the next run.
+
+    With ``search_documents``, each plugin's search document is appended to
+    it in catalog order. Documents are kept in the state too, under their
+    own frontmatter signature, so an incremental run only re-reads the
+    frontmatter of plugins whose component files changed.
+    """
+    for plugin_dir in plugin_dirs:
+        plugin_entry = None
+        plugin = None
+        known = None
+
+        if state is not None:
+            with phase("stat"):
+                signature = stat_signature(plugin_dir)
+            known = state.get(plugin_dir.name)
+            if known and known["signature"] == signature:
+                previous_entry_data = previous_entry(known["name"])
+                if previous_entry_data is not None:
+                    plugin_entry = dict(previous_entry_data)
+                    plugin_entry["install_command"] = f"/plugin install {plugin_entry['name']}@{marketplace_name}"
+                    apply_verification(plugin_entry, verified_data)
+                    apply_hook_profile(plugin_entry, hook_profiles)
+
+        rescanned = plugin_entry is None
+        if plugin_entry is None:
+            plugin = scan_plugin(plugin_dir)
+            if plugin is None or not plugin.has_plugin_json:
+                continue
+
+            if plugin.plugin_json_error:
+                print(f"Warning: Invalid JSON in {plugin.plugin_json_path}, skipping")
+                continue
+
+            plugin_entry = build_plugin_entry(plugin, marketplace_name, verified_data, hook_profiles)
+
+        # A cached document also depends on plugin.json, so drop it on a rescan
+        search_state = known.get("search") if known and not rescanned else None
+        if search_documents is not None:
+            with phase("stat"):
+                document_signature = frontmatter_signature(plugin_dir)
+            if search_state is None or search_state["signature"] != document_signature:
+                if plugin is None:
+                    plugin = scan_plugin(plugin_dir)
+                search_state = {"signature": document_signature, "document": search_document(plugin)}
+            search_documents.append(search_state["document"])
+
+        if new_state is not None:
+            new_state[plugin_dir.name] = {"signature": signature, "name": plugin_entry["name"]}
+            if search_state is not None:
+                new_state[plugin_dir.name]["search"] = search_state
+
+        yield plugin_entry, rescanned
+
+
+def generate_catalog(output_path: Path = None, incremental: bool = False,
+                     search_documents: list | None = None):
+    """
+    Generate catalog.json from plugins directory.
+
+    With ``incremental``, entries from the existing catalog are reused for
+    plugins whose stat signature matches the one recorded in the state
+    file on the previous run, so only changed plugins are re-read. If the
+    result is identical to the existing catalog, the file (including its
+    generated_at timestamp) is left untouched. ``search_documents`` is
+    filled as in iter_plugin_entries.
+    """
     if output_path is None:
         output_path = CATALOG_PATH
 
     plugins = []
     categories = {}
 
-    # Load verified data
+    # Load verified data and measured hook costs
     verified_data = load_verified_data()
+    hook_profiles = load_hook_profiles()
 
     # Load marketplace data for metadata
     marketplace_data = load_marketplace_data()
     marketplace_name = marketplace_data.get("name", "community-claude-plugins")
 
-    for plugin_dir in sorted(PLUGINS_DIR.iterdir()):
-        if not plugin_dir.is_dir():
-            continue
-
-        plugin_json_path = plugin_dir / ".claude-plugin" / "plugin.json"
-        if not plugin_json_path.exists():
-            continue
-
-        try:
-            with open(plugin_json_path, "r") as f:
-                data = json.load(f)
-        except json.JSONDecodeError:
-            print(f"Warning: Invalid JSON in {plugin_json_path}, skipping")
-            continue
-
-        plugin_name = data.get("name", plugin_dir.name)
-        category = data.get("category", "utilities")
+    previous = None
+    previous_entries = {}
+    state = None
+    new_state = None
+    if incremental:
+        previous = load_json_file(output_path)
+        if previous:
+            previous_entries = {p["name"]: p for p in previous.get("plugins", [])}
+        state = (load_json_file(state_path_for(output_path)) or {}).get("plugins", {})
+        new_state = {}
+
+    plugin_dirs = list_plugin_dirs(PLUGINS_DIR)
+    rescanned = 0
+
+    for plugin_entry, was_rescanned in iter_plugin_entries(
+            plugin_dirs, marketplace_name, verified_data, previous_entries.get, state, new_state,
+            hook_profiles, search_documents):
+        rescanned += was_rescanned
+        category = plugin_entry["category"]
         categories[category] = categories.get(category, 0) + 1
-
-        # Get author info
-        author_data = data.get("author", {})
-        if isinstance(author_data, dict):
-            author_name = author_data.get("name", "Unknown")
-        else:
-            author_name = str(author_data)
-
-        # Build plugin entry
-        plugin_entry = {
-            "name": plugin_name,
-            "version": data.get("version", "1.0.0"),
-            "description": data.get("description", ""),
-            "author": author_name,
-            "category": category,
-            "keywords": data.get("keywords", []),
-            "components": count_components(plugin_dir),
-            "install_command": f"/plugin install {plugin_name}@{marketplace_name}",
-            "source_url": f"./plugins/{plugin_name}",
-            "dependencies": data.get("dependencies", {}),
-        }
-
-        # Add verification info if present
-        verified_info = verified_data.get("plugins", {}).get(plugin_name)
-        if verified_info:
-            plugin_entry["verified"] = verified_info.get("verified", False)
-            plugin_entry["verified_at"] = verified_info.get("verified_at")
-            plugin_entry["verified_by"] = verified_info.get("verified_by")
-        else:
-            plugin_entry["verified"] = False
-
         plugins.append(plugin_entry)
 
     catalog = {
@@ -152,24 +243,244 @@ def generate_catalog(output_path: Path = None):
         "categories": categories
     }
 
-    with open(output_path, "w") as f:
-        json.dump(catalog, f, indent=2)
-
-    print(f"Generated catalog with {len(plugins)} plugins ({catalog['verified_plugins']} verified)")
+    unchanged = previous is not None and (
+        {k: v for k, v in previous.items() if k != "generated_at"}
+        == {k: v for k, v in catalog.items() if k != "generated_at"}
+    )
+
+    if unchanged:
+        catalog["generated_at"] = previous.get("generated_at", catalog["generated_at"])
+    else:
+        with phase("write"), open(output_path, "w") as f:
+            json.dump(catalog, f, indent=2)
+
+    if incremental:
+        with open(state_path_for(output_path), "w") as f:
+            json.dump({"plugins": new_state}, f)
+        print(f"Rescanned {rescanned} of {len(plugin_dirs)} plugin directories")
+
+    if unchanged:
+        print(f"Catalog unchanged with {len(plugins)} plugins ({catalog['verified_plugins']} verified)")
+    else:
+        print(f"Generated catalog with {len(plugins)} plugins ({catalog['verified_plugins']} verified)")
     print(f"Categories: {categories}")
     print(f"Output: {output_path}")
 
     return catalog
 
 
+def generate_catalog_jsonl(output_path: Path = None, incremental: bool = False,
+                           search_documents: list | None = None) -> dict:
+    """
+    Stream catalog.jsonl, one plugin per line, as plugin directories are scanned.
+
+    Each line is flushed as soon as its plugin is scanned, so consumers can
+    read the file while it is being generated; the trailing summary record
+    marks it complete. Only the per-plugin offsets kept for the index grow
+    with the registry, not the entries themselves. The previous file is
+    unlinked rather than truncated, so readers that still have it mapped
+    keep a consistent copy. With ``incremental``, unchanged plugins are
+    copied from the previous catalog.jsonl through its offset index.
+    ``search_documents`` is filled as in iter_plugin_entries.
+
+    Returns the summary record.
+    """
+    if output_path is None:
+        output_path = CATALOG_JSONL_PATH
+
+    verified_data = load_verified_data()
+    hook_profiles = load_hook_profiles()
+    marketplace_data = load_marketplace_data()
+    marketplace_name = marketplace_data.get("name", "community-claude-plugins")
+
+    previous = None
+    state = None
+    new_state = None
+    if incremental:
+        if output_path.exists():
+            previous = CatalogReader(output_path)
+        state = (load_json_file(state_path_for(output_path)) or {}).get("plugins", {})
+        new_state = {}
+
+    plugin_dirs = list_plugin_dirs(PLUGINS_DIR)
+    rescanned = 0
+    categories = {}
+    verified = 0
+
+    output_path.unlink(missing_ok=True)
+    writer = JsonlCatalogWriter(output_path, stream=True)
+    try:
+        for plugin_entry, was_rescanned in iter_plugin_entries(
+                plugin_dirs, marketplace_name, verified_data,
+                previous.get if previous else (lambda name: None), state, new_state, hook_profiles,
+                search_documents):
+            rescanned += was_rescanned
+            category = plugin_entry["category"]
+            categories[category] = categories.get(category, 0) + 1
+            verified += bool(plugin_entry.get("verified"))
+            with phase("write"):
+                writer.add(plugin_entry)
+                writer.flush()
+
+        summary = {
+            "generated_at": datetime.utcnow().isoformat() + "Z",
+            "marketplace_name": marketplace_name,
+            "total_plugins": len(writer.entries),
+            "verified_plugins": verified,
+            "categories": categories
+        }
+        writer.close(summary)
+    except BaseException:
+        writer.abort()
+        raise
+    finally:
+        if previous:
+            previous.close()
+
+    if incremental:
+        with open(state_path_for(output_path), "w") as f:
+            json.dump({"plugins": new_state}, f)
+        print(f"Rescanned {rescanned} of {len(plugin_dirs)} plugin directories")
+
+    print(f"Generated catalog with {summary['total_plugins']} plugins ({verified} verified)")
+    print(f"Categories: {categories}")
+    print(f"Output: {output_path}")
+
+    return summary
+
+
+def shard_key(plugin_entry: dict, shard_by: str) -> str:
+    """Return the shard a catalog entry belongs to."""
+    if shard_by == "letter":
+        first = plugin_entry["name"][:1].lower()
+        return first if first.isalpha() else "0-9"
+
+    key = re.sub(r"[^a-z0-9-]+", "-", str(plugin_entry.get("category", "")).lower()).strip("-")
+    return key or "uncategorized"
+
+
+def write_if_changed(path: Path, content: bytes) -> bool:
+    """Write content unless the file already holds exactly these bytes."""
+    with phase("write"):
+        try:
+            if path.read_bytes() == content:
+                return False
+        except FileNotFoundError:
+            pass
+        path.write_bytes(content)
+        return True
+
+
+def write_shards(catalog: dict, shard_dir: Path, shard_by: str = "category",
+                 shard_size: int | None = None) -> dict:
+    """
+    Write a compact index.json plus one compact JSON file per shard.
+
+    Plugins are grouped by category or by first letter of their name, and
+    each group is split into pages of at most ``shard_size`` plugins. The
+    index records every shard's sha256 so clients can fetch only the shards
+    they need and revalidate them by hash. Shard files whose content did not
+    change are not rewritten, and shards no longer produced are removed.
+    """
+    groups = {}
+    for plugin_entry in catalog["plugins"]:
+        groups.setdefault(shard_key(plugin_entry, shard_by), []).append(plugin_entry)
+
+    (shard_dir / "shards").mkdir(parents=True, exist_ok=True)
+
+    shards = []
+    plugin_shards = {}
+    written = 0
+
+    for key in sorted(groups):
+        entries = groups[key]
+        size = max(shard_size, 1) if shard_size else len(entries)
+        pages = [entries[i:i + size] for i in range(0, len(entries), size)]
+
+        for page_number, page in enumerate(pages, 1):
+            filename = f"{key}.json" if len(pages) == 1 else f"{key}.{page_number}.json"
+            rel_path = f"shards/{filename}"
+            content = json.dumps(
+                {"shard": key, "page": page_number, "pages": len(pages), "plugins": page},
+                separators=(",", ":")
+            ).encode()
+
+            if write_if_changed(shard_dir / rel_path, content):
+                written += 1
+
+            shards.append({
+                "key": key,
+                "page": page_number,
+                "path": rel_path,
+                "count": len(page),
+                "bytes": len(content),
+                "sha256": hashlib.sha256(content).hexdigest()
+            })
+            for plugin_entry in page:
+                plugin_shards[plugin_entry["name"]] = rel_path
+
+    # Remove shards left over from a previous layout
+    current = {shard["path"] for shard in shards}
+    for stale in (shard_dir / "shards").glob("*.json"):
+        if f"shards/{stale.name}" not in current:
+            stale.unlink()
+
+    index = {
+        "generated_at": catalog["generated_at"],
+        "marketplace_name": catalog["marketplace_name"],
+        "total_plugins": catalog["total_plugins"],
+        "verified_plugins": catalog["verified_plugins"],
+        "categories": catalog["categories"],
+        "shard_by": shard_by,
+        "shards": shards,
+        "plugins": plugin_shards
+    }
+    write_if_changed(shard_dir / "index.json", json.dumps(index, separators=(",", ":")).encode())
+
+    print(f"Shards: {len(shards)} in {shard_dir} ({written} rewritten)")
+    return index
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate Claude Code plugin catalog")
-    parser.add_argument("--output", "-o", help="Output path for catalog.json")
-
+    parser.add_argument("--output", "-o", help="Output path for catalog.json (or catalog.jsonl)")
+    parser.add_argument("--format", choices=["json", "jsonl"], default="json",
+                        help="json: catalog.json; jsonl: stream one plugin per line plus an offset index")
+    parser.add_argument("--incremental", "-i", action="store_true",
+                        help="Only re-read plugins changed since the last run")
+
+    parser.add_argument("--search-index", nargs="?", const=str(SEARCH_INDEX_PATH), metavar="PATH",
+                        help=f"Also write the search index (default: {SEARCH_INDEX_PATH.name})")
+    parser.add_argument("--shards", metavar="DIR",
+                        help="Also write a compact index.json and catalog shards to DIR")
+    parser.add_argument("--shard-by", choices=["category", "letter"], default="category",
+                        help="How to group plugins into shards (default: category)")
+    parser.add_argument("--shard-size", type=int, metavar="N",
+                        help="Split shards into pages of at most N plugins")
+
+    add_timing_arguments(parser)
     args = parser.parse_args()
+    start_timings(args, "generate_catalog")
 
     output_path = Path(args.output) if args.output else None
-    generate_catalog(output_path)
+    # Documents are collected from the same scan as the catalog entries
+    search_documents = [] if args.search_index else None
+
+    if args.format == "jsonl":
+        if args.shards:
+            parser.error("--shards requires --format json")
+        generate_catalog_jsonl(output_path, args.incremental, search_documents)
+    else:
+        catalog = generate_catalog(output_path, args.incremental, search_documents)
+
+    if args.shards:
+        write_shards(catalog, Path(args.shards), args.shard_by, args.shard_size)
+
+    if args.search_index:
+        with phase("search-index"):
+            index = index_documents(search_documents)
+            write_search_index(index, Path(args.search_index))
+        print(f"Search index: {len(index['docs'])} plugins, {len(index['postings'])} terms ({args.search_index})")
 
 
 if __name__ == "__main__":
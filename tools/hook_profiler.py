@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Measure what a plugin's hooks cost per invocation.
+
+hook_overhead() summarizes what a plugin subscribes to without running
+anything: events, matchers and declared timeouts.
+
+profile_plugin_hooks() runs each hook command from hooks.json several
+times with a synthetic event payload on stdin, the way Claude Code would
+run it, and records its wall time and CPU time. Results are stored in
+.hook-profile.json, keyed by plugin, and published in the catalog by
+generate_catalog.py.
+
+Hooks run in a restricted subprocess: a fresh temporary working and
+home directory, a minimal environment, their own process group (killed
+on timeout) and resource limits on CPU time, memory, file size and open
+files. This contains runaway scripts; it is not a security boundary, so
+only profile plugins you would be willing to install.
+
+Usage (as a library):
+    from hook_profiler import profile_plugin_hooks
+
+    profile = profile_plugin_hooks(plugin, runs=5)
+"""
+
+import json
+import os
+import re
+import shutil
+import signal
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from scanner import PluginInfo
+
+HOOK_PROFILE_FILE = Path(__file__).parent.parent / ".hook-profile.json"
+
+DEFAULT_RUNS = 5
+DEFAULT_BUDGET_MS = 200.0
+# Claude Code's default when a hook declares no timeout
+DEFAULT_TIMEOUT = 60
+
+# Resource limits applied to each hook process
+CPU_LIMIT_SECONDS = 60
+MEMORY_LIMIT_BYTES = 2 * 1024 * 1024 * 1024
+FILE_SIZE_LIMIT_BYTES = 64 * 1024 * 1024
+OPEN_FILES_LIMIT = 256
+MAX_CAPTURED_OUTPUT = 64 * 1024
+
+# Events fired around every tool call, where hook latency adds up fastest
+HOT_EVENTS = ("PreToolUse", "PostToolUse")
+WILDCARD_MATCHERS = ("", "*", ".*")
+
+# Tools tried, in order, when picking a tool_name that a matcher accepts
+SAMPLE_TOOLS = ["Bash", "Write", "Edit", "Read", "Glob", "Grep", "WebFetch", "WebSearch", "Task"]
+
+
+@dataclass
+class HookRun:
+    wall_ms: float
+    cpu_ms: float
+    exit_code: int | None
+    timed_out: bool = False
+    stderr: str = ""
+
+
+@dataclass
+class HookProfile:
+    event: str
+    matcher: str
+    command: str
+    timeout: float | None
+    runs: list[HookRun] = field(default_factory=list)
+
+    @property
+    def wall_ms(self) -> float:
+        """Median wall time."""
+        return statistics.median(run.wall_ms for run in self.runs) if self.runs else 0.0
+
+    @property
+    def cpu_ms(self) -> float:
+        """Median CPU time, user plus system."""
+        return statistics.median(run.cpu_ms for run in self.runs) if self.runs else 0.0
+
+    @property
+    def max_wall_ms(self) -> float:
+        return max((run.wall_ms for run in self.runs), default=0.0)
+
+    @property
+    def timed_out(self) -> bool:
+        return any(run.timed_out for run in self.runs)
+
+    @property
+    def failures(self) -> int:
+        """Runs that exited with something other than 0 (success) or 2 (block)."""
+        return sum(1 for run in self.runs if not run.timed_out and run.exit_code not in (0, 2))
+
+    @property
+    def last_error(self) -> str:
+        """The last line of stderr from the most recent failed run."""
+        for run in reversed(self.runs):
+            if not run.timed_out and run.exit_code not in (0, 2) and run.stderr.strip():
+                return run.stderr.strip().splitlines()[-1]
+        return ""
+
+    def summary(self) -> dict:
+        return {
+            "event": self.event,
+            "matcher": self.matcher,
+            "command": self.command,
+            "timeout": self.timeout,
+            "runs": len(self.runs),
+            "wall_ms": round(self.wall_ms, 2),
+            "max_wall_ms": round(self.max_wall_ms, 2),
+            "cpu_ms": round(self.cpu_ms, 2),
+            "failures": self.failures,
+            "timed_out": self.timed_out,
+        }
+
+
+def iter_hook_groups(hooks_data):
+    """
+    Yield (event, matcher, hooks) for each hook group in hooks.json data.
+
+    Malformed events and groups, and hooks that are not objects, are
+    skipped; validate_hooks() reports them.
+    """
+    events = hooks_data.get("hooks", {}) if isinstance(hooks_data, dict) else {}
+    if not isinstance(events, dict):
+        return
+    for event, groups in events.items():
+        if not isinstance(groups, list):
+            continue
+        for group in groups:
+            if not isinstance(group, dict):
+                continue
+            hooks = group.get("hooks", [])
+            if not isinstance(hooks, list):
+                continue
+            yield event, group.get("matcher"), [hook for hook in hooks if isinstance(hook, dict)]
+
+
+def iter_hook_commands(hooks_data: dict):
+    """Yield (event, matcher, hook) for each command hook in hooks.json data."""
+    for event, matcher, hooks in iter_hook_groups(hooks_data):
+        for hook in hooks:
+            if hook.get("type") == "command" and hook.get("command"):
+                yield event, str(matcher or ""), hook
+
+
+def is_wildcard_matcher(matcher) -> bool:
+    """Whether a matcher accepts every tool (a missing matcher does too)."""
+    return matcher is None or str(matcher).strip() in WILDCARD_MATCHERS
+
+
+def hook_overhead(hooks_data) -> dict | None:
+    """
+    Summarize what a plugin's hooks subscribe to, for the catalog.
+
+    Counts subscribed events and hook commands, lists the matchers per
+    event, and reports declared timeouts: the largest one, and how many
+    hooks declare none (and so get the 60 second default). ``hot_hooks``
+    counts commands on PreToolUse/PostToolUse, which run around every
+    matching tool call. Returns None if there are no hooks.
+    """
+    events = hooks_data.get("hooks") if isinstance(hooks_data, dict) else None
+    if not isinstance(events, dict) or not events:
+        return None
+
+    matchers = {}
+    hooks = hot_hooks = untimed = 0
+    max_timeout = None
+    for event, matcher, group_hooks in iter_hook_groups(hooks_data):
+        matchers.setdefault(event, []).append("*" if is_wildcard_matcher(matcher) else str(matcher))
+        for hook in group_hooks:
+            hooks += 1
+            hot_hooks += event in HOT_EVENTS
+            timeout = hook.get("timeout")
+            if isinstance(timeout, (int, float)):
+                max_timeout = timeout if max_timeout is None else max(max_timeout, timeout)
+            else:
+                untimed += 1
+
+    return {
+        "events": len(matchers),
+        "hooks": hooks,
+        "hot_hooks": hot_hooks,
+        "matchers": matchers,
+        "max_timeout": max_timeout,
+        "untimed": untimed,
+    }
+
+
+def sample_tool(matcher: str) -> str:
+    """A tool name the matcher accepts, for building tool events."""
+    if is_wildcard_matcher(matcher):
+        return "Bash"
+    try:
+        pattern = re.compile(matcher)
+    except re.error:
+        return matcher
+    for tool in SAMPLE_TOOLS:
+        if pattern.fullmatch(tool):
+            return tool
+    return matcher if re.fullmatch(r"[\w-]+", matcher) else "Bash"
+
+
+def sample_tool_input(tool: str, workdir: Path) -> dict:
+    example = str(workdir / "example.txt")
+    return {
+        "Bash": {"command": "ls -la", "description": "List files"},
+        "Write": {"file_path": example, "content": "hello\n"},
+        "Edit": {"file_path": example, "old_string": "hello", "new_string": "world"},
+        "Read": {"file_path": example},
+        "Glob": {"pattern": "**/*.py"},
+        "Grep": {"pattern": "TODO", "path": str(workdir)},
+        "WebFetch": {"url": "https://example.com", "prompt": "Summarize"},
+        "WebSearch": {"query": "example"},
+        "Task": {"description": "Example", "prompt": "Do something"},
+    }.get(tool, {})
+
+
+def synthetic_payload(event: str, matcher: str, workdir: Path) -> dict:
+    """The stdin payload Claude Code would send a hook for this event."""
+    payload = {
+        "session_id": "hook-profile",
+        "transcript_path": str(workdir / "transcript.jsonl"),
+        "cwd": str(workdir),
+        "hook_event_name": event,
+    }
+
+    if event in ("PreToolUse", "PostToolUse", "PermissionRequest"):
+        tool = sample_tool(matcher)
+        payload["tool_name"] = tool
+        payload["tool_input"] = sample_tool_input(tool, workdir)
+        if event == "PostToolUse":
+            payload["tool_response"] = {"success": True}
+    elif event == "UserPromptSubmit":
+        payload["prompt"] = "Write a function that adds two numbers"
+    elif event == "Notification":
+        payload["message"] = "Claude needs your permission to use Bash"
+    elif event in ("Stop", "SubagentStop"):
+        payload["stop_hook_active"] = False
+    elif event == "SessionStart":
+        payload["source"] = "startup"
+    elif event == "SessionEnd":
+        payload["reason"] = "exit"
+    elif event == "PreCompact":
+        payload["trigger"] = "manual"
+        payload["custom_instructions"] = ""
+
+    return payload
+
+
+def _limit_resources():
+    """Run in the hook's child process before exec."""
+    import resource
+
+    for limit, value in (
+        (resource.RLIMIT_CPU, CPU_LIMIT_SECONDS),
+        (resource.RLIMIT_AS, MEMORY_LIMIT_BYTES),
+        (resource.RLIMIT_FSIZE, FILE_SIZE_LIMIT_BYTES),
+        (resource.RLIMIT_NOFILE, OPEN_FILES_LIMIT),
+    ):
+        try:
+            soft, hard = resource.getrlimit(limit)
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)
+            resource.setrlimit(limit, (value, hard))
+        except (ValueError, OSError):
+            pass
+
+
+def _kill_group(pid: int):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _drain(stream, chunks: list):
+    """Read a pipe to EOF, keeping only the first MAX_CAPTURED_OUTPUT bytes."""
+    size = 0
+    while data := stream.read(65536):
+        if size < MAX_CAPTURED_OUTPUT:
+            chunks.append(data[:MAX_CAPTURED_OUTPUT - size])
+            size += len(data)
+    stream.close()
+
+
+def _feed(stream, data: bytes):
+    try:
+        stream.write(data)
+        stream.close()
+    except (BrokenPipeError, OSError):
+        pass
+
+
+def run_hook_once(command: str, payload: dict, env: dict, workdir: Path, timeout: float) -> HookRun:
+    """Run one hook command and measure it with the child's own resource usage."""
+    stdin_data = json.dumps(payload).encode()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        command, shell=True, cwd=workdir, env=env,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        start_new_session=True, preexec_fn=_limit_resources,
+    )
+
+    timed_out = threading.Event()
+
+    def on_timeout():
+        timed_out.set()
+        _kill_group(proc.pid)
+
+    timer = threading.Timer(timeout, on_timeout)
+    timer.start()
+    stdout, stderr = [], []
+    threads = [
+        threading.Thread(target=_feed, args=(proc.stdin, stdin_data), daemon=True),
+        threading.Thread(target=_drain, args=(proc.stdout, stdout), daemon=True),
+        threading.Thread(target=_drain, args=(proc.stderr, stderr), daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    # wait4 reports the CPU time of this child alone. Its ru_maxrss is not
+    # recorded: the kernel carries the forking parent's peak RSS into the
+    # child's, so it would report the profiler's size, not the hook's.
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    timer.cancel()
+    proc.returncode = os.waitstatus_to_exitcode(status)
+
+    # Background processes the hook left behind would hold the pipes open
+    _kill_group(proc.pid)
+    for thread in threads:
+        thread.join(timeout=1)
+
+    return HookRun(
+        wall_ms=wall * 1000,
+        cpu_ms=(usage.ru_utime + usage.ru_stime) * 1000,
+        exit_code=None if timed_out.is_set() else proc.returncode,
+        timed_out=timed_out.is_set(),
+        stderr=b"".join(stderr).decode(errors="replace"),
+    )
+
+
+def hook_environment(plugin: PluginInfo, workdir: Path) -> dict:
+    """A minimal environment for hook processes."""
+    return {
+        "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
+        "HOME": str(workdir),
+        "TMPDIR": str(workdir),
+        "LANG": os.environ.get("LANG", "C.UTF-8"),
+        "CLAUDE_PLUGIN_ROOT": str(plugin.path.resolve()),
+        "CLAUDE_PROJECT_DIR": str(workdir),
+    }
+
+
+def profile_plugin_hooks(plugin: PluginInfo, runs: int = DEFAULT_RUNS) -> list[HookProfile]:
+    """Run every command hook of a plugin ``runs`` times and return their profiles."""
+    if not isinstance(plugin.hooks, dict):
+        return []
+
+    profiles = []
+    for event, matcher, hook in iter_hook_commands(plugin.hooks):
+        timeout = hook.get("timeout")
+        profile = HookProfile(event, matcher, str(hook["command"]),
+                              timeout if isinstance(timeout, (int, float)) else None)
+
+        workdir = Path(tempfile.mkdtemp(prefix="hook-profile-"))
+        try:
+            env = hook_environment(plugin, workdir)
+            payload = synthetic_payload(event, matcher, workdir)
+            for _ in range(max(runs, 1)):
+                (workdir / "example.txt").write_text("hello\n")
+                profile.runs.append(run_hook_once(
+                    profile.command, payload, env, workdir, profile.timeout or DEFAULT_TIMEOUT
+                ))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        profiles.append(profile)
+    return profiles
+
+
+def plugin_profile_summary(profiles: list[HookProfile], runs: int, budget_ms: float) -> dict:
+    """The per-plugin record stored in .hook-profile.json."""
+    return {
+        "profiled_at": datetime.utcnow().isoformat() + "Z",
+        "runs": runs,
+        "wall_ms": round(sum(profile.wall_ms for profile in profiles), 2),
+        "cpu_ms": round(sum(profile.cpu_ms for profile in profiles), 2),
+        "budget_ms": budget_ms,
+        "over_budget": sum(1 for profile in profiles if profile.wall_ms > budget_ms),
+        "hooks": [profile.summary() for profile in profiles],
+    }
+
+
+def load_hook_profiles(path: Path = HOOK_PROFILE_FILE) -> dict:
+    """Load recorded hook profiles."""
+    if path.exists():
+        with open(path, "r") as f:
+            return json.load(f)
+    return {"plugins": {}}
+
+
+def save_hook_profiles(data: dict, path: Path = HOOK_PROFILE_FILE):
+    """Save recorded hook profiles."""
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
@@ -5,6 +5,12 @@ Import plugins, skills, agents, commands, or hooks from external sources.
 Usage:
     python import.py plugin ./path/to/plugin.zip
     python import.py plugin https://github.com/user/repo/releases/download/v1.0/plugin.zip
+    python import.py plugin ./path/to/plugin.zip --update
+    python import.py plugin https://example.com/a.zip https://example.com/b.zip --jobs 8
+    python import.py plugin my-plugin-1.0.0 --store ./mirror
+    python import.py sync https://mirror.example.com/catalog.json --jobs 8
+    python import.py sync ../other-marketplace --dry-run
+    python import.py install my-plugin --with-deps --catalog ./mirror/catalog.json --jobs 8
     python import.py skill ./path/to/skill-folder --plugin my-plugin
     python import.py agent ./path/to/agent.md --plugin my-plugin
     python import.py command ./path/to/command.md --plugin my-plugin
@@ -12,88 +18,775 @@ Usage:
 """
 
 import argparse
+import ctypes
 import json
 import os
 import shutil
+import sys
 import tempfile
+import threading
+import time
 import zipfile
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from urllib.request import urlretrieve
-from urllib.parse import urlparse
+from urllib.parse import urljoin, urlparse
+
+from archive_reader import (
+    ARCHIVE_ERRORS, MAX_ARCHIVE_BYTES, MAX_MEMBER_BYTES, PLUGIN_JSON_MEMBER, find_plugin_root, plugin_members,
+    read_plugin_json,
+)
+from blobstore import COPY_CHUNK_SIZE, BlobStore, file_sha256, manifest_files, safe_relative_path
+from download import Downloader, DownloadError
+from resolver import DependencyGraph, ResolutionError
+from scanner import scan_plugin, scan_plugins
+from timings import add_timing_arguments, count, phase, start_timings
+from validate import NAME_PATTERN
 
 PLUGINS_DIR = Path(__file__).parent.parent / "plugins"
 
+# renameat2(2) arguments for atomically exchanging two directories
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
 
-def download_if_url(source: str) -> Path:
-    """Download file if source is a URL, return local path."""
-    parsed = urlparse(source)
-    if parsed.scheme in ("http", "https"):
-        print(f"Downloading: {source}")
-        temp_dir = tempfile.mkdtemp()
-        filename = os.path.basename(parsed.path) or "downloaded.zip"
-        local_path = Path(temp_dir) / filename
-        urlretrieve(source, local_path)
-        return local_path
-    return Path(source)
 
+def is_url(source: str) -> bool:
+    return urlparse(source).scheme in ("http", "https")
 
-def import_plugin(source: str, force: bool = False) -> bool:
-    """Import a plugin from zip file or URL."""
+
+def download_if_url(source: str, downloader: Downloader | None = None) -> Path | None:
+    """
+    Download file if source is a URL, return local path.
+
+    Downloads go through the shared download cache, so an unchanged
+    archive is not fetched twice. Returns None if the download failed.
+    """
+    if not is_url(source):
+        return Path(source)
+
+    print(f"Downloading: {source}")
+    downloader = downloader or Downloader()
+    try:
+        return downloader.fetch(source)
+    except DownloadError as e:
+        print(f"Error: {e}")
+        return None
+    finally:
+        downloader.close()
+
+
+def fetch_sources(sources: list[str], jobs: int = 4) -> list[str | None]:
+    """
+    Download every URL in sources concurrently, returning local paths.
+
+    Non-URL sources are passed through unchanged; failed downloads are
+    reported and come back as None.
+    """
+    urls = [s for s in sources if is_url(s)]
+    if not urls:
+        return list(sources)
+
+    downloader = Downloader()
+    try:
+        print(f"Downloading {len(urls)} archive(s) with {jobs} job(s)")
+        fetched = {url: (path, error) for url, path, error in downloader.fetch_all(urls, jobs)}
+    finally:
+        downloader.close()
+
+    local = []
+    for source in sources:
+        if source not in fetched:
+            local.append(source)
+            continue
+        path, error = fetched[source]
+        if error:
+            print(f"Error: {error}")
+        local.append(str(path) if path else None)
+    return local
+
+
+class ExtractionBudget:
+    """Tracks bytes written during an extraction against the archive size limit."""
+
+    def __init__(self, limit: int = MAX_ARCHIVE_BYTES):
+        self.limit = limit
+        self.used = 0
+
+    def charge(self, n: int):
+        self.used += n
+        if self.used > self.limit:
+            raise ValueError(f"Archive expands to more than {self.limit} bytes")
+
+
+def member_mode(info: zipfile.ZipInfo) -> int | None:
+    """Permission bits stored in a zip entry, if the archive recorded any."""
+    mode = (info.external_attr >> 16) & 0o777
+    return mode or None
+
+
+def is_unchanged(installed: Path, info: zipfile.ZipInfo) -> bool:
+    """Compare an installed file with a zip entry by size, mode and CRC-32."""
+    try:
+        st = os.stat(installed)
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+    mode = member_mode(info)
+    if st.st_size != info.file_size or (mode is not None and st.st_mode & 0o777 != mode):
+        return False
+
+    crc = 0
+    with open(installed, "rb") as f:
+        while chunk := f.read(COPY_CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+    return crc == info.CRC
+
+
+def extract_member(zipf: zipfile.ZipFile, info: zipfile.ZipInfo, target: Path,
+                   budget: ExtractionBudget | None = None):
+    """
+    Stream one zip entry to target, restoring its permission bits.
+
+    Limits are checked against the bytes actually decompressed, not the
+    sizes the archive declares.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with phase("extract"), zipf.open(info) as src, open(target, "wb") as dst:
+        while chunk := src.read(COPY_CHUNK_SIZE):
+            written += len(chunk)
+            if written > MAX_MEMBER_BYTES:
+                raise ValueError(f"{info.filename} is larger than {MAX_MEMBER_BYTES} bytes")
+            if budget is not None:
+                budget.charge(len(chunk))
+            dst.write(chunk)
+    count("files_written")
+    count("bytes_written", written)
+    mode = member_mode(info)
+    if mode is not None:
+        os.chmod(target, mode)
+
+
+def import_plugin(source: str, force: bool = False, keep_previous: Path | None = None) -> bool:
+    """
+    Import a plugin from zip file or URL.
+
+    The zip's central directory is read first to locate and check
+    plugin.json. Members are then streamed straight into a staging
+    directory next to the target, with path-traversal and size limits
+    enforced on the bytes actually read, and the staging directory is
+    renamed into place. With ``keep_previous``, a replaced installation
+    is moved there instead of deleted.
+    """
     local_path = download_if_url(source)
+    if local_path is None:
+        return False
 
     if not local_path.exists():
         print(f"Error: Source not found: {local_path}")
         return False
 
-    # Extract to temp directory first
-    temp_dir = tempfile.mkdtemp()
-
     try:
-        with zipfile.ZipFile(local_path, "r") as zipf:
-            zipf.extractall(temp_dir)
+        return _import_archive(local_path, force, keep_previous)
+    except ARCHIVE_ERRORS as e:
+        print(f"Error: Failed to import {local_path}: {e}")
+        return False
 
+
+def _import_archive(local_path: Path, force: bool, keep_previous: Path | None) -> bool:
+    with zipfile.ZipFile(local_path, "r") as zipf:
         # Find plugin.json to get name
-        temp_path = Path(temp_dir)
-        plugin_json = None
+        prefix = find_plugin_root(zipf)
+        if prefix is None:
+            print("Error: No valid plugin.json found in archive")
+            return False
 
-        # Check if plugin.json is at root or in subdirectory
-        if (temp_path / ".claude-plugin" / "plugin.json").exists():
-            plugin_json = temp_path / ".claude-plugin" / "plugin.json"
-            source_dir = temp_path
-        else:
-            for subdir in temp_path.iterdir():
-                if (subdir / ".claude-plugin" / "plugin.json").exists():
-                    plugin_json = subdir / ".claude-plugin" / "plugin.json"
-                    source_dir = subdir
-                    break
+        try:
+            plugin_data = read_plugin_json(zipf, prefix)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return False
+
+        plugin_name = plugin_data.get("name")
+        if not plugin_name:
+            print("Error: Plugin name not found in plugin.json")
+            return False
+        if not isinstance(plugin_name, str) or not NAME_PATTERN.match(plugin_name):
+            print(f"Error: Invalid plugin name in plugin.json: {plugin_name!r}")
+            return False
+
+        target_dir = PLUGINS_DIR / plugin_name
+
+        if target_dir.exists() and not force:
+            print(f"Error: Plugin '{plugin_name}' already exists. Use --force to overwrite.")
+            return False
+
+        try:
+            members = plugin_members(zipf, prefix)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return False
+
+        staging_dir = make_staging_dir(target_dir)
+        try:
+            budget = ExtractionBudget()
+            for rel, info in members.items():
+                extract_member(zipf, info, staging_dir / rel, budget)
+
+            swap_into_place(staging_dir, target_dir, keep_previous)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return False
+        finally:
+            if staging_dir.exists():
+                shutil.rmtree(staging_dir)
+
+    print(f"Imported plugin: {target_dir}")
+    return True
+
+
+def update_plugin(source: str) -> bool:
+    """
+    Update an installed plugin in place from a zip file or URL.
+
+    Only files whose size, mode or CRC-32 differ from the archive are
+    written; unchanged files are hard-linked from the installed tree into
+    a staging directory, files missing from the archive are dropped, and
+    the staging directory then replaces the plugin atomically.
+    """
+    local_path = download_if_url(source)
+    if local_path is None:
+        return False
 
-        if not plugin_json:
+    if not local_path.exists():
+        print(f"Error: Source not found: {local_path}")
+        return False
+
+    try:
+        return _update_archive(local_path)
+    except ARCHIVE_ERRORS as e:
+        print(f"Error: Failed to update from {local_path}: {e}")
+        return False
+
+
+def _update_archive(local_path: Path) -> bool:
+    with zipfile.ZipFile(local_path, "r") as zipf:
+        prefix = find_plugin_root(zipf)
+        if prefix is None:
             print("Error: No valid plugin.json found in archive")
             return False
 
-        with open(plugin_json, "r") as f:
-            plugin_data = json.load(f)
+        try:
+            plugin_data = read_plugin_json(zipf, prefix)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return False
 
         plugin_name = plugin_data.get("name")
         if not plugin_name:
             print("Error: Plugin name not found in plugin.json")
             return False
+        if not isinstance(plugin_name, str) or not NAME_PATTERN.match(plugin_name):
+            print(f"Error: Invalid plugin name in plugin.json: {plugin_name!r}")
+            return False
 
         target_dir = PLUGINS_DIR / plugin_name
+        if not target_dir.exists():
+            print(f"Plugin '{plugin_name}' is not installed, importing it")
+            return import_plugin(str(local_path))
+
+        try:
+            members = plugin_members(zipf, prefix)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return False
+
+        installed = set(scan_plugin(target_dir).files)
+        changed = [rel for rel, info in members.items() if not is_unchanged(target_dir / rel, info)]
+        removed = installed - set(members)
+
+        if not changed and not removed:
+            print(f"Plugin '{plugin_name}' is already up to date")
+            return True
+
+        staging_dir = make_staging_dir(target_dir)
+        try:
+            budget = ExtractionBudget()
+            changed_set = set(changed)
+            for rel, info in members.items():
+                target = staging_dir / rel
+                if rel in changed_set:
+                    extract_member(zipf, info, target, budget)
+                else:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    try:
+                        os.link(target_dir / rel, target)
+                    except OSError:
+                        shutil.copy2(target_dir / rel, target)
+
+            swap_into_place(staging_dir, target_dir)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return False
+        finally:
+            if staging_dir.exists():
+                shutil.rmtree(staging_dir)
+
+    unchanged = len(members) - len(changed)
+    print(f"Updated plugin: {target_dir} ({len(changed)} changed, {len(removed)} removed, {unchanged} unchanged)")
+    return True
+
+
+def make_staging_dir(target_dir: Path) -> Path:
+    """Create an empty hidden directory next to target_dir, on the same filesystem."""
+    target_dir.parent.mkdir(parents=True, exist_ok=True)
+    return Path(tempfile.mkdtemp(prefix=f".{target_dir.name}.staging-", dir=target_dir.parent))
 
-        if target_dir.exists():
-            if force:
-                shutil.rmtree(target_dir)
+
+def _exchange_paths(a: Path, b: Path) -> bool:
+    """Atomically swap two paths with renameat2(RENAME_EXCHANGE) where supported."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        renameat2 = libc.renameat2
+    except (OSError, AttributeError):
+        return False
+    return renameat2(AT_FDCWD, os.fsencode(a), AT_FDCWD, os.fsencode(b), RENAME_EXCHANGE) == 0
+
+
+def swap_into_place(staging_dir: Path, target_dir: Path, keep_previous: Path | None = None):
+    """
+    Move a fully prepared staging directory to target_dir, replacing it.
+
+    On Linux the two directories are exchanged in one atomic rename, so
+    target_dir never disappears. Elsewhere the old directory is renamed
+    aside first, leaving a brief window between the two renames. The
+    replaced directory is deleted, or moved to ``keep_previous`` if given.
+    """
+    with phase("swap"):
+        _swap_into_place(staging_dir, target_dir, keep_previous)
+
+
+def _swap_into_place(staging_dir: Path, target_dir: Path, keep_previous: Path | None):
+    if not target_dir.exists():
+        os.rename(staging_dir, target_dir)
+        return
+
+    if _exchange_paths(staging_dir, target_dir):
+        # staging_dir now holds the previous contents
+        if keep_previous is not None:
+            os.rename(staging_dir, keep_previous)
+        else:
+            shutil.rmtree(staging_dir)
+        return
+
+    backup_dir = Path(tempfile.mkdtemp(prefix=f".{target_dir.name}.old-", dir=target_dir.parent))
+    previous = backup_dir / target_dir.name
+    os.rename(target_dir, previous)
+    try:
+        os.rename(staging_dir, target_dir)
+    except OSError:
+        os.rename(previous, target_dir)
+        raise
+    else:
+        if keep_previous is not None:
+            os.rename(previous, keep_previous)
+    finally:
+        shutil.rmtree(backup_dir)
+
+
+def import_plugin_from_store(store_dir: str, ref: str, force: bool = False) -> bool:
+    """Reassemble a plugin from a blob store manifest written by export.py --store."""
+    store = BlobStore(Path(store_dir))
+
+    try:
+        manifest = store.read_manifest(ref)
+        files = manifest_files(manifest)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid manifest '{ref}': {e}")
+        return False
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        return False
+
+    plugin_name = manifest.get("name")
+    if not isinstance(plugin_name, str) or not NAME_PATTERN.match(plugin_name):
+        print(f"Error: Invalid plugin name in manifest: {plugin_name!r}")
+        return False
+
+    if not any(entry["path"] == ".claude-plugin/plugin.json" for entry in files):
+        print("Error: Manifest does not include .claude-plugin/plugin.json")
+        return False
+
+    target_dir = PLUGINS_DIR / plugin_name
+    if target_dir.exists() and not force:
+        print(f"Error: Plugin '{plugin_name}' already exists. Use --force to overwrite.")
+        return False
+
+    staging_dir = make_staging_dir(target_dir)
+    try:
+        for entry in files:
+            rel = safe_relative_path(entry["path"])
+            target = staging_dir / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            store.copy_blob(entry["sha256"], target)
+            # Like member_mode() for zips: permission bits only, never setuid/setgid/sticky
+            os.chmod(target, int(entry.get("mode", "644"), 8) & 0o777)
+
+        swap_into_place(staging_dir, target_dir)
+    except (OSError, ValueError) as e:
+        print(f"Error: Failed to import '{plugin_name}' from store: {e}")
+        return False
+    finally:
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+
+    print(f"Imported plugin: {target_dir} ({len(files)} files from {store_dir})")
+    return True
+
+
+def load_catalog(source: str, downloader: Downloader) -> tuple[dict, str]:
+    """Load a catalog.json from a path or URL, returning it with its base location."""
+    if is_url(source):
+        path = downloader.fetch(source)
+        base = source.rsplit("/", 1)[0] + "/"
+    else:
+        path = Path(source)
+        if path.is_dir():
+            path = path / "catalog.json"
+        base = str(path.resolve().parent)
+
+    with open(path, "r") as f:
+        return json.load(f), base
+
+
+def _resolve(base: str, ref: str) -> str:
+    """Resolve a catalog reference against the catalog's location."""
+    if is_url(ref):
+        return ref
+    if is_url(base):
+        return urljoin(base, ref)
+    return str(Path(base) / ref)
+
+
+def plugin_source(entry: dict, base: str) -> str:
+    """
+    Where to fetch a catalog entry from.
+
+    An explicit ``archive_url`` or a ``source_url`` ending in .zip is used
+    as is. A ``source_url`` naming a directory next to a local catalog
+    (as in a marketplace checkout) is copied directly. Otherwise the
+    archive is expected next to the catalog under export.py's naming,
+    ``{name}-{version}.zip``.
+    """
+    if entry.get("archive_url"):
+        return _resolve(base, entry["archive_url"])
+
+    source_url = entry.get("source_url", "")
+    if source_url.endswith(".zip"):
+        return _resolve(base, source_url)
+    if source_url and not is_url(base) and Path(_resolve(base, source_url)).is_dir():
+        return _resolve(base, source_url)
+
+    return _resolve(base, f"{entry['name']}-{entry['version']}.zip")
+
+
+def expected_archive_sha256(entry: dict, archive: str, downloader: Downloader) -> str | None:
+    """The archive hash from the catalog entry, or from export.py's sibling manifest."""
+    if entry.get("archive_sha256"):
+        return entry["archive_sha256"]
+
+    manifest = archive[:-len(".zip")] + ".manifest.json"
+    try:
+        path = downloader.fetch(manifest) if is_url(manifest) else Path(manifest)
+        with open(path, "r") as f:
+            return json.load(f).get("archive_sha256")
+    except (DownloadError, FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def archive_plugin_json(path: Path) -> dict:
+    """Read plugin.json from a plugin archive without extracting it."""
+    with zipfile.ZipFile(path, "r") as zipf:
+        prefix = find_plugin_root(zipf)
+        if prefix is None:
+            raise ValueError("No valid plugin.json found in archive")
+        return read_plugin_json(zipf, prefix)
+
+
+def install_plugin_dir(source_dir: Path, plugin_name: str, keep_previous: Path | None = None) -> bool:
+    """Copy a plugin directory into plugins/, replacing any installed copy."""
+    target_dir = PLUGINS_DIR / plugin_name
+    staging_dir = make_staging_dir(target_dir)
+    try:
+        shutil.copytree(source_dir, staging_dir, dirs_exist_ok=True)
+        swap_into_place(staging_dir, target_dir, keep_previous)
+    except OSError as e:
+        print(f"Error: Failed to install '{plugin_name}': {e}")
+        return False
+    finally:
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+
+    print(f"Imported plugin: {target_dir}")
+    return True
+
+
+def installed_versions() -> dict[str, str | None]:
+    """Versions of the plugins in plugins/, by plugin.json name."""
+    return {
+        p.plugin_json.get("name", p.name): p.plugin_json.get("version")
+        for p in scan_plugins(PLUGINS_DIR) if isinstance(p.plugin_json, dict)
+    }
+
+
+def fetch_catalog_plugin(entry: dict, base: str, downloader: Downloader) -> tuple[Path, int]:
+    """
+    Fetch and verify the plugin for a catalog entry.
+
+    Returns the local archive or plugin directory and its size in bytes.
+    Raises DownloadError, OSError, ValueError or zipfile.BadZipFile if the
+    plugin cannot be fetched or does not match the entry.
+    """
+    name, version = entry["name"], entry["version"]
+    location = plugin_source(entry, base)
+
+    if not is_url(location) and Path(location).is_dir():
+        local = Path(location)
+        plugin_json = json.loads((local / PLUGIN_JSON_MEMBER).read_text())
+        if not isinstance(plugin_json, dict):
+            raise ValueError("plugin.json must be a JSON object")
+        size = sum(f.stat().st_size for f in local.rglob("*") if f.is_file())
+    else:
+        local = downloader.fetch(location) if is_url(location) else Path(location)
+        size = local.stat().st_size
+        expected = expected_archive_sha256(entry, location, downloader)
+        with phase("hash"):
+            actual = file_sha256(local) if expected else None
+        if expected and actual != expected:
+            raise ValueError(f"archive sha256 does not match {expected}")
+        plugin_json = archive_plugin_json(local)
+
+    if plugin_json.get("name") != name or plugin_json.get("version") != version:
+        raise ValueError(f"archive contains {plugin_json.get('name')} {plugin_json.get('version')}, "
+                         f"expected {name} {version}")
+    return local, size
+
+
+def install_fetched(local: Path, name: str, keep_previous: Path | None = None) -> bool:
+    """Install a plugin returned by fetch_catalog_plugin, replacing any installed copy."""
+    if local.is_dir():
+        return install_plugin_dir(local, name, keep_previous)
+    return import_plugin(str(local), force=True, keep_previous=keep_previous)
+
+
+FETCH_ERRORS = (DownloadError, ValueError, *ARCHIVE_ERRORS)
+
+
+def sync_catalog(source: str, jobs: int = 4, dry_run: bool = False) -> bool:
+    """
+    Mirror another marketplace from its catalog.json.
+
+    Catalog entries are compared with the local plugins by name and
+    version, and only new or changed plugins are fetched. Up to ``jobs``
+    plugins are downloaded and verified at once; verified plugins are
+    installed one at a time through the usual staging-and-swap path.
+    """
+    downloader = Downloader()
+    try:
+        try:
+            catalog, base = load_catalog(source, downloader)
+        except (DownloadError, OSError, json.JSONDecodeError) as e:
+            print(f"Error: Could not load catalog {source}: {e}")
+            return False
+
+        local_versions = installed_versions()
+
+        pending = []
+        for entry in catalog.get("plugins", []):
+            name, version = entry.get("name"), entry.get("version")
+            if not isinstance(name, str) or not NAME_PATTERN.match(name) or not version:
+                print(f"Skipping invalid catalog entry: {name!r}")
+                continue
+            if name not in local_versions:
+                pending.append((entry, "new"))
+            elif local_versions[name] != version:
+                pending.append((entry, f"{local_versions[name]} -> {version}"))
+
+        up_to_date = len(catalog.get("plugins", [])) - len(pending)
+        print(f"Catalog: {len(pending)} to install, {up_to_date} up to date")
+        for entry, status in pending:
+            print(f"  {entry['name']} {entry['version']} ({status})")
+        if dry_run or not pending:
+            return True
+
+        install_lock = threading.Lock()
+
+        def sync_one(entry: dict) -> tuple[bool, int]:
+            try:
+                local, size = fetch_catalog_plugin(entry, base, downloader)
+            except FETCH_ERRORS as e:
+                print(f"Error: {entry['name']}: {e}")
+                return False, 0
+
+            with install_lock:
+                return install_fetched(local, entry["name"]), size
+
+        start = time.perf_counter()
+        entries = [entry for entry, _ in pending]
+        if jobs > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(sync_one, entries))
+        else:
+            results = [sync_one(entry) for entry in entries]
+        elapsed = time.perf_counter() - start
+    finally:
+        downloader.close()
+
+    installed = sum(1 for ok, _ in results if ok)
+    total_bytes = sum(size for ok, size in results if ok)
+    print(f"\nSynced {installed} of {len(results)} plugins, {total_bytes / 1e6:.2f} MB in {elapsed:.2f}s "
+          f"({installed / elapsed if elapsed else 0:.1f} plugins/s, "
+          f"{total_bytes / 1e6 / elapsed if elapsed else 0:.2f} MB/s)")
+    return installed == len(results)
+
+
+def install_plugins(names: list[str], catalog_source: str, with_deps: bool = False,
+                    jobs: int = 4, force: bool = False) -> bool:
+    """
+    Install plugins from a catalog, dependencies first.
+
+    Every archive in the plan is fetched and verified up front, up to
+    ``jobs`` at a time. A plugin is installed on the same pool as soon as
+    its own archive is verified and all of its dependencies are installed,
+    so independent branches of the dependency graph never wait on each
+    other. If any fetch or install fails, or the run is interrupted,
+    everything this run installed or replaced is rolled back.
+    """
+    downloader = Downloader()
+    try:
+        try:
+            catalog, base = load_catalog(catalog_source, downloader)
+        except (DownloadError, OSError, json.JSONDecodeError) as e:
+            print(f"Error: Could not load catalog {catalog_source}: {e}")
+            return False
+
+        graph = DependencyGraph.from_catalog(catalog)
+        entries = {
+            entry["name"]: entry for entry in catalog.get("plugins", [])
+            if entry.get("name") in graph.versions and str(entry.get("version")) == graph.versions[entry["name"]]
+        }
+
+        try:
+            if with_deps:
+                order = graph.install_order(names)
             else:
-                print(f"Error: Plugin '{plugin_name}' already exists. Use --force to overwrite.")
-                return False
+                missing = [name for name in names if name not in entries]
+                if missing:
+                    raise ResolutionError(f"Plugin '{missing[0]}' not found")
+                order = list(dict.fromkeys(names))
+        except ResolutionError as e:
+            print(f"Error: {e}")
+            return False
 
-        shutil.copytree(source_dir, target_dir)
-        print(f"Imported plugin: {target_dir}")
-        return True
+        for name in order:
+            if not NAME_PATTERN.match(name):
+                print(f"Error: Invalid plugin name in catalog: {name!r}")
+                return False
 
+        local_versions = installed_versions()
+        todo = [
+            name for name in order
+            if local_versions.get(name) != graph.versions[name] or (force and name in names)
+        ]
+        print(f"Install plan: {len(todo)} to install, {len(order) - len(todo)} already installed")
+        for name in todo:
+            status = "new" if name not in local_versions else f"{local_versions[name]} -> {graph.versions[name]}"
+            print(f"  {name} {graph.versions[name]} ({status})")
+        if not todo:
+            return True
+
+        todo_set = set(todo)
+        needs = {name: [dep for dep in graph.edges[name] if dep in todo_set] if with_deps else []
+                 for name in todo}
+
+        rollback_dir = Path(tempfile.mkdtemp(prefix=".rollback-", dir=PLUGINS_DIR))
+        installed = []
+        installed_lock = threading.Lock()
+        fetched = {}
+        failure = None
+        succeeded = False
+        start = time.perf_counter()
+
+        def install(name: str, local: Path) -> bool:
+            had_previous = (PLUGINS_DIR / name).exists()
+            keep_previous = rollback_dir / name if had_previous else None
+            if not install_fetched(local, name, keep_previous):
+                return False
+            # Recorded here rather than by the caller, so an install that
+            # finishes after another one failed is still rolled back
+            with installed_lock:
+                installed.append((name, had_previous))
+            return True
+
+        executor = ThreadPoolExecutor(max_workers=max(jobs, 1))
+        try:
+            futures = {executor.submit(fetch_catalog_plugin, entries[name], base, downloader): name
+                       for name in todo}
+            installs = set()
+            pending = set(futures)
+
+            installed_names = set()
+            while failure is None and len(installed_names) < len(todo):
+                ready = [name for name in todo
+                         if name in fetched and all(dep in installed_names for dep in needs[name])]
+                for name in ready:
+                    future = executor.submit(install, name, fetched.pop(name))
+                    futures[future] = name
+                    installs.add(future)
+                    pending.add(future)
+
+                if not pending:
+                    failure = "no installable plugins left"
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures[future]
+                    try:
+                        result = future.result()
+                    except FETCH_ERRORS as e:
+                        failure = f"{name}: {e}"
+                        continue
+                    if future not in installs:
+                        fetched[name] = result[0]
+                    elif result:
+                        installed_names.add(name)
+                    else:
+                        failure = f"{name}: install failed"
+
+            succeeded = failure is None
+        finally:
+            # Let running installs finish first, so each is either kept or rolled back
+            executor.shutdown(wait=True, cancel_futures=True)
+            if not succeeded:
+                if failure is not None:
+                    print(f"Error: {failure}")
+                for name, had_previous in reversed(installed):
+                    shutil.rmtree(PLUGINS_DIR / name)
+                    if had_previous:
+                        os.rename(rollback_dir / name, PLUGINS_DIR / name)
+                print(f"Rolled back {len(installed)} installed plugins")
+            shutil.rmtree(rollback_dir)
+
+        elapsed = time.perf_counter() - start
+        if not succeeded:
+            return False
     finally:
-        shutil.rmtree(temp_dir)
+        downloader.close()
+
+    print(f"\nInstalled {len(installed)} plugins in {elapsed:.2f}s")
+    return True
 
 
 def import_skill(source: str, plugin_name: str, force: bool = False) -> bool:
@@ -244,35 +937,79 @@ def import_hooks(source: str, plugin_name: str, force: bool = False) -> bool:
 
 def main():
     parser = argparse.ArgumentParser(description="Import Claude Code plugin components")
-    parser.add_argument("type", choices=["plugin", "skill", "agent", "command", "hook"])
-    parser.add_argument("source", help="Path or URL to import from")
+    parser.add_argument("type", choices=["plugin", "sync", "install", "skill", "agent", "command", "hook"])
+    parser.add_argument("source", nargs="+",
+                        help="Path or URL to import from (several for plugin; a catalog.json for sync; "
+                             "plugin names for install)")
     parser.add_argument("--plugin", "-p", help="Target plugin name (for skill/agent/command/hook)")
     parser.add_argument("--force", "-f", action="store_true", help="Overwrite existing")
-
+    parser.add_argument("--update", "-u", action="store_true",
+                        help="Update an installed plugin in place, rewriting only changed files")
+    parser.add_argument("--store", help="Blob store to import from (source is a manifest name or path)")
+    parser.add_argument("--jobs", "-j", type=int, default=4,
+                        help="Parallel downloads for several plugin URLs or sync (default: 4)")
+    parser.add_argument("--dry-run", action="store_true", help="For sync: show what would be installed")
+    parser.add_argument("--catalog", help="For install: catalog.json path or URL to install from")
+    parser.add_argument("--with-deps", action="store_true", help="For install: also install dependencies")
+
+    add_timing_arguments(parser)
     args = parser.parse_args()
+    start_timings(args, "import")
+
+    if args.type not in ("plugin", "install") and len(args.source) > 1:
+        print(f"Error: {args.type} import takes a single source")
+        sys.exit(1)
+    source = args.source[0]
 
     if args.type == "plugin":
-        import_plugin(args.source, args.force)
+        if args.store:
+            results = [import_plugin_from_store(args.store, ref, args.force) for ref in args.source]
+        else:
+            sources = args.source
+            if len(sources) > 1:
+                sources = fetch_sources(sources, max(args.jobs, 1))
+            results = []
+            for local in sources:
+                if local is None:
+                    results.append(False)
+                elif args.update:
+                    results.append(update_plugin(local))
+                else:
+                    results.append(import_plugin(local, args.force))
+
+        if len(results) > 1:
+            print(f"\nImported {sum(results)} of {len(results)} plugins")
+        if not all(results):
+            sys.exit(1)
+    elif args.type == "sync":
+        if not sync_catalog(source, max(args.jobs, 1), args.dry_run):
+            sys.exit(1)
+    elif args.type == "install":
+        if not args.catalog:
+            print("Error: --catalog required for install")
+            sys.exit(1)
+        if not install_plugins(args.source, args.catalog, args.with_deps, max(args.jobs, 1), args.force):
+            sys.exit(1)
     elif args.type == "skill":
         if not args.plugin:
             print("Error: --plugin required for skill import")
             return
-        import_skill(args.source, args.plugin, args.force)
+        import_skill(source, args.plugin, args.force)
     elif args.type == "agent":
         if not args.plugin:
             print("Error: --plugin required for agent import")
             return
-        import_agent(args.source, args.plugin, args.force)
+        import_agent(source, args.plugin, args.force)
     elif args.type == "command":
         if not args.plugin:
             print("Error: --plugin required for command import")
             return
-        import_command(args.source, args.plugin, args.force)
+        import_command(source, args.plugin, args.force)
     elif args.type == "hook":
         if not args.plugin:
             print("Error: --plugin required for hook import")
             return
-        import_hooks(args.source, args.plugin, args.force)
+        import_hooks(source, args.plugin, args.force)
 
 
 if __name__ == "__main__":
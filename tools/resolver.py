@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Resolve plugin dependencies against a catalog.
+
+The ``dependencies`` field of plugin.json maps plugin names to semver
+ranges (``^1.2.0``, ``~1.2``, ``>=1.0.0 <2.0.0``, ``1.x || 2.x``). This
+module builds the dependency graph for a whole registry in one pass,
+reports missing and unsatisfied dependencies and cycles, and orders the
+install of a plugin so that every dependency comes before its dependents.
+
+Range and version parsing is memoized, and both cycle detection and
+install ordering are iterative depth-first searches, so checking a
+registry is linear in plugins plus dependency edges.
+
+Usage:
+    python resolver.py check
+    python resolver.py resolve my-plugin
+    python resolver.py resolve my-plugin --catalog ./mirror/catalog.json --json
+"""
+
+import argparse
+import json
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+CATALOG_PATH = Path(__file__).parent.parent / "catalog.json"
+
+VERSION_PATTERN = re.compile(
+    r"^v?(\d+|[xX*])(?:\.(\d+|[xX*]))?(?:\.(\d+|[xX*]))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$"
+)
+COMPARATOR_PATTERN = re.compile(r"^(\^|~|>=|<=|>|<|=)?(.*)$")
+
+# Prerelease key of the lowest possible prerelease ("1.0.0-0"), used for
+# exclusive upper bounds so that 2.0.0-beta does not satisfy ^1.0.0
+LOWEST_PRERELEASE = (0, ())
+RELEASE = (1,)
+
+
+class ResolutionError(Exception):
+    """Raised when a plugin's dependencies cannot be resolved."""
+
+
+def _prerelease_key(prerelease: str | None) -> tuple:
+    if not prerelease:
+        return RELEASE
+    parts = tuple((0, int(p), "") if p.isdigit() else (1, 0, p) for p in prerelease.split("."))
+    return (0, parts)
+
+
+@lru_cache(maxsize=None)
+def parse_version(version: str) -> tuple:
+    """
+    Parse a version into a sortable key (major, minor, patch, prerelease).
+
+    Missing minor or patch numbers count as 0. Raises ValueError if the
+    version is not of the form MAJOR[.MINOR[.PATCH]][-PRERELEASE][+BUILD].
+    """
+    match = VERSION_PATTERN.match(str(version).strip())
+    if not match or any(part and not part.isdigit() for part in match.groups()[:3]):
+        raise ValueError(f"Invalid version: '{version}'")
+    major, minor, patch, prerelease = match.groups()
+    return (int(major), int(minor or 0), int(patch or 0), _prerelease_key(prerelease))
+
+
+def _partial(text: str) -> tuple[list[int], str | None]:
+    """Parse a possibly partial version (1, 1.2, 1.2.x) into its given numbers."""
+    match = VERSION_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Invalid version in range: '{text}'")
+    numbers = []
+    for part in match.groups()[:3]:
+        if part is None or not part.isdigit():
+            break
+        numbers.append(int(part))
+    return numbers, match.group(4)
+
+
+def _bump(numbers: list[int]) -> tuple:
+    """Exclusive upper bound for a partial version: 1.2 -> 1.3.0-0, 1 -> 2.0.0-0."""
+    bumped = numbers[:-1] + [numbers[-1] + 1]
+    bumped += [0] * (3 - len(bumped))
+    return (*bumped, LOWEST_PRERELEASE)
+
+
+def _key(numbers: list[int], prerelease: str | None = None) -> tuple:
+    padded = numbers + [0] * (3 - len(numbers))
+    return (*padded, _prerelease_key(prerelease))
+
+
+def _comparators(op: str, text: str) -> list[tuple[str, tuple]]:
+    """Desugar one comparator into (operator, version key) bounds."""
+    if text in ("", "*", "x", "X"):
+        return []
+
+    numbers, prerelease = _partial(text)
+    full = len(numbers) == 3
+
+    if op == "^":
+        # Bump the first non-zero number given (^1.2.3 -> <2.0.0, ^0.2.3 -> <0.3.0,
+        # ^0.0.3 -> <0.0.4), or the last one given if all are zero (^0.0 -> <0.1.0)
+        significant = next((i for i, n in enumerate(numbers) if n), len(numbers) - 1)
+        return [(">=", _key(numbers, prerelease)), ("<", _bump(numbers[:significant + 1]))]
+
+    if op == "~":
+        lower = _key(numbers, prerelease)
+        return [(">=", lower), ("<", _bump(numbers[:2] if len(numbers) > 1 else numbers))]
+
+    if full:
+        return [(op or "=", _key(numbers, prerelease))]
+
+    # Partial versions cover every version they prefix
+    if op in ("", "="):
+        return [(">=", _key(numbers)), ("<", _bump(numbers))]
+    if op == ">":
+        return [(">=", _bump(numbers))]
+    if op == ">=":
+        return [(">=", _key(numbers))]
+    if op == "<":
+        return [("<", (*_key(numbers)[:3], LOWEST_PRERELEASE))]
+    return [("<", _bump(numbers))]  # <=
+
+
+@lru_cache(maxsize=None)
+def parse_range(spec: str) -> tuple:
+    """
+    Parse a semver range into alternatives of (operator, version key) bounds.
+
+    Supports exact versions, comparators (>=, >, <=, <, =), caret and tilde
+    ranges, x-ranges, hyphen ranges (1.0.0 - 2.0.0) and ``||``. Raises
+    ValueError for anything else.
+    """
+    alternatives = []
+    for alternative in str(spec).split("||"):
+        alternative = re.sub(r"(>=|<=|>|<|=|\^|~)\s+", r"\1", alternative.strip())
+
+        hyphen = re.match(r"^(\S+)\s+-\s+(\S+)$", alternative)
+        if hyphen:
+            low, high = hyphen.groups()
+            bounds = _comparators(">=", low)
+            high_numbers, high_pre = _partial(high)
+            if len(high_numbers) == 3:
+                bounds += [("<=", _key(high_numbers, high_pre))]
+            else:
+                bounds += _comparators("<=", high)
+            alternatives.append(tuple(bounds))
+            continue
+
+        bounds = []
+        for token in alternative.split():
+            op, text = COMPARATOR_PATTERN.match(token).groups()
+            bounds.extend(_comparators(op or "", text))
+        alternatives.append(tuple(bounds))
+    return tuple(alternatives)
+
+
+def satisfies(version: str, spec: str) -> bool:
+    """Whether a version falls in a semver range."""
+    key = parse_version(version)
+    for bounds in parse_range(spec):
+        if key[3] != RELEASE:
+            # A prerelease only matches a range naming a prerelease of the same version
+            if not any(bound[:3] == key[:3] and bound[3] not in (RELEASE, LOWEST_PRERELEASE)
+                       for _, bound in bounds):
+                continue
+        if all(_compare(key, op, bound) for op, bound in bounds):
+            return True
+    return False
+
+
+def _compare(key: tuple, op: str, bound: tuple) -> bool:
+    if op == "=":
+        return key == bound
+    if op == ">=":
+        return key >= bound
+    if op == ">":
+        return key > bound
+    if op == "<=":
+        return key <= bound
+    return key < bound
+
+
+class DependencyGraph:
+    """
+    The dependency graph of a registry, built once from plugin metadata.
+
+    ``problems`` lists (plugin, dependency, message) for every dependency that is
+    missing, has an invalid range or is not satisfied by the available
+    version. Edges point from a plugin to the dependencies it can use.
+    Entries without a string name are skipped, and a version range that is
+    not a string is a problem rather than an edge.
+
+    >>> graph = DependencyGraph([
+    ...     {"name": "a", "version": "1.0.0", "dependencies": {"b": {"version": "1"}}},
+    ...     {"name": "b", "version": "1.0.0"},
+    ...     {"name": ["c"], "version": "1.0.0"},
+    ... ])
+    >>> graph.problems
+    [('a', 'b', "Dependency version must be a string: 'b'")]
+    >>> sorted(graph.versions)
+    ['a', 'b']
+    """
+
+    def __init__(self, entries: Iterable[dict]):
+        self.versions = {}
+        self.requirements = {}
+        for entry in entries:
+            name = entry.get("name")
+            if not isinstance(name, str):
+                continue
+            version = str(entry.get("version", "0.0.0"))
+            if name in self.versions and not self._newer(version, self.versions[name]):
+                continue
+            dependencies = entry.get("dependencies") or {}
+            self.versions[name] = version
+            self.requirements[name] = dependencies if isinstance(dependencies, dict) else {}
+
+        self.edges = {}
+        self.problems = []
+        for name, dependencies in self.requirements.items():
+            edges = []
+            for dep_name, spec in dependencies.items():
+                if not isinstance(spec, str):
+                    self.problems.append((name, dep_name, f"Dependency version must be a string: '{dep_name}'"))
+                    continue
+                if dep_name not in self.versions:
+                    self.problems.append((name, dep_name, f"Missing dependency: '{dep_name}' ({spec})"))
+                    continue
+                edges.append(dep_name)
+                try:
+                    if not satisfies(self.versions[dep_name], spec):
+                        self.problems.append((name, dep_name, (
+                            f"Dependency '{dep_name}' {self.versions[dep_name]} does not satisfy '{spec}'"
+                        )))
+                except ValueError as e:
+                    self.problems.append((name, dep_name, f"Dependency '{dep_name}': {e}"))
+            self.edges[name] = edges
+
+    @staticmethod
+    def _newer(version: str, than: str) -> bool:
+        try:
+            return parse_version(version) > parse_version(than)
+        except ValueError:
+            return False
+
+    @classmethod
+    def from_catalog(cls, catalog: dict) -> "DependencyGraph":
+        return cls(catalog.get("plugins", []))
+
+    def cycles(self) -> list[list[str]]:
+        """Return every dependency cycle, as the plugins in each strongly connected component."""
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+
+        for root in self.edges:
+            if root in index:
+                continue
+            work = [(root, iter(self.edges[root]))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.edges.get(child, []))))
+                        break
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in self.edges.get(node, []):
+                            components.append(sorted(component))
+
+        return sorted(components)
+
+    def check(self) -> list[tuple[str, str | None, str]]:
+        """All dependency problems in the registry as (plugin, dependency, message), including cycles."""
+        problems = list(self.problems)
+        for cycle in self.cycles():
+            for name in cycle:
+                problems.append((name, None, f"Dependency cycle: {' -> '.join(cycle + cycle[:1])}"))
+        return sorted(problems, key=lambda problem: (problem[0], problem[2]))
+
+    def install_order(self, roots: list[str]) -> list[str]:
+        """
+        Return roots and everything they depend on, dependencies first.
+
+        Raises ResolutionError if any plugin involved is unknown, has an
+        unsatisfied dependency or is part of a cycle.
+        """
+        for root in roots:
+            if root not in self.versions:
+                raise ResolutionError(f"Plugin '{root}' not found")
+
+        order = []
+        done = set()
+        in_progress = set()
+        for root in roots:
+            if root in done:
+                continue
+            work = [(root, iter(self.edges[root]))]
+            in_progress.add(root)
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child in in_progress:
+                        raise ResolutionError(f"Dependency cycle through '{child}' (required by '{node}')")
+                    if child not in done:
+                        in_progress.add(child)
+                        work.append((child, iter(self.edges[child])))
+                        break
+                else:
+                    work.pop()
+                    in_progress.discard(node)
+                    done.add(node)
+                    order.append(node)
+
+        involved = set(order)
+        problems = [f"{name}: {message}" for name, _, message in self.problems if name in involved]
+        if problems:
+            raise ResolutionError("; ".join(problems))
+        return order
+
+
+def load_graph(catalog_path: Path = CATALOG_PATH) -> DependencyGraph:
+    """Build the dependency graph of a catalog.json."""
+    with open(catalog_path, "r") as f:
+        return DependencyGraph.from_catalog(json.load(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve Claude Code plugin dependencies")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    check = subparsers.add_parser("check", help="Check the whole registry for dependency problems")
+    check.add_argument("--catalog", default=str(CATALOG_PATH), help="catalog.json to read")
+
+    resolve = subparsers.add_parser("resolve", help="Print the install plan for a plugin")
+    resolve.add_argument("plugin", nargs="+", help="Plugin(s) to install")
+    resolve.add_argument("--catalog", default=str(CATALOG_PATH), help="catalog.json to read")
+    resolve.add_argument("--json", action="store_true", help="Print the plan as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        graph = load_graph(Path(args.catalog))
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error: Could not load catalog {args.catalog}: {e}")
+        sys.exit(1)
+
+    if args.command == "check":
+        problems = graph.check()
+        edge_count = sum(len(edges) for edges in graph.edges.values())
+        print(f"Dependency graph: {len(graph.versions)} plugins, {edge_count} dependencies")
+        for name, _, message in problems:
+            print(f"  {name}: {message}")
+        if problems:
+            print(f"\n{len(problems)} dependency problems")
+            sys.exit(1)
+        print("  OK - No issues found")
+        return
+
+    try:
+        order = graph.install_order(args.plugin)
+    except ResolutionError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps([{"name": name, "version": graph.versions[name]} for name in order], indent=2))
+        return
+
+    print(f"Install plan ({len(order)} plugins):")
+    for position, name in enumerate(order, 1):
+        requires = ", ".join(f"{dep} {graph.requirements[name][dep]}" for dep in graph.edges[name])
+        suffix = f"  (requires {requires})" if requires else ""
+        print(f"  {position}. {name} {graph.versions[name]}{suffix}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,8 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 
+from timings import add_timing_arguments, phase, start_timings
+
 TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
 PLUGINS_DIR = Path(__file__).parent.parent / "plugins"
 
@@ -38,7 +40,8 @@ def scaffold_plugin(name: str, description: str = "", author: str = ""):
 
     # Copy template
     template_dir = TEMPLATES_DIR / "plugin"
-    shutil.copytree(template_dir, plugin_dir)
+    with phase("write"):
+        shutil.copytree(template_dir, plugin_dir)
 
     # Update plugin.json
     plugin_json_path = plugin_dir / ".claude-plugin" / "plugin.json"
@@ -246,7 +249,9 @@ def main():
     parser.add_argument("--description", "-d", default="", help="Description")
     parser.add_argument("--author", "-a", default="", help="Author name (for plugins)")
 
+    add_timing_arguments(parser)
     args = parser.parse_args()
+    start_timings(args, "scaffold")
 
     if args.type == "plugin":
         scaffold_plugin(args.name, args.description, args.author)
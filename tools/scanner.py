@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Scan the plugins/ directory into an in-memory model.
+
+Each plugin directory is walked once with os.scandir, and the resulting
+PluginInfo is shared by validate.py, generate_catalog.py and export.py so
+that no tool has to re-stat the tree on its own.
+
+Usage (as a library):
+    from scanner import scan_plugin, scan_plugins
+
+    for plugin in scan_plugins():
+        print(plugin.name, plugin.components())
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+
+from timings import count, phase
+
+PLUGINS_DIR = Path(__file__).parent.parent / "plugins"
+
+
+@dataclass
+class SkillInfo:
+    """A directory under skills/, with its SKILL.md path if present."""
+    name: str
+    path: Path
+    skill_md: Path | None = None
+
+
+@dataclass
+class PluginInfo:
+    """Everything the tools need to know about one plugin directory."""
+    name: str
+    path: Path
+    plugin_json: dict | None = None
+    plugin_json_error: str | None = None
+    commands: list[Path] = field(default_factory=list)
+    agents: list[Path] = field(default_factory=list)
+    skills: list[SkillInfo] = field(default_factory=list)
+    hooks_path: Path | None = None
+    hooks: dict | None = None
+    hooks_error: str | None = None
+    mcp_path: Path | None = None
+    mcp: dict | None = None
+    mcp_error: str | None = None
+
+    @property
+    def plugin_json_path(self) -> Path:
+        return self.path / ".claude-plugin" / "plugin.json"
+
+    @property
+    def has_plugin_json(self) -> bool:
+        return self.plugin_json is not None or self.plugin_json_error is not None
+
+    @property
+    def command_names(self) -> list[str]:
+        return [p.stem for p in self.commands]
+
+    @property
+    def agent_names(self) -> list[str]:
+        return [p.stem for p in self.agents]
+
+    @property
+    def skill_names(self) -> list[str]:
+        return [s.name for s in self.skills if s.skill_md]
+
+    def components(self) -> dict:
+        """Count components in the plugin."""
+        hooks = False
+        if isinstance(self.hooks, dict):
+            hooks = bool(self.hooks.get("hooks"))
+
+        mcp_servers = 0
+        if isinstance(self.mcp, dict):
+            mcp_servers = len(self.mcp.get("mcpServers", {}))
+
+        return {
+            "commands": len(self.commands),
+            "agents": len(self.agents),
+            "skills": len(self.skill_names),
+            "hooks": hooks,
+            "mcp_servers": mcp_servers
+        }
+
+    @cached_property
+    def files(self) -> list[str]:
+        """All files in the plugin as sorted POSIX paths relative to its root."""
+        return sorted(_walk_files(self.path, ""))
+
+
+def _scandir(path: Path) -> list[os.DirEntry]:
+    """List a directory, returning [] if it is missing or not a directory."""
+    try:
+        with os.scandir(path) as it:
+            return list(it)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def _walk_files(root: Path, prefix: str):
+    for entry in _scandir(root):
+        rel = f"{prefix}{entry.name}"
+        if entry.is_dir():
+            yield from _walk_files(Path(entry.path), rel + "/")
+        elif entry.is_file():
+            yield rel
+
+
+def _read_json(path: Path) -> tuple[dict | None, str | None]:
+    """Load a JSON file, returning (data, None) or (None, error message)."""
+    try:
+        with phase("read"), open(path, "r") as f:
+            text = f.read()
+    except FileNotFoundError:
+        return None, None
+    count("files_read")
+    count("bytes_read", len(text))
+    try:
+        with phase("json"):
+            return json.loads(text), None
+    except json.JSONDecodeError as e:
+        return None, str(e)
+
+
+def _markdown_files(directory: Path) -> list[Path]:
+    return sorted(
+        Path(e.path) for e in _scandir(directory)
+        if e.name.endswith(".md") and e.is_file()
+    )
+
+
+def scan_plugin(plugin_dir: Path) -> PluginInfo | None:
+    """Scan a single plugin directory. Returns None if it does not exist."""
+    with phase("walk"):
+        return _scan_plugin(plugin_dir)
+
+
+def _scan_plugin(plugin_dir: Path) -> PluginInfo | None:
+    try:
+        with os.scandir(plugin_dir) as it:
+            entries = {e.name: e for e in it}
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+    plugin = PluginInfo(name=plugin_dir.name, path=plugin_dir)
+
+    def is_dir(name: str) -> bool:
+        return name in entries and entries[name].is_dir()
+
+    if is_dir(".claude-plugin"):
+        plugin.plugin_json, plugin.plugin_json_error = _read_json(plugin.plugin_json_path)
+
+    if is_dir("commands"):
+        plugin.commands = _markdown_files(plugin_dir / "commands")
+
+    if is_dir("agents"):
+        plugin.agents = _markdown_files(plugin_dir / "agents")
+
+    if is_dir("skills"):
+        for entry in sorted(_scandir(plugin_dir / "skills"), key=lambda e: e.name):
+            if not entry.is_dir():
+                continue
+            skill_dir = Path(entry.path)
+            skill_md = skill_dir / "SKILL.md"
+            plugin.skills.append(SkillInfo(
+                name=entry.name,
+                path=skill_dir,
+                skill_md=skill_md if skill_md.is_file() else None
+            ))
+
+    if is_dir("hooks"):
+        hooks_path = plugin_dir / "hooks" / "hooks.json"
+        plugin.hooks, plugin.hooks_error = _read_json(hooks_path)
+        if plugin.hooks is not None or plugin.hooks_error is not None:
+            plugin.hooks_path = hooks_path
+
+    if ".mcp.json" in entries:
+        mcp_path = plugin_dir / ".mcp.json"
+        plugin.mcp, plugin.mcp_error = _read_json(mcp_path)
+        if plugin.mcp is not None or plugin.mcp_error is not None:
+            plugin.mcp_path = mcp_path
+
+    return plugin
+
+
+def stat_signature(plugin_dir: Path) -> str:
+    """
+    Cheap change detector for a plugin, built from stat calls only.
+
+    Covers every file and directory listing that feeds PluginInfo, so a
+    matching signature means scan_plugin() would return the same model.
+    """
+    parts = []
+
+    def add(path: Path):
+        try:
+            st = os.stat(path)
+            parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+        except (FileNotFoundError, NotADirectoryError):
+            parts.append("-")
+
+    add(plugin_dir)
+    add(plugin_dir / ".claude-plugin" / "plugin.json")
+    add(plugin_dir / "commands")
+    add(plugin_dir / "agents")
+    add(plugin_dir / "skills")
+    add(plugin_dir / "hooks" / "hooks.json")
+    add(plugin_dir / ".mcp.json")
+
+    for entry in sorted(_scandir(plugin_dir / "skills"), key=lambda e: e.name):
+        if entry.is_dir():
+            # A skill directory's mtime changes when SKILL.md is added or removed
+            parts.append(entry.name)
+            add(Path(entry.path))
+
+    return "|".join(parts)
+
+
+def frontmatter_signature(plugin_dir: Path) -> str:
+    """
+    Stat data of every command, agent and SKILL.md file in a plugin.
+
+    stat_signature() only sees these files being added or removed; this
+    also changes when one of them is edited, for results that depend on
+    their frontmatter.
+    """
+    parts = []
+    for directory in ("commands", "agents"):
+        for entry in _scandir(os.path.join(plugin_dir, directory)):
+            if entry.name.endswith(".md") and entry.is_file():
+                st = entry.stat()
+                parts.append(f"{directory}/{entry.name}:{st.st_mtime_ns}:{st.st_size}")
+
+    for entry in _scandir(os.path.join(plugin_dir, "skills")):
+        if entry.is_dir():
+            try:
+                st = os.stat(entry.path + "/SKILL.md")
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            parts.append(f"skills/{entry.name}:{st.st_mtime_ns}:{st.st_size}")
+
+    return "|".join(sorted(parts))
+
+
+def list_plugin_dirs(plugins_dir: Path = PLUGINS_DIR) -> list[Path]:
+    """List plugin directories in sorted order with a single scandir.
+
+    Hidden entries are skipped; the import tools stage plugins in hidden
+    directories next to their final location.
+    """
+    with phase("walk"):
+        return sorted(
+            Path(e.path) for e in _scandir(plugins_dir)
+            if e.is_dir() and not e.name.startswith(".")
+        )
+
+
+def scan_plugins(plugins_dir: Path = PLUGINS_DIR) -> list[PluginInfo]:
+    """Scan every plugin directory, sorted by directory name."""
+    plugins = []
+    for plugin_dir in list_plugin_dirs(plugins_dir):
+        plugin = scan_plugin(plugin_dir)
+        if plugin is not None:
+            plugins.append(plugin)
+    return plugins
+
+
+def count_components(plugin_dir: Path) -> dict:
+    """Count components in a plugin."""
+    plugin = scan_plugin(plugin_dir)
+    if plugin is None:
+        raise FileNotFoundError(f"Plugin directory not found: {plugin_dir}")
+    return plugin.components()
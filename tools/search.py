@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Search plugins by name, keywords and descriptions using a prebuilt index.
+
+The index is a tokenized inverted index over plugin names, keywords,
+descriptions and the frontmatter descriptions of every skill, agent and
+command. Queries are ranked with BM25 and never touch the plugins/ tree.
+
+The index file is memory-mapped and looked up through a hash table of
+terms, so a query reads only the postings of its own terms and the
+entries of the plugins it returns, instead of loading the whole index.
+
+Usage:
+    python search.py "pdf extraction"
+    python search.py ollama --limit 5
+    python search.py "test generation" --json
+    python search.py --build
+"""
+
+import argparse
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from pathlib import Path
+from typing import Iterable
+
+from catalog_reader import name_hash
+from scanner import PLUGINS_DIR, PluginInfo, scan_plugins
+
+SEARCH_INDEX_PATH = Path(__file__).parent.parent / "search-index.idx"
+INDEX_MAGIC = b"SIDX"
+INDEX_VERSION = 2
+
+# magic, version, doc_count, slot_count, avg_length, docs_offset
+HEADER = struct.Struct("<4sIIIdQ")
+# offset, length of one document's JSON
+DOC = struct.Struct("<QI")
+# term hash, offset of its postings block (0 marks an empty slot)
+SLOT = struct.Struct("<QQ")
+# posting count and term length, followed by the term itself
+TERM = struct.Struct("<II")
+# doc id, term frequency, document length
+POSTING = struct.Struct("<III")
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Each field's tokens are counted this many times in the document
+FIELD_WEIGHTS = {
+    "name": 3,
+    "keywords": 2,
+    "component_names": 2,
+    "description": 1,
+    "component_descriptions": 1,
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or that the this "
+    "to use used when with you your".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase text and split it into index terms."""
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _description(path: Path) -> str:
+    # Only index builds read frontmatter; queries never import it (or PyYAML)
+    from frontmatter import FrontmatterError, read_frontmatter
+
+    try:
+        frontmatter = read_frontmatter(path)
+    except (FileNotFoundError, FrontmatterError):
+        return ""
+    if not frontmatter:
+        return ""
+    return str(frontmatter.get("description") or "")
+
+
+def plugin_fields(plugin: PluginInfo) -> dict[str, str]:
+    """Collect the searchable text of a scanned plugin, by field."""
+    data = plugin.plugin_json
+    keywords = data.get("keywords", [])
+    if not isinstance(keywords, list):
+        keywords = [keywords]
+
+    component_paths = plugin.commands + plugin.agents + [s.skill_md for s in plugin.skills if s.skill_md]
+    component_names = plugin.command_names + plugin.agent_names + plugin.skill_names
+
+    return {
+        "name": str(data.get("name", plugin.name)),
+        "keywords": " ".join(str(k) for k in keywords),
+        "component_names": " ".join(component_names),
+        "description": str(data.get("description", "")),
+        "component_descriptions": " ".join(_description(p) for p in component_paths),
+    }
+
+
+def search_document(plugin: PluginInfo) -> dict:
+    """
+    The index document of a scanned plugin with a valid plugin.json.
+
+    Documents are plain JSON, so generate_catalog.py can keep them between
+    runs and only rebuild those of changed plugins.
+    """
+    fields = plugin_fields(plugin)
+    term_counts = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in tokenize(fields[field]):
+            term_counts[term] = term_counts.get(term, 0) + weight
+
+    return {
+        "name": fields["name"],
+        "description": fields["description"],
+        "category": plugin.plugin_json.get("category", "utilities"),
+        "terms": term_counts
+    }
+
+
+def index_documents(documents: Iterable[dict]) -> dict:
+    """Build the inverted index from search documents, in their order."""
+    docs = []
+    postings = {}
+
+    for document in documents:
+        doc_id = len(docs)
+        docs.append({
+            "name": document["name"],
+            "description": document["description"],
+            "category": document["category"],
+            "length": sum(document["terms"].values())
+        })
+        for term, count in document["terms"].items():
+            postings.setdefault(term, []).append([doc_id, count])
+
+    total_length = sum(doc["length"] for doc in docs)
+    return {
+        "version": INDEX_VERSION,
+        "avg_length": total_length / len(docs) if docs else 0.0,
+        "docs": docs,
+        "postings": dict(sorted(postings.items()))
+    }
+
+
+def build_search_index(plugins: list[PluginInfo]) -> dict:
+    """Build the inverted index for all plugins with a valid plugin.json."""
+    return index_documents(
+        search_document(plugin) for plugin in plugins if isinstance(plugin.plugin_json, dict)
+    )
+
+
+def write_search_index(index: dict, path: Path = SEARCH_INDEX_PATH):
+    """
+    Write the index in its memory-mappable form.
+
+    Layout: header, a table of (offset, length) for each document's JSON,
+    an open-addressing hash table from term to its postings block, the
+    postings blocks, then the documents' JSON.
+    """
+    docs = index["docs"]
+    postings = index["postings"]
+
+    slot_count = 1
+    while slot_count < 2 * len(postings):
+        slot_count *= 2
+    mask = slot_count - 1
+    slots = [(0, 0)] * slot_count
+
+    postings_offset = HEADER.size + DOC.size * len(docs) + SLOT.size * slot_count
+    blocks = []
+    offset = postings_offset
+    for term, term_postings in postings.items():
+        encoded = term.encode()
+        block = TERM.pack(len(term_postings), len(encoded)) + encoded + b"".join(
+            POSTING.pack(doc_id, count, docs[doc_id]["length"]) for doc_id, count in term_postings
+        )
+        h = name_hash(term)
+        slot = h & mask
+        while slots[slot][0]:
+            slot = (slot + 1) & mask
+        slots[slot] = (h, offset)
+        blocks.append(block)
+        offset += len(block)
+
+    docs_offset = offset
+    doc_blobs = [
+        json.dumps({key: doc[key] for key in ("name", "description", "category")},
+                   separators=(",", ":")).encode()
+        for doc in docs
+    ]
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(docs), slot_count,
+                            index["avg_length"], docs_offset))
+        offset = docs_offset
+        for blob in doc_blobs:
+            f.write(DOC.pack(offset, len(blob)))
+            offset += len(blob)
+        for h, block_offset in slots:
+            f.write(SLOT.pack(h, block_offset))
+        f.writelines(blocks)
+        f.writelines(doc_blobs)
+    os.replace(tmp_path, path)
+
+
+class SearchIndex:
+    """A search index file, memory-mapped so a query reads only what it needs."""
+
+    def __init__(self, path: Path):
+        self._file = open(path, "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty search index: {path}")
+        if len(self._data) < HEADER.size:
+            self.close()
+            raise ValueError(f"Truncated search index: {path}")
+        magic, version, self.doc_count, self._slot_count, self.avg_length, _ = \
+            HEADER.unpack_from(self._data, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported search index format: {path}")
+        self._slots_offset = HEADER.size + DOC.size * self.doc_count
+
+    def postings(self, term: str) -> list[tuple[int, int, int]]:
+        """(doc id, term frequency, document length) for each document containing term."""
+        if not self._slot_count:
+            return []
+        data = self._data
+        encoded = term.encode()
+        h = name_hash(term)
+        mask = self._slot_count - 1
+        slot = h & mask
+        while True:
+            slot_hash, offset = SLOT.unpack_from(data, self._slots_offset + SLOT.size * slot)
+            if not offset:
+                return []
+            if slot_hash == h:
+                count, length = TERM.unpack_from(data, offset)
+                start = offset + TERM.size
+                if data[start:start + length] == encoded:
+                    start += length
+                    return list(POSTING.iter_unpack(data[start:start + POSTING.size * count]))
+            slot = (slot + 1) & mask
+
+    def doc(self, doc_id: int) -> dict:
+        offset, length = DOC.unpack_from(self._data, HEADER.size + DOC.size * doc_id)
+        return json.loads(self._data[offset:offset + length])
+
+    def close(self):
+        if getattr(self, "_data", None) is not None:
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MemorySearchIndex:
+    """The SearchIndex interface over an index built in memory."""
+
+    def __init__(self, index: dict):
+        self._docs = index["docs"]
+        self._postings = index["postings"]
+        self.doc_count = len(self._docs)
+        self.avg_length = index["avg_length"]
+
+    def postings(self, term: str) -> list[tuple[int, int, int]]:
+        return [(doc_id, tf, self._docs[doc_id]["length"]) for doc_id, tf in self._postings.get(term, [])]
+
+    def doc(self, doc_id: int) -> dict:
+        return {key: self._docs[doc_id][key] for key in ("name", "description", "category")}
+
+
+def open_search_index(path: Path = SEARCH_INDEX_PATH) -> SearchIndex | None:
+    """Open a prebuilt index, returning None if it is missing or outdated."""
+    try:
+        return SearchIndex(path)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def search(index: SearchIndex | MemorySearchIndex, query: str, limit: int = 10) -> list[dict]:
+    """Return the top ``limit`` documents for query, best first, with scores."""
+    n_docs = index.doc_count
+    avg_length = index.avg_length or 1.0
+
+    scores = {}
+    for term in set(tokenize(query)):
+        term_postings = index.postings(term)
+        if not term_postings:
+            continue
+        df = len(term_postings)
+        idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        for doc_id, tf, length in term_postings:
+            norm = K1 * (1 - B + B * length / avg_length)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+
+    top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+    return [{**index.doc(doc_id), "score": round(score, 4)} for doc_id, score in top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search Claude Code plugins")
+    parser.add_argument("query", nargs="?", help="Search terms")
+    parser.add_argument("--limit", "-n", type=int, default=10, help="Maximum results")
+    parser.add_argument("--index", default=str(SEARCH_INDEX_PATH), help="Path to the search index")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--build", action="store_true", help="Rebuild the index from plugins/")
+
+    args = parser.parse_args()
+    index_path = Path(args.index)
+
+    if args.build:
+        index = build_search_index(scan_plugins(PLUGINS_DIR))
+        write_search_index(index, index_path)
+        print(f"Indexed {len(index['docs'])} plugins, {len(index['postings'])} terms: {index_path}")
+        if not args.query:
+            return
+
+    if not args.query:
+        print("Error: Specify a search query or use --build")
+        sys.exit(1)
+
+    index = open_search_index(index_path)
+    if index is None:
+        print(f"Search index not found at {index_path}, building from plugins/", file=sys.stderr)
+        results = search(MemorySearchIndex(build_search_index(scan_plugins(PLUGINS_DIR))), args.query, args.limit)
+    else:
+        with index:
+            results = search(index, args.query, args.limit)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    if not results:
+        print("No matching plugins")
+        return
+
+    for result in results:
+        print(f"{result['score']:7.3f}  {result['name']} [{result['category']}]")
+        if result["description"]:
+            print(f"         {result['description']}")
+
+
+if __name__ == "__main__":
+    main()
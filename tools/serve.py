@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+Serve the catalog, per-plugin metadata and exported archives over HTTP.
+
+Meant for hosting a marketplace mirror that `/plugin install` and
+`import.py sync` can fetch from:
+
+    GET /catalog.json                 the catalog
+    GET /plugins/{name}.json          one catalog entry, plus its archive's URL and hash
+    GET /{name}-{version}.zip         an archive from export.py
+    GET /{name}-{version}.manifest.json
+
+Every response carries a strong ETag derived from a SHA-256 of its
+content, and conditional requests get 304s. JSON is pre-compressed with
+gzip (and brotli, when the brotli package is installed) once per content
+hash; the compressed bodies are cached on disk under .serve-cache/ and
+survive restarts. Archives support range requests, so interrupted
+downloads resume. Hot responses are kept in an in-memory LRU, and the
+catalog and archives are re-read when they change on disk.
+
+Usage:
+    python serve.py
+    python serve.py --port 8080 --archives ./exported
+    python serve.py --host 0.0.0.0 --cache-size 256 --quiet
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate
+from pathlib import Path
+from urllib.parse import unquote
+
+from blobstore import COPY_CHUNK_SIZE, file_sha256
+from generate_catalog import CATALOG_PATH
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SERVE_CACHE_DIR = Path(__file__).parent.parent / ".serve-cache"
+DEFAULT_ARCHIVES_DIR = Path("./exported")  # export.py's default --output
+DEFAULT_CACHE_MB = 64
+# Larger files are streamed from disk instead of being held in the LRU
+MAX_CACHED_FILE = 8 * 1024 * 1024
+# Smaller bodies are not worth a compressed variant
+MIN_COMPRESS_BYTES = 1024
+KEEPALIVE_TIMEOUT = 15
+MAX_HEADERS = 100
+# Larger request bodies are not read; the connection is closed instead
+MAX_DISCARDED_BODY = 64 * 1024
+
+ARCHIVE_PATTERN = re.compile(r"^/([A-Za-z0-9][A-Za-z0-9._-]*\.(?:zip|manifest\.json))$")
+PLUGIN_PATTERN = re.compile(r"^/plugins/([A-Za-z0-9][A-Za-z0-9_-]*)\.json$")
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+REASONS = {
+    200: "OK", 206: "Partial Content", 304: "Not Modified", 400: "Bad Request",
+    404: "Not Found", 405: "Method Not Allowed", 416: "Range Not Satisfiable",
+    500: "Internal Server Error",
+}
+
+
+class LRUCache:
+    """Byte-bounded least-recently-used cache of response bodies."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> bytes | None:
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        self.entries[key] = value
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+
+@dataclass
+class Resource:
+    """One servable representation: in memory (body) or on disk (path)."""
+    etag: str
+    content_type: str
+    size: int
+    body: bytes | None = None
+    path: Path | None = None
+    encoding: str | None = None
+    cache_control: str = "no-cache"
+    last_modified: float | None = None
+
+
+def quoted(digest: str, suffix: str = "") -> str:
+    return f'"{digest}{suffix}"'
+
+
+class Mirror:
+    """The catalog, metadata and archives being served, refreshed from disk on change."""
+
+    def __init__(self, catalog_path: Path, archives_dir: Path, cache_dir: Path, cache_bytes: int):
+        self.catalog_path = catalog_path
+        self.archives_dir = archives_dir
+        self.cache_dir = cache_dir
+        self.cache = LRUCache(cache_bytes)
+        self.catalog_stat = None
+        self.catalog_body = b""
+        self.catalog_hash = ""
+        self.entries: dict[str, dict] = {}
+        # (path, size, mtime_ns) -> sha256, so archives are hashed once per change
+        self.file_hashes: dict[tuple, str] = {}
+        self.lock = asyncio.Lock()
+
+    async def refresh_catalog(self):
+        try:
+            st = os.stat(self.catalog_path)
+        except FileNotFoundError:
+            self.catalog_stat, self.catalog_body, self.entries = None, b"", {}
+            return
+        signature = (st.st_size, st.st_mtime_ns)
+        if signature == self.catalog_stat:
+            return
+
+        async with self.lock:
+            if signature == self.catalog_stat:
+                return
+            body = await asyncio.to_thread(self.catalog_path.read_bytes)
+            try:
+                catalog = json.loads(body)
+            except json.JSONDecodeError:
+                # Caught mid-write; keep serving the previous version until it settles
+                if self.catalog_stat is not None:
+                    return
+                raise
+            self.catalog_body = body
+            self.catalog_hash = hashlib.sha256(body).hexdigest()
+            self.entries = {entry["name"]: entry for entry in catalog.get("plugins", [])}
+            self.catalog_stat = signature
+            # Compress ahead of the first request for it
+            await self.compressed(body, self.catalog_hash, "gzip")
+            if brotli is not None:
+                await self.compressed(body, self.catalog_hash, "br")
+
+    async def compressed(self, body: bytes, digest: str, encoding: str) -> bytes:
+        """Compressed body for a content hash, from the LRU, the disk cache, or freshly made."""
+        key = ("encoded", digest, encoding)
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+
+        suffix = "br" if encoding == "br" else "gz"
+        path = self.cache_dir / f"{digest}.{suffix}"
+        try:
+            data = await asyncio.to_thread(path.read_bytes)
+        except FileNotFoundError:
+            if encoding == "br":
+                data = await asyncio.to_thread(brotli.compress, body, quality=11)
+            else:
+                data = await asyncio.to_thread(gzip.compress, body, 9, mtime=0)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        self.cache.put(key, data)
+        return data
+
+    async def json_resource(self, body: bytes, digest: str, accept: set[str]) -> Resource:
+        """A JSON body in the best encoding the client accepts."""
+        if len(body) >= MIN_COMPRESS_BYTES:
+            for encoding in ("br", "gzip"):
+                if encoding in accept and (encoding != "br" or brotli is not None):
+                    data = await self.compressed(body, digest, encoding)
+                    if len(data) < len(body):
+                        return Resource(quoted(digest, f"-{encoding}"), "application/json", len(data),
+                                        body=data, encoding=encoding)
+        return Resource(quoted(digest), "application/json", len(body), body=body)
+
+    async def file_hash(self, path: Path, st: os.stat_result) -> str:
+        key = (path, st.st_size, st.st_mtime_ns)
+        digest = self.file_hashes.get(key)
+        if digest is None:
+            digest = await asyncio.to_thread(file_sha256, path)
+            self.file_hashes[key] = digest
+        return digest
+
+    def archive_info(self, entry: dict) -> dict | None:
+        """URL, size and hash of an entry's exported archive, if present."""
+        name = f"{entry['name']}-{entry.get('version', '1.0.0')}"
+        manifest_path = self.archives_dir / f"{name}.manifest.json"
+        zip_path = self.archives_dir / f"{name}.zip"
+        try:
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+            size = zip_path.stat().st_size
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return {"url": f"/{name}.zip", "size": size, "sha256": manifest.get("archive_sha256")}
+
+    async def resolve(self, path: str, accept: set[str]) -> Resource | None:
+        if path == "/catalog.json":
+            await self.refresh_catalog()
+            if self.catalog_stat is None:
+                return None
+            return await self.json_resource(self.catalog_body, self.catalog_hash, accept)
+
+        match = PLUGIN_PATTERN.match(path)
+        if match:
+            await self.refresh_catalog()
+            entry = self.entries.get(match.group(1))
+            if entry is None:
+                return None
+            archive = self.archive_info(entry)
+            key = ("plugin", self.catalog_hash, match.group(1), json.dumps(archive))
+            body = self.cache.get(key)
+            if body is None:
+                body = json.dumps({**entry, "archive": archive}, indent=2).encode()
+                self.cache.put(key, body)
+            return await self.json_resource(body, hashlib.sha256(body).hexdigest(), accept)
+
+        match = ARCHIVE_PATTERN.match(path)
+        if match:
+            file_path = self.archives_dir / match.group(1)
+            try:
+                st = os.stat(file_path)
+            except FileNotFoundError:
+                return None
+            digest = await self.file_hash(file_path, st)
+            if file_path.suffix == ".json":
+                key = ("file", digest)
+                body = self.cache.get(key)
+                if body is None:
+                    body = await asyncio.to_thread(file_path.read_bytes)
+                    self.cache.put(key, body)
+                return await self.json_resource(body, digest, accept)
+
+            resource = Resource(quoted(digest), "application/zip", st.st_size,
+                                cache_control="public, max-age=300", last_modified=st.st_mtime)
+            if st.st_size <= MAX_CACHED_FILE:
+                key = ("file", digest)
+                resource.body = self.cache.get(key)
+                if resource.body is None:
+                    resource.body = await asyncio.to_thread(file_path.read_bytes)
+                    self.cache.put(key, resource.body)
+            else:
+                resource.path = file_path
+            return resource
+
+        return None
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Content codings with a non-zero q-value in an Accept-Encoding header."""
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match comparison (weak, per RFC 9110)."""
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single-range Range header into (start, end inclusive).
+
+    Returns None to ignore the header (multiple or malformed ranges get
+    the full body) and raises ValueError if the range is unsatisfiable.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("range outside the file")
+    return start, end
+
+
+async def read_request(reader: asyncio.StreamReader):
+    """Read a request line and headers; returns None at the end of the connection."""
+    line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+    if not line:
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise ValueError("malformed request line")
+
+    headers = {}
+    for _ in range(MAX_HEADERS):
+        header = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+        if header in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = header.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise ValueError("too many headers")
+    return parts[0], parts[1], parts[2], headers
+
+
+async def discard_body(reader: asyncio.StreamReader, headers: dict) -> bool:
+    """
+    Skip a request's body so the next request on the connection parses.
+
+    Returns False if the body was left unread (chunked, or larger than
+    MAX_DISCARDED_BODY) and the connection cannot be reused. Raises
+    ValueError for an invalid Content-Length.
+    """
+    if "transfer-encoding" in headers:
+        return False
+    value = headers.get("content-length")
+    if value is None:
+        return True
+    if not value.isdigit():
+        raise ValueError("invalid Content-Length")
+    length = int(value)
+    if length > MAX_DISCARDED_BODY:
+        return False
+    await asyncio.wait_for(reader.readexactly(length), KEEPALIVE_TIMEOUT)
+    return True
+
+
+class Server:
+    def __init__(self, mirror: Mirror, quiet: bool = False):
+        self.mirror = mirror
+        self.quiet = quiet
+
+    def log(self, peer, method: str, target: str, status: int, length: int):
+        if not self.quiet:
+            print(f'{peer[0] if peer else "-"} "{method} {target}" {status} {length}', flush=True)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info("peername")
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                    # No route reads a body, but it must not be parsed as the next request
+                    reusable = request is None or await discard_body(reader, request[3])
+                except (ValueError, asyncio.LimitOverrunError):
+                    await self.send(writer, 400, {}, b"Bad request\n", close=True)
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+                connection = headers.get("connection", "").lower()
+                close = (connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive")
+                         or not reusable)
+                status, length = await self.respond(writer, method, target, headers, close)
+                self.log(peer, method, target, status, length)
+                if close:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def respond(self, writer, method: str, target: str, headers: dict, close: bool) -> tuple[int, int]:
+        if method not in ("GET", "HEAD"):
+            await self.send(writer, 405, {"Allow": "GET, HEAD"}, b"Method not allowed\n", close=close)
+            return 405, 0
+
+        path = unquote(target.split("?", 1)[0])
+        try:
+            resource = await self.mirror.resolve(path, accepted_encodings(headers.get("accept-encoding", "")))
+        except (OSError, ValueError) as e:
+            await self.send(writer, 500, {}, f"Error: {e}\n".encode(), close=close)
+            return 500, 0
+        if resource is None:
+            await self.send(writer, 404, {}, b"Not found\n", close=close)
+            return 404, 0
+
+        response_headers = {
+            "Content-Type": resource.content_type,
+            "ETag": resource.etag,
+            "Cache-Control": resource.cache_control,
+        }
+        if resource.content_type == "application/json":
+            response_headers["Vary"] = "Accept-Encoding"
+        else:
+            response_headers["Accept-Ranges"] = "bytes"
+        if resource.encoding:
+            response_headers["Content-Encoding"] = resource.encoding
+        if resource.last_modified:
+            response_headers["Last-Modified"] = formatdate(resource.last_modified, usegmt=True)
+
+        if etag_matches(headers.get("if-none-match", ""), resource.etag):
+            await self.send(writer, 304, response_headers, None, close=close)
+            return 304, 0
+
+        start, end = 0, resource.size - 1
+        status = 200
+        range_header = headers.get("range")
+        if range_header and resource.encoding is None and "Accept-Ranges" in response_headers:
+            if_range = headers.get("if-range")
+            if if_range is None or if_range.strip() == resource.etag:
+                try:
+                    requested = parse_range(range_header, resource.size)
+                except ValueError:
+                    await self.send(writer, 416, {"Content-Range": f"bytes */{resource.size}"}, b"", close=close)
+                    return 416, 0
+                if requested:
+                    start, end = requested
+                    status = 206
+                    response_headers["Content-Range"] = f"bytes {start}-{end}/{resource.size}"
+
+        length = end - start + 1 if resource.size else 0
+        if resource.body is not None:
+            await self.send(writer, status, response_headers, resource.body[start:end + 1],
+                            close=close, head=method == "HEAD")
+        else:
+            response_headers["Content-Length"] = str(length)
+            await self.send(writer, status, response_headers, None, close=close, head=True)
+            if method == "GET" and length:
+                await self.send_file(writer, resource.path, start, length)
+        return status, length if method == "GET" else 0
+
+    async def send(self, writer, status: int, headers: dict, body: bytes | None,
+                   close: bool = False, head: bool = False):
+        lines = [f"HTTP/1.1 {status} {REASONS[status]}", f"Date: {formatdate(usegmt=True)}"]
+        if body is not None and "Content-Length" not in headers:
+            headers = {**headers, "Content-Length": str(len(body))}
+        if close:
+            headers = {**headers, "Connection": "close"}
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if body and not head:
+            writer.write(body)
+        await writer.drain()
+
+    async def send_file(self, writer, path: Path, offset: int, count: int):
+        loop = asyncio.get_running_loop()
+        with open(path, "rb") as f:
+            try:
+                await loop.sendfile(writer.transport, f, offset, count)
+            except NotImplementedError:
+                f.seek(offset)
+                while count > 0:
+                    chunk = f.read(min(COPY_CHUNK_SIZE, count))
+                    if not chunk:
+                        break
+                    writer.write(chunk)
+                    await writer.drain()
+                    count -= len(chunk)
+
+
+async def serve(host: str, port: int, mirror: Mirror, quiet: bool):
+    await mirror.refresh_catalog()
+    server = await asyncio.start_server(Server(mirror, quiet).handle, host, port, backlog=1024)
+    addresses = ", ".join(f"http://{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+    print(f"Serving {mirror.catalog_path} and archives from {mirror.archives_dir} on {addresses}")
+    if brotli is None:
+        print("Note: brotli is not installed; serving gzip only")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the plugin catalog and archives over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", "-p", type=int, default=8000, help="Port to listen on (default: 8000)")
+    parser.add_argument("--catalog", default=str(CATALOG_PATH), help="Catalog file to serve")
+    parser.add_argument("--archives", default=str(DEFAULT_ARCHIVES_DIR),
+                        help="Directory of export.py archives (default: ./exported)")
+    parser.add_argument("--cache-dir", default=str(SERVE_CACHE_DIR),
+                        help=f"Where compressed responses are kept (default: {SERVE_CACHE_DIR.name})")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_MB, metavar="MB",
+                        help=f"In-memory cache size (default: {DEFAULT_CACHE_MB} MB)")
+    parser.add_argument("--quiet", "-q", action="store_true", help="Do not log requests")
+
+    args = parser.parse_args()
+
+    mirror = Mirror(Path(args.catalog), Path(args.archives), Path(args.cache_dir), args.cache_size * 1024 * 1024)
+    try:
+        asyncio.run(serve(args.host, args.port, mirror, args.quiet))
+    except KeyboardInterrupt:
+        print("\nStopped")
+
+
+if __name__ == "__main__":
+    main()
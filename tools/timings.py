@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Per-phase timings, I/O counters and cProfile output for the tools.
+
+Every tool accepts the same two flags, added by add_timing_arguments():
+
+    --timings [text|json]   Print where the time went, to stderr
+    --profile [PATH]        Run under cProfile and dump the stats to PATH
+
+Library code marks its phases with ``phase()`` and bumps counters with
+``count()``. Both are no-ops unless a tool was started with one of the
+flags, so they are cheap to leave in hot paths. Phase times are
+exclusive: time spent in a nested phase is not counted again in the
+phase around it, so the phases add up to the instrumented time. With
+several worker threads, phase times are summed over the threads and can
+exceed the wall time.
+
+Usage (as a library):
+    from timings import add_timing_arguments, count, phase, start_timings
+
+    with phase("json"):
+        data = json.loads(text)
+    count("files_read")
+
+    add_timing_arguments(parser)
+    args = parser.parse_args()
+    start_timings(args, "validate")
+"""
+
+import atexit
+import json
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+PROFILE_TOP = 25
+
+_enabled = False
+_lock = threading.Lock()
+_local = threading.local()
+_phases: dict[str, list] = {}
+_counters: dict[str, int] = {}
+_NULL = nullcontext()
+
+
+class _Phase:
+    """Times one entry into a phase, excluding nested phases."""
+
+    __slots__ = ("name", "start", "nested")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.nested = 0.0
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stack = _local.stack
+        stack.pop()
+        if stack:
+            stack[-1].nested += elapsed
+        with _lock:
+            entry = _phases.get(self.name)
+            if entry is None:
+                entry = _phases[self.name] = [0.0, 0]
+            entry[0] += elapsed - self.nested
+            entry[1] += 1
+        return False
+
+
+def phase(name: str):
+    """Context manager attributing the enclosed time to ``name``."""
+    return _Phase(name) if _enabled else _NULL
+
+
+def count(name: str, n: int = 1):
+    """Add ``n`` to a counter such as files_read or bytes_written."""
+    if _enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+
+def _proc_io() -> dict:
+    """Read and write syscall and byte counts from /proc (Linux only)."""
+    try:
+        with open("/proc/self/io", "r") as f:
+            return {key: int(value) for key, value in (line.split(": ") for line in f)}
+    except (OSError, ValueError):
+        return {}
+
+
+def _rusage() -> dict:
+    try:
+        import resource
+    except ImportError:
+        return {}
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return {
+        "user_s": usage.ru_utime,
+        "system_s": usage.ru_stime,
+        "max_rss_kb": usage.ru_maxrss,
+        "voluntary_switches": usage.ru_nvcsw,
+        "involuntary_switches": usage.ru_nivcsw,
+    }
+
+
+def add_timing_arguments(parser):
+    """Add the shared --timings and --profile flags to a tool's parser."""
+    parser.add_argument("--timings", nargs="?", const="text", choices=["text", "json"],
+                        help="Print a per-phase time breakdown and I/O counters to stderr")
+    parser.add_argument("--profile", nargs="?", const="", metavar="PATH",
+                        help="Run under cProfile and write the stats to PATH (default: <tool>.prof)")
+
+
+def report(tool: str, wall: float, io_before: dict, io_after: dict) -> dict:
+    """Build the structured timing report."""
+    with _lock:
+        phases = {
+            name: {"seconds": round(seconds, 6), "calls": calls}
+            for name, (seconds, calls) in sorted(_phases.items(), key=lambda item: -item[1][0])
+        }
+        counters = dict(sorted(_counters.items()))
+
+    io = {key: io_after[key] - io_before.get(key, 0) for key in io_after}
+    return {
+        "tool": tool,
+        "wall_s": round(wall, 6),
+        "phases": phases,
+        "other_s": round(max(wall - sum(p["seconds"] for p in phases.values()), 0.0), 6),
+        "counters": counters,
+        "io": {
+            "read_syscalls": io.get("syscr"),
+            "write_syscalls": io.get("syscw"),
+            "bytes_read": io.get("rchar"),
+            "bytes_written": io.get("wchar"),
+            "disk_bytes_read": io.get("read_bytes"),
+            "disk_bytes_written": io.get("write_bytes"),
+        } if io else {},
+        "rusage": _rusage(),
+    }
+
+
+def print_report(data: dict, out=None):
+    out = out or sys.stderr
+    wall = data["wall_s"] or 1e-9
+    print(f"\nTimings for {data['tool']}: {data['wall_s']:.3f}s wall", file=out)
+    for name, entry in data["phases"].items():
+        print(f"  {name:<16} {entry['seconds']:9.3f}s  {entry['seconds'] / wall * 100:5.1f}%  "
+              f"{entry['calls']:>8} calls", file=out)
+    print(f"  {'(other)':<16} {data['other_s']:9.3f}s  {data['other_s'] / wall * 100:5.1f}%", file=out)
+
+    if data["counters"]:
+        print("Counters:", file=out)
+        for name, value in data["counters"].items():
+            print(f"  {name:<16} {value:>12}", file=out)
+
+    io = {key: value for key, value in data["io"].items() if value is not None}
+    if io:
+        print("I/O:", file=out)
+        for name, value in io.items():
+            print(f"  {name:<20} {value:>12}", file=out)
+
+    if data["rusage"]:
+        usage = data["rusage"]
+        print(f"CPU: {usage['user_s']:.3f}s user, {usage['system_s']:.3f}s system; "
+              f"peak RSS {usage['max_rss_kb'] / 1024:.1f} MB", file=out)
+
+
+def start_timings(args, tool: str):
+    """
+    Enable timings and profiling if the parsed ``args`` ask for it.
+
+    Call right after parse_args(). The report is printed when the process
+    exits, including through sys.exit(), so tools need no other changes.
+    """
+    global _enabled
+
+    timings = getattr(args, "timings", None)
+    profile_path = getattr(args, "profile", None)
+    if not timings and profile_path is None:
+        return
+
+    # Imported here so tools that run without the flags do not pay for them
+    import cProfile
+    import pstats
+
+    _enabled = True
+    profiler = cProfile.Profile() if profile_path is not None else None
+    io_before = _proc_io()
+    start = time.perf_counter()
+
+    def finish():
+        global _enabled
+        if profiler:
+            profiler.disable()
+        wall = time.perf_counter() - start
+        _enabled = False
+
+        if timings:
+            data = report(tool, wall, io_before, _proc_io())
+            if timings == "json":
+                print(json.dumps(data, indent=2), file=sys.stderr)
+            else:
+                print_report(data)
+
+        if profiler:
+            path = Path(profile_path or f"{tool}.prof")
+            profiler.dump_stats(path)
+            print(f"\nProfile written to {path} (main thread only); top {PROFILE_TOP} by cumulative time:",
+                  file=sys.stderr)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(PROFILE_TOP)
+
+    atexit.register(finish)
+    if profiler:
+        profiler.enable()
@@ -6,18 +6,41 @@ Usage:
     python validate.py my-plugin
     python validate.py --all
     python validate.py my-plugin --check-conflicts
+    python validate.py --all --check-conflicts
+    python validate.py --all --cache
+    python validate.py --all --jobs 8
+    python validate.py my-plugin --profile-hooks --runs 10 --hook-budget 100
+    python validate.py --archive submissions/*.zip --check-conflicts --jobs 8
     python validate.py my-plugin --mark-verified --reviewer "John Doe"
 """
 
 import argparse
+import hashlib
 import json
+import os
 import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
-PLUGINS_DIR = Path(__file__).parent.parent / "plugins"
+from archive_reader import ARCHIVE_ERRORS, open_archive, scan_archive
+from frontmatter import FrontmatterError, read_frontmatter
+from hook_profiler import (
+    DEFAULT_BUDGET_MS, DEFAULT_RUNS, HOT_EVENTS, is_wildcard_matcher, iter_hook_groups, load_hook_profiles,
+    plugin_profile_summary, profile_plugin_hooks, save_hook_profiles,
+)
+from resolver import DependencyGraph, parse_range
+from scanner import PLUGINS_DIR, PluginInfo, scan_plugin, scan_plugins
+from timings import add_timing_arguments, count, phase, start_timings
+
 VERIFIED_FILE = Path(__file__).parent.parent / ".verified.json"
+CACHE_FILE = Path(__file__).parent.parent / ".validate-cache.json"
+
+# Modules whose changes invalidate cached validation results
+RULE_FILES = [Path(__file__), Path(__file__).parent / "frontmatter.py"]
 
 # Validation rules
 NAME_PATTERN = re.compile(r"^[a-z][a-z0-9-]*$")
@@ -35,25 +58,157 @@ class ValidationError:
         return f"[{self.severity.upper()}] {self.path}: {self.message}"
 
 
-def validate_plugin_json(plugin_dir: Path) -> list[ValidationError]:
+def _file_digest(path: Path) -> str:
+    with phase("hash"):
+        data = path.read_bytes()
+        count("files_read")
+        count("bytes_read", len(data))
+        return hashlib.sha256(data).hexdigest()
+
+
+class ValidationCache:
+    """
+    Persistent per-file validation results.
+
+    Entries are keyed on file path and reused while the file's mtime and
+    size are unchanged. If either differs, the content hash decides whether
+    the file really changed. Results are discarded wholesale when the
+    validation rules (this module or the frontmatter parser) change.
+    """
+
+    # Files modified this close to the last save may change again within
+    # the same mtime tick, so their stat data is not trusted on its own.
+    RACY_WINDOW_NS = 2_000_000_000
+
+    def __init__(self, path: Path = CACHE_FILE):
+        self.path = path
+        self.rules = hashlib.sha256(
+            b"".join(path.read_bytes() for path in RULE_FILES)
+        ).hexdigest()
+        self.entries = {}
+        self.saved_ns = 0
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        if data.get("rules") == self.rules:
+            self.entries = data.get("files", {})
+            self.saved_ns = data.get("saved_ns", 0)
+
+    def check(self, file_path: Path, validator) -> list[ValidationError]:
+        """Return cached results for file_path, or run validator() and store them."""
+        key = str(file_path)
+        with self._lock:
+            self.seen.add(key)
+
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            # Let the validator report the missing file; nothing to cache
+            with self._lock:
+                self.entries.pop(key, None)
+            return validator()
+
+        entry = self.entries.get(key)
+        digest = None
+
+        if entry is not None:
+            unchanged = (
+                entry["mtime_ns"] == st.st_mtime_ns
+                and entry["size"] == st.st_size
+                and st.st_mtime_ns < self.saved_ns - self.RACY_WINDOW_NS
+            )
+            if not unchanged:
+                digest = _file_digest(file_path)
+                unchanged = entry["sha256"] == digest
+            if unchanged:
+                with self._lock:
+                    self.hits += 1
+                    entry["mtime_ns"] = st.st_mtime_ns
+                    entry["size"] = st.st_size
+                return [ValidationError(*e) for e in entry["errors"]]
+
+        # Hash before validating, so a save during validation cannot pair
+        # the new content's hash with the old content's results
+        digest = digest or _file_digest(file_path)
+        errors = validator()
+        with self._lock:
+            self.misses += 1
+        try:
+            after = os.stat(file_path)
+        except FileNotFoundError:
+            after = None
+        if after is None or (after.st_mtime_ns, after.st_size) != (st.st_mtime_ns, st.st_size):
+            # Changed while being validated; check it again next run
+            with self._lock:
+                self.entries.pop(key, None)
+            return errors
+
+        new_entry = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": digest,
+            "errors": [[e.path, e.message, e.severity] for e in errors]
+        }
+        with self._lock:
+            self.entries[key] = new_entry
+        return errors
+
+    def prune(self, scopes: list[Path]):
+        """Evict entries under the given directories that were not checked this run."""
+        prefixes = tuple(str(scope) + os.sep for scope in scopes)
+        stale = [
+            key for key in self.entries
+            if key not in self.seen and key.startswith(prefixes)
+        ]
+        for key in stale:
+            del self.entries[key]
+
+    def save(self):
+        """Write the cache atomically."""
+        data = {
+            "rules": self.rules,
+            "saved_ns": time.time_ns(),
+            "files": self.entries
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+def validate_plugin_json(plugin: PluginInfo) -> list[ValidationError]:
     """Validate plugin.json structure."""
     errors = []
-    plugin_json_path = plugin_dir / ".claude-plugin" / "plugin.json"
+    plugin_json_path = plugin.plugin_json_path
 
-    if not plugin_json_path.exists():
+    if not plugin.has_plugin_json:
         errors.append(ValidationError(
             str(plugin_json_path),
             "plugin.json not found"
         ))
         return errors
 
-    try:
-        with open(plugin_json_path, "r") as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
+    if plugin.plugin_json_error:
         errors.append(ValidationError(
             str(plugin_json_path),
-            f"Invalid JSON: {e}"
+            f"Invalid JSON: {plugin.plugin_json_error}"
+        ))
+        return errors
+
+    data = plugin.plugin_json
+
+    if not isinstance(data, dict):
+        errors.append(ValidationError(
+            str(plugin_json_path),
+            "plugin.json must be a JSON object"
         ))
         return errors
 
@@ -63,7 +218,7 @@ def validate_plugin_json(plugin_dir: Path) -> list[ValidationError]:
             str(plugin_json_path),
             "Missing required field: name"
         ))
-    elif not NAME_PATTERN.match(data["name"]):
+    elif not isinstance(data["name"], str) or not NAME_PATTERN.match(data["name"]):
         errors.append(ValidationError(
             str(plugin_json_path),
             f"Invalid name format: '{data['name']}'. Must be lowercase letters, numbers, hyphens only."
@@ -102,6 +257,14 @@ def validate_plugin_json(plugin_dir: Path) -> list[ValidationError]:
                         str(plugin_json_path),
                         f"Dependency version must be a string: '{dep_name}'"
                     ))
+                    continue
+                try:
+                    parse_range(version_spec)
+                except ValueError as e:
+                    errors.append(ValidationError(
+                        str(plugin_json_path),
+                        f"Invalid version range for '{dep_name}': {e}"
+                    ))
 
     # Validate paths exist
     for path_field in ["commands", "agents", "skills", "hooks", "mcpServers"]:
@@ -109,7 +272,7 @@ def validate_plugin_json(plugin_dir: Path) -> list[ValidationError]:
             paths = data[path_field] if isinstance(data[path_field], list) else [data[path_field]]
             for path in paths:
                 if isinstance(path, str) and path.startswith("./"):
-                    full_path = plugin_dir / path[2:]
+                    full_path = plugin.path / path[2:]
                     if not full_path.exists():
                         errors.append(ValidationError(
                             str(plugin_json_path),
@@ -125,42 +288,37 @@ def validate_skill(skill_dir: Path) -> list[ValidationError]:
     errors = []
     skill_md = skill_dir / "SKILL.md"
 
-    if not skill_md.exists():
+    try:
+        frontmatter = read_frontmatter(skill_md)
+    except FileNotFoundError:
         errors.append(ValidationError(
             str(skill_dir),
             "SKILL.md not found"
         ))
         return errors
-
-    content = skill_md.read_text()
-
-    # Check for frontmatter
-    if not content.startswith("---"):
+    except FrontmatterError as e:
         errors.append(ValidationError(
             str(skill_md),
-            "Missing YAML frontmatter"
+            str(e)
         ))
         return errors
 
-    # Parse frontmatter
-    parts = content.split("---", 2)
-    if len(parts) < 3:
+    # Check for frontmatter
+    if frontmatter is None:
         errors.append(ValidationError(
             str(skill_md),
-            "Invalid frontmatter format"
+            "Missing YAML frontmatter"
         ))
         return errors
 
-    frontmatter = parts[1].strip()
-
     # Check required fields
-    if "name:" not in frontmatter:
+    if not frontmatter.get("name"):
         errors.append(ValidationError(
             str(skill_md),
             "Missing required frontmatter field: name"
         ))
 
-    if "description:" not in frontmatter:
+    if not frontmatter.get("description"):
         errors.append(ValidationError(
             str(skill_md),
             "Missing required frontmatter field: description"
@@ -173,40 +331,36 @@ def validate_agent(agent_path: Path) -> list[ValidationError]:
     """Validate an agent file."""
     errors = []
 
-    if not agent_path.exists():
+    try:
+        frontmatter = read_frontmatter(agent_path)
+    except FileNotFoundError:
         errors.append(ValidationError(
             str(agent_path),
             "Agent file not found"
         ))
         return errors
-
-    content = agent_path.read_text()
-
-    # Check for frontmatter
-    if not content.startswith("---"):
+    except FrontmatterError as e:
         errors.append(ValidationError(
             str(agent_path),
-            "Missing YAML frontmatter"
+            str(e)
         ))
         return errors
 
-    parts = content.split("---", 2)
-    if len(parts) < 3:
+    # Check for frontmatter
+    if frontmatter is None:
         errors.append(ValidationError(
             str(agent_path),
-            "Invalid frontmatter format"
+            "Missing YAML frontmatter"
         ))
         return errors
 
-    frontmatter = parts[1].strip()
-
-    if "name:" not in frontmatter:
+    if not frontmatter.get("name"):
         errors.append(ValidationError(
             str(agent_path),
             "Missing required frontmatter field: name"
         ))
 
-    if "description:" not in frontmatter:
+    if not frontmatter.get("description"):
         errors.append(ValidationError(
             str(agent_path),
             "Missing required frontmatter field: description"
@@ -219,34 +373,30 @@ def validate_command(command_path: Path) -> list[ValidationError]:
     """Validate a command file."""
     errors = []
 
-    if not command_path.exists():
+    try:
+        frontmatter = read_frontmatter(command_path)
+    except FileNotFoundError:
         errors.append(ValidationError(
             str(command_path),
             "Command file not found"
         ))
         return errors
-
-    content = command_path.read_text()
-
-    # Check for frontmatter (required for commands)
-    if not content.startswith("---"):
+    except FrontmatterError as e:
         errors.append(ValidationError(
             str(command_path),
-            "Missing YAML frontmatter"
+            str(e)
         ))
         return errors
 
-    parts = content.split("---", 2)
-    if len(parts) < 3:
+    # Check for frontmatter (required for commands)
+    if frontmatter is None:
         errors.append(ValidationError(
             str(command_path),
-            "Invalid frontmatter format"
+            "Missing YAML frontmatter"
         ))
         return errors
 
-    frontmatter = parts[1].strip()
-
-    if "description:" not in frontmatter:
+    if not frontmatter.get("description"):
         errors.append(ValidationError(
             str(command_path),
             "Missing required frontmatter field: description",
@@ -256,20 +406,27 @@ def validate_command(command_path: Path) -> list[ValidationError]:
     return errors
 
 
-def validate_hooks(hooks_path: Path) -> list[ValidationError]:
+def validate_hooks(plugin: PluginInfo) -> list[ValidationError]:
     """Validate hooks.json."""
     errors = []
+    hooks_path = plugin.hooks_path
 
-    if not hooks_path.exists():
+    if hooks_path is None:
         return errors  # Hooks are optional
 
-    try:
-        with open(hooks_path, "r") as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
+    if plugin.hooks_error:
+        errors.append(ValidationError(
+            str(hooks_path),
+            f"Invalid JSON: {plugin.hooks_error}"
+        ))
+        return errors
+
+    data = plugin.hooks
+
+    if not isinstance(data, dict) or not isinstance(data.get("hooks", {}), dict):
         errors.append(ValidationError(
             str(hooks_path),
-            f"Invalid JSON: {e}"
+            "hooks.json must be an object with a \"hooks\" object"
         ))
         return errors
 
@@ -280,92 +437,150 @@ def validate_hooks(hooks_path: Path) -> list[ValidationError]:
     ]
 
     hooks = data.get("hooks", {})
-    for event_name in hooks:
+    for event_name, groups in hooks.items():
         if event_name not in valid_events:
             errors.append(ValidationError(
                 str(hooks_path),
                 f"Unknown hook event: {event_name}",
                 "warning"
             ))
+        if not isinstance(groups, list):
+            errors.append(ValidationError(
+                str(hooks_path),
+                f"{event_name} must be a list of hook groups"
+            ))
+            continue
+        for group in groups:
+            if not isinstance(group, dict) or not isinstance(group.get("hooks", []), list):
+                errors.append(ValidationError(
+                    str(hooks_path),
+                    f"{event_name} hook group must be an object with a \"hooks\" list"
+                ))
+
+    # A wildcard hook on a hot event runs around every tool call; without a
+    # timeout a hung script stalls each one for the 60 second default.
+    for event_name, matcher, group_hooks in iter_hook_groups(data):
+        if event_name not in HOT_EVENTS or not is_wildcard_matcher(matcher):
+            continue
+        for hook in group_hooks:
+            if not isinstance(hook.get("timeout"), (int, float)):
+                errors.append(ValidationError(
+                    str(hooks_path),
+                    f"{event_name} hook with wildcard matcher must declare a timeout: "
+                    f"{hook.get('command', hook.get('type', 'hook'))}"
+                ))
 
     return errors
 
 
-def check_conflicts(plugin_name: str) -> list[ValidationError]:
+def build_name_index(plugins: list[PluginInfo]) -> dict[str, dict[str, list[str]]]:
+    """Map each command, skill and agent name to the plugins that define it."""
+    index = {"command": {}, "skill": {}, "agent": {}}
+
+    for plugin in plugins:
+        for kind, names in (
+            ("command", plugin.command_names),
+            ("skill", plugin.skill_names),
+            ("agent", plugin.agent_names),
+        ):
+            for name in names:
+                index[kind].setdefault(name, []).append(plugin.name)
+
+    return index
+
+
+def check_dependencies(plugins: list[PluginInfo]) -> dict[str, list[ValidationError]]:
+    """
+    Check dependencies across the whole registry in one pass.
+
+    Returns errors keyed by plugin directory name for missing or
+    unsatisfied dependencies and dependency cycles. Malformed names and
+    ranges are left to validate_plugin_json.
+
+    >>> check_dependencies([
+    ...     PluginInfo("a", Path("a"), plugin_json={"name": "a", "dependencies": {"b": {"version": "1"}}}),
+    ...     PluginInfo("b", Path("b"), plugin_json={"name": "b", "version": "1.0.0"}),
+    ...     PluginInfo("c", Path("c"), plugin_json={"name": ["c"]}),
+    ... ])
+    {}
+    """
+    with_json = [p for p in plugins if isinstance(p.plugin_json, dict)]
+    dir_names = {}
+    for plugin in with_json:
+        name = plugin.plugin_json.get("name", plugin.name)
+        if isinstance(name, str):
+            dir_names[name] = plugin
+    graph = DependencyGraph(p.plugin_json for p in with_json)
+
+    errors = {}
+    for name, dependency, message in graph.check():
+        plugin = dir_names.get(name)
+        if plugin is None:
+            continue
+        if dependency is not None:
+            spec = graph.requirements[name][dependency]
+            if not isinstance(spec, str):
+                continue
+            if dependency in graph.versions:
+                try:
+                    parse_range(spec)
+                except ValueError:
+                    continue
+        errors.setdefault(plugin.name, []).append(ValidationError(str(plugin.plugin_json_path), message))
+    return errors
+
+
+def check_conflicts(plugin_name: str, name_index: dict | None = None,
+                    plugin: PluginInfo | None = None) -> list[ValidationError]:
     """Check for naming conflicts with other plugins."""
     errors = []
-    plugin_dir = PLUGINS_DIR / plugin_name
+    if plugin is None:
+        plugin = scan_plugin(PLUGINS_DIR / plugin_name)
 
-    if not plugin_dir.exists():
+    if plugin is None:
         return errors
 
-    # Collect this plugin's names
-    commands = set()
-    skills = set()
-    agents = set()
-
-    cmd_dir = plugin_dir / "commands"
-    if cmd_dir.exists():
-        commands = {f.stem for f in cmd_dir.glob("*.md")}
-
-    skills_dir = plugin_dir / "skills"
-    if skills_dir.exists():
-        skills = {d.name for d in skills_dir.iterdir() if d.is_dir() and (d / "SKILL.md").exists()}
-
-    agents_dir = plugin_dir / "agents"
-    if agents_dir.exists():
-        agents = {f.stem for f in agents_dir.glob("*.md")}
-
-    # Check against other plugins
-    for other_dir in PLUGINS_DIR.iterdir():
-        if other_dir.name == plugin_name or not other_dir.is_dir():
-            continue
-
-        # Check commands
-        other_cmd_dir = other_dir / "commands"
-        if other_cmd_dir.exists():
-            other_commands = {f.stem for f in other_cmd_dir.glob("*.md")}
-            conflicts = commands & other_commands
-            for cmd in conflicts:
-                errors.append(ValidationError(
-                    str(cmd_dir),
-                    f"Command '/{cmd}' conflicts with plugin '{other_dir.name}'",
-                    "warning"
-                ))
+    if name_index is None:
+        name_index = build_name_index(scan_plugins(PLUGINS_DIR))
 
-        # Check skills
-        other_skills_dir = other_dir / "skills"
-        if other_skills_dir.exists():
-            other_skills = {d.name for d in other_skills_dir.iterdir() if d.is_dir()}
-            conflicts = skills & other_skills
-            for skill in conflicts:
-                errors.append(ValidationError(
-                    str(skills_dir),
-                    f"Skill '{skill}' conflicts with plugin '{other_dir.name}'",
-                    "warning"
-                ))
+    checks = [
+        ("command", "Command", plugin.command_names, plugin.path / "commands"),
+        ("skill", "Skill", plugin.skill_names, plugin.path / "skills"),
+        ("agent", "Agent", plugin.agent_names, plugin.path / "agents"),
+    ]
 
-        # Check agents
-        other_agents_dir = other_dir / "agents"
-        if other_agents_dir.exists():
-            other_agents = {f.stem for f in other_agents_dir.glob("*.md")}
-            conflicts = agents & other_agents
-            for agent in conflicts:
+    for kind, label, names, component_dir in checks:
+        for name in names:
+            display = f"/{name}" if kind == "command" else name
+            for other in name_index[kind].get(name, []):
+                if other == plugin_name:
+                    continue
                 errors.append(ValidationError(
-                    str(agents_dir),
-                    f"Agent '{agent}' conflicts with plugin '{other_dir.name}'",
+                    str(component_dir),
+                    f"{label} '{display}' conflicts with plugin '{other}'",
                     "warning"
                 ))
 
     return errors
 
 
-def validate_plugin(plugin_name: str, check_conflict: bool = False) -> list[ValidationError]:
-    """Validate an entire plugin."""
+def validate_plugin(plugin_name: str, check_conflict: bool = False,
+                    plugin: PluginInfo | None = None,
+                    name_index: dict | None = None,
+                    cache: ValidationCache | None = None) -> list[ValidationError]:
+    """Validate an entire plugin.
+
+    Pass an already scanned ``plugin`` and a shared ``name_index`` (see
+    build_name_index) when validating many plugins, so neither the plugin
+    nor the registry is walked again. With a ``cache``, skills, agents and
+    commands whose files are unchanged since the last run are not re-read.
+    """
     errors = []
     plugin_dir = PLUGINS_DIR / plugin_name
+    if plugin is None:
+        plugin = scan_plugin(plugin_dir)
 
-    if not plugin_dir.exists():
+    if plugin is None:
         errors.append(ValidationError(
             str(plugin_dir),
             "Plugin directory not found"
@@ -373,38 +588,147 @@ def validate_plugin(plugin_name: str, check_conflict: bool = False) -> list[Vali
         return errors
 
     # Validate plugin.json
-    errors.extend(validate_plugin_json(plugin_dir))
+    errors.extend(validate_plugin_json(plugin))
+
+    def check(file_path: Path, validator, target: Path) -> list[ValidationError]:
+        if cache is None:
+            return validator(target)
+        return cache.check(file_path, lambda: validator(target))
 
     # Validate skills
-    skills_dir = plugin_dir / "skills"
-    if skills_dir.exists():
-        for skill_dir in skills_dir.iterdir():
-            if skill_dir.is_dir():
-                errors.extend(validate_skill(skill_dir))
+    for skill in plugin.skills:
+        errors.extend(check(skill.path / "SKILL.md", validate_skill, skill.path))
 
     # Validate agents
-    agents_dir = plugin_dir / "agents"
-    if agents_dir.exists():
-        for agent_path in agents_dir.glob("*.md"):
-            errors.extend(validate_agent(agent_path))
+    for agent_path in plugin.agents:
+        errors.extend(check(agent_path, validate_agent, agent_path))
 
     # Validate commands
-    commands_dir = plugin_dir / "commands"
-    if commands_dir.exists():
-        for command_path in commands_dir.glob("*.md"):
-            errors.extend(validate_command(command_path))
+    for command_path in plugin.commands:
+        errors.extend(check(command_path, validate_command, command_path))
 
     # Validate hooks
-    hooks_path = plugin_dir / "hooks" / "hooks.json"
-    errors.extend(validate_hooks(hooks_path))
+    errors.extend(validate_hooks(plugin))
 
     # Check conflicts if requested
     if check_conflict:
-        errors.extend(check_conflicts(plugin_name))
+        with phase("conflicts"):
+            errors.extend(check_conflicts(plugin_name, name_index, plugin))
 
     return errors
 
 
+def validate_archive(archive: Path) -> tuple[PluginInfo | None, list[ValidationError]]:
+    """
+    Validate a plugin archive from its members, without extracting it.
+
+    Runs the plugin.json, frontmatter and hooks checks of validate_plugin()
+    on the archive's contents in memory. Returns the scanned plugin, or None
+    if the archive cannot be read, together with its errors.
+    """
+    try:
+        with open_archive(archive) as zipf:
+            plugin = scan_archive(zipf)
+            return plugin, validate_plugin(plugin.name, plugin=plugin)
+    except (ValueError, *ARCHIVE_ERRORS) as e:
+        return None, [ValidationError(str(archive), f"Invalid archive: {e}")]
+
+
+def validate_archives(archives: list[Path], check_conflict: bool = False,
+                      jobs: int = 1) -> list[tuple[PluginInfo | None, list[ValidationError]]]:
+    """
+    Validate many archives concurrently, then check them against the registry.
+
+    Each archive is validated on its own worker. Dependencies, and naming
+    conflicts when ``check_conflict`` is set, are then checked against the
+    installed plugins together with the whole batch, so two submissions can
+    depend on or conflict with each other. An archive takes the place of an
+    installed plugin with the same name. Results are in ``archives`` order.
+    """
+    if jobs > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(validate_archive, archives))
+    else:
+        results = [validate_archive(archive) for archive in archives]
+
+    submitted = [plugin for plugin, _ in results if plugin is not None]
+    names = {plugin.name for plugin in submitted}
+    registry = [p for p in scan_plugins(PLUGINS_DIR) if p.name not in names] + submitted
+
+    with phase("dependencies"):
+        dependency_errors = check_dependencies(registry)
+    name_index = None
+    if check_conflict:
+        with phase("conflicts"):
+            name_index = build_name_index(registry)
+
+    for plugin, errors in results:
+        if plugin is None:
+            continue
+        errors.extend(dependency_errors.get(plugin.name, []))
+        if check_conflict:
+            with phase("conflicts"):
+                errors.extend(check_conflicts(plugin.name, name_index, plugin))
+    return results
+
+
+def print_errors(errors: list[ValidationError]) -> tuple[int, int]:
+    """Print one plugin's results and return its (errors, warnings) counts."""
+    if not errors:
+        print("  OK - No issues found")
+        return 0, 0
+
+    error_count = 0
+    for error in errors:
+        print(f"  {error}")
+        if error.severity == "error":
+            error_count += 1
+    return error_count, len(errors) - error_count
+
+
+def profile_hooks(plugin: PluginInfo, runs: int, budget_ms: float) -> tuple[dict | None, list[ValidationError]]:
+    """
+    Run a plugin's command hooks and check them against a latency budget.
+
+    Returns the record for .hook-profile.json (None if the plugin has no
+    command hooks) and warnings for hooks whose median wall time exceeds
+    ``budget_ms``, that time out, or that fail.
+    """
+    profiles = profile_plugin_hooks(plugin, runs)
+    if not profiles:
+        return None, []
+
+    errors = []
+    hooks_path = str(plugin.hooks_path)
+    print(f"  Hook profile ({runs} runs, budget {budget_ms:g} ms):")
+    for profile in profiles:
+        label = f"{profile.event}[{profile.matcher or '*'}]"
+        print(f"    {label}: {profile.wall_ms:.1f} ms wall (max {profile.max_wall_ms:.1f}), "
+              f"{profile.cpu_ms:.1f} ms cpu")
+
+        if profile.timed_out:
+            errors.append(ValidationError(
+                hooks_path,
+                f"Hook {label} timed out after {profile.timeout or 'the default'} seconds: {profile.command}",
+                "warning"
+            ))
+        elif profile.wall_ms > budget_ms:
+            errors.append(ValidationError(
+                hooks_path,
+                f"Hook {label} takes {profile.wall_ms:.1f} ms, over the {budget_ms:g} ms budget: {profile.command}",
+                "warning"
+            ))
+        if profile.failures:
+            detail = f" ({profile.last_error})" if profile.last_error else ""
+            errors.append(ValidationError(
+                hooks_path,
+                f"Hook {label} failed in {profile.failures} of {len(profile.runs)} runs{detail}",
+                "warning"
+            ))
+
+    return plugin_profile_summary(profiles, runs, budget_ms), errors
+
+
 def load_verified_data() -> dict:
     """Load the verified plugins data."""
     if VERIFIED_FILE.exists():
@@ -459,11 +783,29 @@ def main():
     parser = argparse.ArgumentParser(description="Validate Claude Code plugins")
     parser.add_argument("plugin", nargs="?", help="Plugin name to validate")
     parser.add_argument("--all", "-a", action="store_true", help="Validate all plugins")
+    parser.add_argument("--archive", nargs="+", type=Path, metavar="ZIP",
+                        help="Validate plugin archives in place, without installing them")
     parser.add_argument("--check-conflicts", "-c", action="store_true", help="Check for naming conflicts")
     parser.add_argument("--mark-verified", action="store_true", help="Mark plugin as verified")
     parser.add_argument("--reviewer", default="Unknown", help="Name of reviewer (for --mark-verified)")
-
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Validate this many plugins concurrently (0 = one per CPU)")
+    parser.add_argument("--cache", nargs="?", const=str(CACHE_FILE), metavar="PATH",
+                        help=f"Reuse results for unchanged files (default: {CACHE_FILE.name})")
+    parser.add_argument("--profile-hooks", action="store_true",
+                        help="Run each hook with synthetic input and measure its cost")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help=f"Runs per hook for --profile-hooks (default: {DEFAULT_RUNS})")
+    parser.add_argument("--hook-budget", type=float, default=DEFAULT_BUDGET_MS, metavar="MS",
+                        help=f"Warn about hooks slower than this (default: {DEFAULT_BUDGET_MS:g} ms)")
+
+    add_timing_arguments(parser)
     args = parser.parse_args()
+    start_timings(args, "validate")
+
+    if args.profile_hooks and not hasattr(os, "wait4"):
+        print("Error: --profile-hooks is only supported on POSIX systems")
+        sys.exit(1)
 
     if args.mark_verified:
         if not args.plugin:
@@ -472,40 +814,109 @@ def main():
         success = mark_verified(args.plugin, args.reviewer)
         sys.exit(0 if success else 1)
 
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    if args.archive:
+        if args.plugin or args.all or args.cache or args.profile_hooks:
+            print("Error: --archive cannot be combined with a plugin name, --all, --cache or --profile-hooks")
+            sys.exit(1)
+
+        total_errors = 0
+        total_warnings = 0
+        results = validate_archives(args.archive, args.check_conflicts, jobs)
+        for archive, (plugin, errors) in zip(args.archive, results):
+            print(f"\nValidating: {archive}" + (f" ({plugin.name})" if plugin else ""))
+            print("-" * 40)
+            error_count, warning_count = print_errors(errors)
+            total_errors += error_count
+            total_warnings += warning_count
+
+        print(f"\n{'=' * 40}")
+        print(f"Total: {total_errors} errors, {total_warnings} warnings in {len(results)} archives")
+        sys.exit(1 if total_errors > 0 else 0)
+
+    name_index = None
     if args.all:
-        plugins = [d.name for d in PLUGINS_DIR.iterdir() if d.is_dir()]
+        # Scan the registry once; with --check-conflicts every plugin is
+        # checked against a single shared name index.
+        scanned = scan_plugins(PLUGINS_DIR)
+        plugins = [p.name for p in scanned]
+        scanned_by_name = {p.name: p for p in scanned}
+        if args.check_conflicts:
+            with phase("conflicts"):
+                name_index = build_name_index(scanned)
+        with phase("dependencies"):
+            dependency_errors = check_dependencies(scanned)
     elif args.plugin:
         plugins = [args.plugin]
+        scanned_by_name = {}
+        dependency_errors = {}
     else:
         print("Error: Specify a plugin name or use --all")
         sys.exit(1)
 
+    cache = ValidationCache(Path(args.cache)) if args.cache else None
+
+    verified_plugins = load_verified_data().get("plugins", {})
+
+    def run(plugin_name: str) -> list[ValidationError]:
+        return validate_plugin(
+            plugin_name,
+            args.check_conflicts,
+            plugin=scanned_by_name.get(plugin_name),
+            name_index=name_index,
+            cache=cache
+        ) + dependency_errors.get(plugin_name, [])
+
+    executor = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    # Results come back in plugin order regardless of completion order
+    results = executor.map(run, plugins) if executor else map(run, plugins)
+    if args.profile_hooks:
+        # Finish validating first so hooks are timed on an otherwise idle process
+        results = list(results)
+        hook_profiles = load_hook_profiles()
+
     total_errors = 0
     total_warnings = 0
 
-    for plugin_name in plugins:
+    for plugin_name, errors in zip(plugins, results):
         print(f"\nValidating: {plugin_name}")
         print("-" * 40)
 
         # Check verification status
-        verified = is_verified(plugin_name)
+        verified = verified_plugins.get(plugin_name)
         if verified:
             print(f"  [VERIFIED] by {verified['verified_by']} at {verified['verified_at']}")
 
-        errors = validate_plugin(plugin_name, args.check_conflicts)
-
-        if not errors:
-            print("  OK - No issues found")
-        else:
-            for error in errors:
-                print(f"  {error}")
-                if error.severity == "error":
-                    total_errors += 1
+        if args.profile_hooks:
+            plugin = scanned_by_name.get(plugin_name) or scan_plugin(PLUGINS_DIR / plugin_name)
+            if plugin is not None:
+                with phase("hooks"):
+                    record, hook_errors = profile_hooks(plugin, args.runs, args.hook_budget)
+                errors = errors + hook_errors
+                if record:
+                    hook_profiles["plugins"][plugin_name] = record
                 else:
-                    total_warnings += 1
+                    hook_profiles["plugins"].pop(plugin_name, None)
+
+        error_count, warning_count = print_errors(errors)
+        total_errors += error_count
+        total_warnings += warning_count
+
+    if executor:
+        executor.shutdown()
+
+    if args.profile_hooks:
+        save_hook_profiles(hook_profiles)
+
+    if cache is not None:
+        cache.prune([PLUGINS_DIR] if args.all else [PLUGINS_DIR / name for name in plugins])
+        cache.save()
 
     print(f"\n{'=' * 40}")
     print(f"Total: {total_errors} errors, {total_warnings} warnings")
+    if cache is not None:
+        print(f"Cache: {cache.hits} unchanged, {cache.misses} re-validated")
 
     sys.exit(1 if total_errors > 0 else 0)
 
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Watch plugins/ and keep validation, the conflict index and catalog.json live.
+
+The registry is scanned and validated once at startup and then kept in
+memory. When files change, only the plugins they belong to are rescanned,
+and only the touched components are re-validated: a saved command file
+re-runs the command checks for that file alone. The conflict index is
+updated in place, and plugins whose names collide with added or removed
+components are re-checked. catalog.json is rewritten with the changed
+entries whenever its content changes.
+
+Changes are picked up with inotify on Linux and by polling file stat
+data elsewhere (or with --poll).
+
+Usage:
+    python watch.py
+    python watch.py --poll 0.5
+    python watch.py --no-catalog
+    python watch.py --no-conflicts --catalog ./custom-catalog.json
+"""
+
+import argparse
+import ctypes
+import json
+import os
+import select
+import struct
+import sys
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+from generate_catalog import CATALOG_PATH, build_plugin_entry, load_marketplace_data, load_verified_data
+from hook_profiler import load_hook_profiles
+from scanner import PLUGINS_DIR, PluginInfo, list_plugin_dirs, scan_plugin, scan_plugins
+from validate import (
+    ValidationError, build_name_index, check_conflicts, check_dependencies,
+    validate_agent, validate_command, validate_hooks, validate_plugin_json, validate_skill,
+)
+
+# Changes arriving within this window are handled as one batch, so an
+# editor's write-and-rename or a git checkout triggers a single update.
+DEBOUNCE_SECONDS = 0.05
+DEFAULT_POLL_INTERVAL = 1.0
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Recursive inotify watch on a directory tree (Linux only)."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.watches: dict[int, Path] = {}
+        self.add_tree(root)
+
+    def add_watch(self, path: Path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self.watches[wd] = path
+
+    def add_tree(self, path: Path):
+        for dirpath, dirnames, _ in os.walk(path):
+            # Hidden directories are import staging areas, not plugins
+            dirnames[:] = [d for d in dirnames if not d.startswith(".") or Path(dirpath) != self.root]
+            self.add_watch(Path(dirpath))
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        """Block up to timeout seconds and return the paths that changed."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        try:
+            data = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; everything may have changed
+                changed.add(self.root)
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            path = directory / os.fsdecode(name) if name else directory
+            changed.add(path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                # A directory moved or created in place may already hold files
+                self.add_tree(path)
+                changed.update(Path(dirpath) / f for dirpath, _, files in os.walk(path) for f in files)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback watcher comparing the stat data of every file under a tree."""
+
+    def __init__(self, root: Path, interval: float = DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for plugin_dir in list_plugin_dirs(self.root):
+            for dirpath, _, files in os.walk(plugin_dir):
+                snapshot[Path(dirpath)] = (0, 0)
+                for name in files:
+                    path = Path(dirpath) / name
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+        snapshot = self.scan()
+        changed = {
+            path for path in snapshot.keys() | self.snapshot.keys()
+            if snapshot.get(path) != self.snapshot.get(path)
+        }
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+def component_key(plugin: PluginInfo, relative: tuple[str, ...]) -> str | None:
+    """The validation result a changed file belongs to, or None if none does."""
+    if relative[:2] == (".claude-plugin", "plugin.json"):
+        return "plugin.json"
+    if relative[:2] == ("hooks", "hooks.json"):
+        return "hooks"
+    if len(relative) >= 2 and relative[0] in ("commands", "agents"):
+        return str(plugin.path / relative[0] / relative[1])
+    if len(relative) >= 2 and relative[0] == "skills":
+        return str(plugin.path / "skills" / relative[1])
+    return None
+
+
+def affects_declared_paths(plugin: PluginInfo, relative: tuple[str, ...]) -> bool:
+    """
+    Whether a change at ``relative`` can alter plugin.json's path checks.
+
+    validate_plugin_json() warns about declared ./ paths that do not exist,
+    so it has to re-run when an entry directly under the plugin root (such
+    as a component directory) or a declared path appears or disappears.
+    """
+    if len(relative) == 1:
+        return True
+    data = plugin.plugin_json if isinstance(plugin.plugin_json, dict) else {}
+    changed = "/".join(relative)
+    for path_field in ["commands", "agents", "skills", "hooks", "mcpServers"]:
+        paths = data.get(path_field)
+        for path in paths if isinstance(paths, list) else [paths]:
+            if isinstance(path, str) and path.startswith("./"):
+                declared = path[2:].rstrip("/")
+                if declared == changed or declared.startswith(changed + "/"):
+                    return True
+    return False
+
+
+def component_validators(plugin: PluginInfo) -> dict:
+    """Map each validation result key of a plugin to the check that produces it."""
+    validators = {
+        "plugin.json": lambda: validate_plugin_json(plugin),
+        "hooks": lambda: validate_hooks(plugin),
+    }
+    for path in plugin.commands:
+        validators[str(path)] = lambda path=path: validate_command(path)
+    for path in plugin.agents:
+        validators[str(path)] = lambda path=path: validate_agent(path)
+    for skill in plugin.skills:
+        validators[str(skill.path)] = lambda path=skill.path: validate_skill(path)
+    return validators
+
+
+def component_names(plugin: PluginInfo | None) -> set[tuple[str, str]]:
+    if plugin is None:
+        return set()
+    return ({("command", name) for name in plugin.command_names}
+            | {("skill", name) for name in plugin.skill_names}
+            | {("agent", name) for name in plugin.agent_names})
+
+
+class LiveRegistry:
+    """In-memory plugin model with validation results kept per component."""
+
+    def __init__(self, plugins_dir: Path = PLUGINS_DIR, catalog_path: Path | None = CATALOG_PATH,
+                 check_conflict: bool = True):
+        self.plugins_dir = plugins_dir
+        self.catalog_path = catalog_path
+        self.check_conflict = check_conflict
+        self.plugins = {plugin.name: plugin for plugin in scan_plugins(plugins_dir)}
+        self.name_index = build_name_index(list(self.plugins.values()))
+        # plugin -> result key -> errors
+        self.results: dict[str, dict[str, list[ValidationError]]] = {}
+
+        self.verified_data = load_verified_data()
+        self.hook_profiles = load_hook_profiles()
+        self.marketplace_name = load_marketplace_data().get("name", "community-claude-plugins")
+        self.entries = {}
+        self.catalog = None
+        if catalog_path is not None:
+            try:
+                with open(catalog_path, "r") as f:
+                    self.catalog = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                pass
+
+        for name, plugin in self.plugins.items():
+            self.results[name] = {key: check() for key, check in component_validators(plugin).items()}
+            self.update_entry(name)
+        self.update_relations(set(self.plugins), dependencies=True)
+        self.write_catalog()
+
+    def errors(self, name: str) -> list[ValidationError]:
+        return [error for errors in self.results.get(name, {}).values() for error in errors]
+
+    def update_entry(self, name: str):
+        plugin = self.plugins.get(name)
+        if plugin is None or plugin.plugin_json is None:
+            self.entries.pop(name, None)
+        else:
+            self.entries[name] = build_plugin_entry(
+                plugin, self.marketplace_name, self.verified_data, self.hook_profiles
+            )
+
+    def update_relations(self, names: set[str], dependencies: bool):
+        """Re-run the cross-plugin checks for the named plugins."""
+        if self.check_conflict:
+            for name in names:
+                if name in self.plugins:
+                    self.results[name]["conflicts"] = check_conflicts(name, self.name_index, self.plugins[name])
+
+        if dependencies:
+            dependency_errors = check_dependencies(list(self.plugins.values()))
+            for name in self.plugins:
+                self.results[name]["dependencies"] = dependency_errors.get(name, [])
+
+    def apply(self, paths: set[Path]) -> list[str]:
+        """Bring the model up to date with changed paths; returns the plugins affected."""
+        touched: dict[str, set[tuple[str, ...]]] = {}
+        for path in paths:
+            try:
+                relative = path.relative_to(self.plugins_dir).parts
+            except ValueError:
+                continue
+            if not relative:
+                # The plugins directory itself, or an inotify overflow: rescan everything
+                for plugin_dir in list_plugin_dirs(self.plugins_dir):
+                    touched.setdefault(plugin_dir.name, set()).add(())
+                for name in self.plugins:
+                    touched.setdefault(name, set()).add(())
+                continue
+            if relative[0].startswith("."):
+                continue
+            touched.setdefault(relative[0], set()).add(relative[1:])
+
+        related = set()
+        dependencies = False
+        for name, files in touched.items():
+            old = self.plugins.get(name)
+            plugin = scan_plugin(self.plugins_dir / name)
+
+            if plugin is None:
+                self.plugins.pop(name, None)
+                self.results.pop(name, None)
+            else:
+                self.plugins[name] = plugin
+                validators = component_validators(plugin)
+                previous = self.results.get(name, {})
+                # Unknown files and structural changes re-check the whole plugin
+                keys = set(validators) if old is None or () in files else {
+                    key for key in (component_key(plugin, relative) for relative in files) if key
+                }
+                dependencies |= "plugin.json" in keys
+                if any(affects_declared_paths(plugin, relative) for relative in files if relative):
+                    keys.add("plugin.json")
+                results = {key: errors for key, errors in previous.items()
+                           if key in validators or key in ("conflicts", "dependencies")}
+                for key in keys | (set(validators) - set(previous)):
+                    if key in validators:
+                        results[key] = validators[key]()
+                self.results[name] = results
+
+            before, after = component_names(old), component_names(plugin)
+            if before != after:
+                for kind, component in before - after:
+                    owners = self.name_index[kind].get(component, [])
+                    if name in owners:
+                        owners.remove(name)
+                    if not owners:
+                        self.name_index[kind].pop(component, None)
+                for kind, component in after - before:
+                    self.name_index[kind].setdefault(component, []).append(name)
+                for kind, component in before ^ after:
+                    related.update(self.name_index[kind].get(component, []))
+            related.add(name)
+            dependencies |= old is None or plugin is None
+
+            self.update_entry(name)
+
+        self.update_relations({name for name in related if name in self.plugins}, dependencies)
+        self.write_catalog()
+        return sorted(related)
+
+    def rebuild_index(self):
+        """Rebuild the conflict index from the model, after an update failed part way."""
+        self.name_index = build_name_index(list(self.plugins.values()))
+
+    def build_catalog(self) -> dict:
+        plugins = [self.entries[name] for name in sorted(self.entries)]
+        categories = {}
+        for entry in plugins:
+            categories[entry["category"]] = categories.get(entry["category"], 0) + 1
+        return {
+            "generated_at": datetime.utcnow().isoformat() + "Z",
+            "marketplace_name": self.marketplace_name,
+            "total_plugins": len(plugins),
+            "verified_plugins": sum(1 for entry in plugins if entry.get("verified")),
+            "plugins": plugins,
+            "categories": categories
+        }
+
+    def write_catalog(self) -> bool:
+        """Rewrite catalog.json if its content changed. Returns True if written."""
+        if self.catalog_path is None:
+            return False
+        catalog = self.build_catalog()
+        if self.catalog is not None and (
+            {k: v for k, v in self.catalog.items() if k != "generated_at"}
+            == {k: v for k, v in catalog.items() if k != "generated_at"}
+        ):
+            return False
+
+        tmp_path = self.catalog_path.with_name(self.catalog_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(catalog, f, indent=2)
+        os.replace(tmp_path, self.catalog_path)
+        self.catalog = catalog
+        return True
+
+
+def print_status(registry: LiveRegistry, names: list[str]):
+    for name in names:
+        errors = registry.errors(name)
+        if name not in registry.plugins:
+            print(f"  {name}: removed")
+        elif not errors:
+            print(f"  {name}: OK")
+        else:
+            count = sum(1 for error in errors if error.severity == "error")
+            print(f"  {name}: {count} errors, {len(errors) - count} warnings")
+            for error in errors:
+                print(f"    {error}")
+
+
+def open_watcher(plugins_dir: Path, poll: float | None):
+    if poll is None and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(plugins_dir)
+        except (OSError, AttributeError) as e:
+            print(f"inotify unavailable ({e}); polling instead")
+    return PollingWatcher(plugins_dir, poll or DEFAULT_POLL_INTERVAL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep validation and catalog.json live while editing plugins")
+    parser.add_argument("--poll", nargs="?", type=float, const=DEFAULT_POLL_INTERVAL, metavar="SECONDS",
+                        help=f"Poll for changes instead of using inotify (default: every {DEFAULT_POLL_INTERVAL:g}s)")
+    parser.add_argument("--catalog", default=str(CATALOG_PATH), help="Catalog file to keep updated")
+    parser.add_argument("--no-catalog", action="store_true", help="Do not update the catalog")
+    parser.add_argument("--no-conflicts", action="store_true", help="Do not check for naming conflicts")
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    registry = LiveRegistry(
+        PLUGINS_DIR,
+        catalog_path=None if args.no_catalog else Path(args.catalog),
+        check_conflict=not args.no_conflicts
+    )
+    print(f"Loaded {len(registry.plugins)} plugins in {(time.perf_counter() - start) * 1000:.0f} ms")
+    print_status(registry, [name for name in sorted(registry.plugins) if registry.errors(name)])
+
+    watcher = open_watcher(PLUGINS_DIR, args.poll)
+    print(f"Watching {PLUGINS_DIR} ({'inotify' if isinstance(watcher, InotifyWatcher) else 'polling'}); "
+          f"Ctrl-C to stop")
+
+    # Paths from batches that failed, retried with the next one
+    failed = set()
+    try:
+        while True:
+            changed = watcher.wait(None)
+            if not changed:
+                continue
+            # Collect the rest of a burst of changes before updating
+            if isinstance(watcher, InotifyWatcher):
+                while more := watcher.wait(DEBOUNCE_SECONDS):
+                    changed |= more
+            changed |= failed
+
+            start = time.perf_counter()
+            catalog_before = registry.catalog
+            try:
+                names = registry.apply(changed)
+            except Exception:
+                # Authors save half-written files; report the error and keep watching
+                failed = changed
+                plugins = sorted({
+                    path.relative_to(PLUGINS_DIR).parts[0] for path in changed
+                    if path.is_relative_to(PLUGINS_DIR) and path != PLUGINS_DIR
+                })
+                print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Update failed for "
+                      f"{', '.join(plugins) or 'the registry'}; retrying on the next change:")
+                traceback.print_exc()
+                registry.rebuild_index()
+                continue
+            failed = set()
+            elapsed = (time.perf_counter() - start) * 1000
+            if not names:
+                continue
+
+            updated = " (catalog updated)" if registry.catalog is not catalog_before else ""
+            print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Updated in {elapsed:.1f} ms{updated}")
+            print_status(registry, names)
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        watcher.close()
+
+
+if __name__ == "__main__":
+    main()